@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" In-process cache for lists of checks
+
+GetChecks stores the list of checks for an account here when caching is
+turned on with config.CHECKS_CACHE_TTL, so passing_checks, failing_checks,
+disabled_checks, and all_checks can share a single download. Entries for
+an account are dropped whenever a POST, PUT, or DELETE is sent to that
+account's checks, so creating, updating, disabling, or deleting a check
+is seen by the next query.
+
+A value is copied once when it is stored, so the caller that downloaded
+it can change it freely. Cache hits only copy the outer dictionary: the
+checks in it are shared by every hit and must not be changed. Copy a
+check with copy.deepcopy before changing it.
+"""
+
+import copy
+import threading
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+try:
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    from urlparse import parse_qs, urlsplit
+
+
+class TTLCache(object):
+    def __init__(self):
+        """ Values stored by account and query, each expiring on its own
+        """
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, token, customerid, query):
+        """ Returns a shallow copy of the cached value, or None if
+        missing or expired
+
+        Checks can be added to or removed from the returned dictionary,
+        but the checks in it are shared with the cache and later hits.
+        """
+
+        key = (token, customerid or None, query)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, expires = entry
+
+            if monotonic() >= expires:
+                del self._entries[key]
+                return None
+
+        return dict(value)
+
+    def set(self, token, customerid, query, value, ttl):
+        """ Stores a copy of a value for ttl seconds
+        """
+
+        key = (token, customerid or None, query)
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._entries[key] = (value, monotonic() + ttl)
+
+    def invalidate(self, token=None, customerid=None):
+        """ Drops the entries for an account, or every entry if no token
+        is given
+        """
+
+        with self._lock:
+            if token is None:
+                self._entries.clear()
+                return
+
+            for key in list(self._entries):
+                if key[0] == token and key[1] == (customerid or None):
+                    del self._entries[key]
+
+
+CHECKS = TTLCache()
+
+
+def invalidate_for_request(method, url):
+    """ Drops cached checks for the account a changing request was sent to
+    """
+
+    if method == "GET":
+        return
+
+    parts = urlsplit(url)
+
+    if "/checks" not in parts.path:
+        return
+
+    query = parse_qs(parts.query)
+    token = query.get("token", [None])[0]
+    customerid = query.get("customerid", [None])[0]
+
+    CHECKS.invalidate(token, customerid)
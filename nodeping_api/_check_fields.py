@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Compare the fields of checks as they are sent to NodePing
+
+Checks are created and updated with flat fields such as "target",
+"threshold", and "enabled", but NodePing returns them with some of
+those fields under "parameters" and "enabled" as "enable": "active".
+These helpers put a returned check back into the flat form so it can be
+compared with the fields a caller wants.
+"""
+
+# Fields that identify a check or the request rather than configure it
+NOT_COMPARED = ("_id", "type", "customerid", "idempotency_key")
+
+_MISSING = object()
+
+_BOOLEANS = {"active": True, "inactive": False, "true": True, "false": False}
+
+
+def flatten(check):
+    """ A check from NodePing in the form used to create or update it
+
+    :type check: dict
+    :param check: The check as returned by GetChecks
+    :rtype: dict
+    """
+
+    flat = dict(check.get("parameters") or {})
+
+    for key, value in check.items():
+        if key == "parameters":
+            continue
+        elif key == "enable":
+            flat["enabled"] = value == "active"
+        else:
+            flat[key] = value
+
+    return flat
+
+
+def changed(wanted, current, ignore=()):
+    """ The wanted fields that differ from a check's current fields
+
+    :type wanted: dict
+    :param wanted: Fields to create or update the check with
+    :type current: dict
+    :param current: The check as returned by NodePing, or flattened
+    :type ignore: iterable
+    :param ignore: Fields never compared, such as passwords NodePing
+    does not return
+    :return: The fields from wanted that need to be sent
+    :rtype: dict
+    """
+
+    if "parameters" in current or "enable" in current:
+        current = flatten(current)
+
+    return dict((key, value) for key, value in wanted.items()
+                if key not in NOT_COMPARED and key not in ignore
+                and not same(value, current.get(key, _MISSING)))
+
+
+def same(wanted, current):
+    """ Whether a field already has the wanted value
+
+    Text is compared exactly. Only the ways NodePing is known to change
+    a value are allowed for: numbers may come back as strings and the
+    other way around, True and False as "active" and "inactive", and
+    None and "" both mean the field is empty.
+    """
+
+    if current is _MISSING:
+        return wanted in (None, "")
+
+    if wanted == current:
+        return True
+
+    if isinstance(wanted, (dict, list, tuple)) or isinstance(current, (dict, list, tuple)):
+        return False
+
+    if wanted in (None, "") and current in (None, ""):
+        return True
+
+    if isinstance(wanted, bool) or isinstance(current, bool):
+        return _as_bool(wanted) is not None and _as_bool(wanted) == _as_bool(current)
+
+    if not isinstance(wanted, (int, float)) and not isinstance(current, (int, float)):
+        return False
+
+    wanted_number = _as_number(wanted)
+
+    return wanted_number is not None and wanted_number == _as_number(current)
+
+
+def _as_bool(value):
+    """ True or False for a bool or the text NodePing returns for one,
+    otherwise None
+    """
+
+    if isinstance(value, bool):
+        return value
+
+    return _BOOLEANS.get(value) if isinstance(value, str) else None
+
+
+def _as_number(value):
+    """ The number in a number or numeric text, otherwise None
+    """
+
+    if isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        return value
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Helpers for running many API calls at once on a pool of threads
+
+Calls made by the worker threads go through the same transport as the
+thread that started them, so a NodePingClient's connection pool and
+settings are used by its batch operations too. Transports with a false
+`threadsafe` attribute, such as the one nodeping_api.aio runs the sync
+functions with, can only run batches one call at a time.
+"""
+
+from collections import deque, namedtuple
+
+from . import _query_nodeping_api
+
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+except ImportError:
+    # Python 2 without the futures backport runs batches one at a time
+    ThreadPoolExecutor = None
+
+# The outcome of one call in a batch. `ok` is False when the call raised
+# an exception, kept in `error`, or NodePing answered with an error,
+# which is kept in `result` the same as a successful response.
+BatchResult = namedtuple("BatchResult", ["key", "ok", "result", "error"])
+
+
+def run_many(func, items, workers=None):
+    """ Calls func for every item and returns the outcomes in input order
+
+    :param func: Function called with each item
+    :type items: iterable
+    :param items: (key, item) pairs. The key identifies the call in
+    the returned outcomes
+    :type workers: int
+    :param workers: Number of calls made at once. One at a time if None
+    :return: BatchResult for each item, in the order of items
+    :rtype: list
+    """
+
+    keys = []
+
+    def indexed():
+        for index, (key, item) in enumerate(items):
+            keys.append(key)
+            yield index, item
+
+    completed = iter_completed(func, indexed(), workers)
+    ordered = sorted(completed, key=lambda outcome: outcome.key)
+
+    return [outcome._replace(key=keys[outcome.key]) for outcome in ordered]
+
+
+def iter_completed(func, items, workers=None):
+    """ Calls func for every item, yielding outcomes as calls finish
+
+    At most `workers` calls are in flight at a time and items are only
+    taken from the iterable as workers free up, so a long generator of
+    items is never loaded into memory all at once.
+
+    Closing the generator, or dropping it, before the end stops taking
+    items. Calls already in flight are cancelled if they have not
+    started, and otherwise waited for.
+
+    :param func: Function called with each item
+    :type items: iterable
+    :param items: (key, item) pairs
+    :type workers: int
+    :param workers: Number of calls made at once. One at a time if None
+    :return: BatchResult for each item as its call finishes
+    :rtype: generator
+    """
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    call = _threaded_call(func, workers)
+
+    if not workers or workers == 1 or ThreadPoolExecutor is None:
+        for key, item in items:
+            yield _outcome(call, key, item)
+
+        return
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        pending = deque()
+
+        for key, item in items:
+            pending.append(executor.submit(_outcome, call, key, item))
+
+            if len(pending) >= workers:
+                break
+
+        while pending:
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            pending = deque(not_done)
+
+            for future in done:
+                yield future.result()
+
+                for key, item in items:
+                    pending.append(executor.submit(_outcome, call, key, item))
+                    break
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait=True)
+
+
+def iter_ordered(func, items, workers=None):
+    """ Calls func for every item, yielding outcomes in input order
+
+    Up to `workers` calls run ahead of the outcome being yielded, so
+    at most that many results are held in memory at once.
+
+    :param func: Function called with each item
+    :type items: iterable
+    :param items: (key, item) pairs
+    :type workers: int
+    :param workers: Number of calls made at once. One at a time if None
+    :return: BatchResult for each item, in the order of items
+    :rtype: generator
+    """
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    call = _threaded_call(func, workers)
+
+    if not workers or workers == 1 or ThreadPoolExecutor is None:
+        for key, item in items:
+            yield _outcome(call, key, item)
+
+        return
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        pending = deque()
+
+        for key, item in items:
+            pending.append(executor.submit(_outcome, call, key, item))
+
+            if len(pending) >= workers:
+                break
+
+        while pending:
+            outcome = pending.popleft().result()
+
+            for key, item in items:
+                pending.append(executor.submit(_outcome, call, key, item))
+                break
+
+            yield outcome
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait=True)
+
+
+def raise_first_error(outcomes):
+    """ Raises the first exception kept in a list of outcomes
+    """
+
+    for outcome in outcomes:
+        if outcome.error is not None:
+            raise outcome.error
+
+
+def outcome_of(key, result):
+    """ Makes the BatchResult for a call that returned result
+    """
+
+    is_error = isinstance(result, dict) and "error" in result
+
+    return BatchResult(key, not is_error, result, None)
+
+
+def _outcome(call, key, item):
+    try:
+        result = call(item)
+    except Exception as err:
+        return BatchResult(key, False, None, err)
+
+    return outcome_of(key, result)
+
+
+def _threaded_call(func, workers):
+    """ func wrapped to run in the current transport, after checking the
+    transport can be used from several threads if workers asks for them
+    """
+
+    transport = _query_nodeping_api.current_transport()
+
+    if workers and workers > 1 and not getattr(transport, "threadsafe", True):
+        raise RuntimeError("Batches cannot use worker threads here. From "
+                           "nodeping_api.aio, use the aio version of the function")
+
+    return _in_transport(func, transport)
+
+
+def _in_transport(func, transport):
+    def call(item):
+        with _query_nodeping_api.using(transport):
+            return func(item)
+
+    return call
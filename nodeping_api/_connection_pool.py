@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Keep-alive HTTP/1.1 connection pool used for querying NodePing
+
+Connections are kept open after a request has been fully read and are
+reused for the next request to the same host, so only the first request
+pays for the TCP and TLS handshakes.
+"""
+
+import select
+import socket
+import threading
+from time import time
+
+from . import config, retry
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+    from urllib.error import URLError
+    from urllib.parse import urlsplit
+except ImportError:
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+    from urllib2 import URLError
+    from urlparse import urlsplit
+
+
+class ConnectionPool(object):
+    def __init__(self, maxsize=None, idle_timeout=None):
+        """
+        :type maxsize: int
+        :param maxsize: Idle connections kept open per host. Defaults to
+        config.POOL_MAXSIZE
+        :type idle_timeout: int/float
+        :param idle_timeout: Seconds an idle connection is kept before it
+        is discarded. Defaults to config.POOL_IDLE_TIMEOUT
+        """
+
+        self._maxsize = maxsize
+        self._idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        if self._maxsize is None:
+            return config.POOL_MAXSIZE
+
+        return self._maxsize
+
+    @property
+    def idle_timeout(self):
+        if self._idle_timeout is None:
+            return config.POOL_IDLE_TIMEOUT
+
+        return self._idle_timeout
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        """ Sends a request over a pooled connection
+
+        Pooled connections the server has closed are skipped. If a
+        reused connection still fails, it is replaced with a new one and
+        the request is sent again, but only when repeating it is safe: a
+        GET, PUT, or DELETE, or a POST with an Idempotency-Key. Network
+        errors are raised as URLError, the same as urlopen.
+
+        :type method: string
+        :param method: HTTP method such as GET, POST, PUT, DELETE
+        :type url: string
+        :param url: Full URL for the request
+        :type body: bytes
+        :param body: Optional request body
+        :type headers: dict
+        :param headers: Optional request headers
+        :type timeout: int/float
+        :param timeout: Seconds to wait on the network. Defaults to
+        config.REQUEST_TIMEOUT
+        :return: Response that hands its connection back to the pool
+        once it has been read
+        :rtype: PooledResponse
+        """
+
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+
+        path = parts.path or "/"
+
+        if parts.query:
+            path = "{0}?{1}".format(path, parts.query)
+
+        send_headers = {"Connection": "keep-alive"}
+        send_headers.update(headers or {})
+
+        if timeout is None:
+            timeout = config.REQUEST_TIMEOUT
+
+        conn, reused = self._acquire(key, timeout)
+
+        try:
+            try:
+                response = self._send(conn, method, path, body, send_headers)
+            except (HTTPException, socket.error):
+                conn.close()
+
+                if not reused or not retry.RetryPolicy.retryable(method, send_headers):
+                    raise
+
+                conn = self._connect(key, timeout)
+                response = self._send(conn, method, path, body, send_headers)
+        except (HTTPException, socket.error) as err:
+            conn.close()
+            raise URLError(err)
+
+        return PooledResponse(self, key, conn, response)
+
+    def release(self, key, conn):
+        """ Returns a connection to the pool, or closes it if full
+        """
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+
+            if len(idle) < self.maxsize:
+                idle.append((conn, time()))
+                return
+
+        conn.close()
+
+    def clear(self):
+        """ Closes all idle connections
+        """
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for connections in idle.values():
+            for conn, _last_used in connections:
+                conn.close()
+
+    def _acquire(self, key, timeout):
+        """ Gets the most recently used live connection for a host
+
+        :return: The connection and whether it was taken from the pool
+        :rtype: tuple
+        """
+
+        expired = []
+        conn = None
+
+        with self._lock:
+            idle = self._idle.get(key, [])
+            cutoff = time() - self.idle_timeout
+
+            while idle:
+                candidate, last_used = idle.pop()
+
+                if last_used >= cutoff and not _dropped(candidate):
+                    conn = candidate
+                    break
+
+                expired.append(candidate)
+
+        for candidate in expired:
+            candidate.close()
+
+        if conn is not None:
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+
+            return conn, True
+
+        return self._connect(key, timeout), False
+
+    @staticmethod
+    def _connect(key, timeout):
+        scheme, host, port = key
+
+        if scheme == "https":
+            return HTTPSConnection(host, port, timeout=timeout)
+
+        return HTTPConnection(host, port, timeout=timeout)
+
+    @staticmethod
+    def _send(conn, method, path, body, headers):
+        conn.request(method, path, body, headers)
+
+        return conn.getresponse()
+
+
+def _dropped(conn):
+    """ Whether the server closed an idle connection
+
+    An idle keep-alive connection has nothing to read, so a readable
+    socket means the server has closed it or sent something unexpected.
+    """
+
+    if conn.sock is None:
+        return True
+
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (ValueError, select.error, socket.error):
+        return True
+
+    return bool(readable)
+
+
+class PooledResponse(object):
+    def __init__(self, pool, key, conn, response):
+        """ Wraps an HTTP response so its connection can be reused
+
+        The connection goes back to the pool when the body has been
+        read completely. Call close() to give up on a partly read body.
+        """
+
+        self.status = response.status
+        self.reason = response.reason
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+
+    def getheader(self, name, default=None):
+        return self._response.getheader(name, default)
+
+    def read(self, amt=None):
+        """ Reads the body, or up to amt bytes of it
+        """
+
+        if self._conn is None:
+            return b""
+
+        try:
+            if amt is None:
+                data = self._response.read()
+            else:
+                data = self._response.read(amt)
+        except (HTTPException, socket.error) as err:
+            self.close()
+            raise URLError(err)
+
+        if amt is None or not data:
+            self.release()
+
+        return data
+
+    def release(self):
+        """ Hands the connection back to the pool if it can be reused
+        """
+
+        if self._conn is None:
+            return
+
+        conn, self._conn = self._conn, None
+
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool.release(self._key, conn)
+        else:
+            conn.close()
+
+    def close(self):
+        """ Closes the connection without returning it to the pool
+        """
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
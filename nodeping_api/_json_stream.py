@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Incremental decoding of large JSON responses
+
+Decodes the members of a top-level JSON object or the elements of a
+top-level array one at a time while the response is read in chunks, so
+only the member being decoded is held in memory instead of the whole
+body.
+"""
+
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+# Characters that continue a number that looks complete, as in 1.5 or 1e3
+NUMBER_CONTINUES = ".eE"
+
+
+class JSONStream(object):
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        """
+        :param fp: Object with a read(size) method returning bytes
+        :type chunk_size: int
+        :param chunk_size: Bytes read from fp at a time
+        """
+
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+        opening = self._next_char()
+
+        if opening == "{":
+            self.kind = "object"
+            self._pos += 1
+        elif opening == "[":
+            self.kind = "array"
+            self._pos += 1
+        else:
+            self.kind = "scalar"
+
+    def __iter__(self):
+        """ Yields (key, value) for an object, or each value of an array.
+        A scalar is yielded as a single value.
+        """
+
+        if self.kind == "scalar":
+            yield self._decode_value()
+            return
+
+        closing = "}" if self.kind == "object" else "]"
+        first = True
+
+        while True:
+            char = self._next_char()
+
+            if char == closing:
+                self._pos += 1
+                return
+
+            if not first:
+                if char != ",":
+                    raise ValueError("Expected ',' at position {0}".format(self._pos))
+
+                self._pos += 1
+
+            first = False
+
+            if self.kind == "object":
+                key = self._decode_value()
+
+                if self._next_char() != ":":
+                    raise ValueError("Expected ':' at position {0}".format(self._pos))
+
+                self._pos += 1
+                yield key, self._decode_value()
+            else:
+                yield self._decode_value()
+
+    def close(self):
+        """ Closes the underlying stream
+        """
+
+        close = getattr(self._fp, "close", None)
+
+        if close is not None:
+            close()
+
+    def _next_char(self):
+        """ Skips whitespace and returns the next character, reading
+        more of the stream if needed
+        """
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._read_more():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _decode_value(self):
+        """ Decodes the value at the current position
+
+        A value that ends right at the end of the buffer is only
+        accepted once the stream is finished or more data has been
+        read, since a number such as 12 could continue as 123. The
+        same goes for a number followed by the start of a fraction or
+        exponent, since 1. could continue as 1.5.
+        """
+
+        self._next_char()
+
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._read_more():
+                    raise
+                continue
+
+            complete = end < len(self._buffer) and not (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and self._buffer[end] in NUMBER_CONTINUES)
+
+            if complete or self._eof:
+                # Drop what has been decoded so memory stays flat
+                self._buffer = self._buffer[end:]
+                self._pos = 0
+
+                return value
+
+            self._read_more()
+
+    def _read_more(self):
+        """ Appends the next chunk of the stream to the buffer
+
+        :return: False if the stream has ended
+        :rtype: bool
+        """
+
+        if self._eof:
+            return False
+
+        data = self._fp.read(self._chunk_size)
+
+        if not data:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(data)
+        self._pos = 0
+
+        return True
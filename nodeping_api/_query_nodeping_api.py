@@ -2,15 +2,58 @@
 # -*- coding: utf-8 -*-
 
 import json
-try:
-    from urllib.error import HTTPError as httperror
-    from urllib.request import Request, urlopen
-except ImportError:
-    from urllib2 import Request, urlopen
-    from urllib2 import HTTPError as httperror
+import threading
+from contextlib import contextmanager
 
+from . import _cache, _json_stream
+from ._transport import Transport
+from .retry import IDEMPOTENCY_HEADER
 
-def post(url, data_dictionary):
+# Shared by every module so connections to NodePing are reused
+DEFAULT_TRANSPORT = Transport()
+
+_local = threading.local()
+
+
+def current_transport():
+    """ Returns the transport used for requests made on this thread
+    """
+
+    return getattr(_local, "transport", None) or DEFAULT_TRANSPORT
+
+
+@contextmanager
+def using(transport):
+    """ Sends the requests made on this thread inside the block through
+    the given transport instead of the default one
+    """
+
+    previous = getattr(_local, "transport", None)
+    _local.transport = transport
+
+    try:
+        yield transport
+    finally:
+        _local.transport = previous
+
+
+def _request(method, url, body=None, headers=None):
+    """ Sends the request through the current transport and decodes the JSON
+    """
+
+    headers = dict(headers or {})
+
+    if body is not None:
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        headers['Content-Length'] = str(len(body))
+
+    try:
+        return current_transport().request(method, url, body, headers)
+    finally:
+        _cache.invalidate_for_request(method, url)
+
+
+def post(url, data_dictionary, idempotency_key=None):
     """ Queries the NodePing API via POST and creates a check
 
     Accepts a URL and data and POSTs the results to NodePing
@@ -21,24 +64,23 @@ def post(url, data_dictionary):
     :param url: The URL that will have data that is POSTed to NodePing
     :type data_dictionary: string
     :param data_dictionary: Dictionary of data that is sent to NodePing
+    :type idempotency_key: string
+    :param idempotency_key: Optional unique key for this POST, sent as
+    the Idempotency-Key header. When given, the POST may be retried after
+    a transient failure. NodePing does not document ignoring a repeated
+    key, so a retry can still create a duplicate
     :return: Data that was returned from NodePing after POST
     :rtype: dict
     """
 
     json_data = json.dumps(data_dictionary).encode('utf-8')
 
-    req = Request(url)
-    req.add_header('Content-Type', 'application/json; charset=utf-8')
-    req.add_header('Content-Length', len(json_data))
-
-    try:
-        data = urlopen(req, json_data)
-    except httperror as err:
-        data = err
+    headers = {}
 
-    json_bytes = data.read()
+    if idempotency_key:
+        headers[IDEMPOTENCY_HEADER] = str(idempotency_key)
 
-    return json.loads(json_bytes.decode('utf-8'))
+    return _request('POST', url, json_data, headers)
 
 
 def put(url, data_dictionary=None):
@@ -56,27 +98,12 @@ def put(url, data_dictionary=None):
     :rtype: dict
     """
 
-    if data_dictionary:
-        json_data = json.dumps(data_dictionary).encode('utf-8')
-
-    req = Request(url)
-    req.get_method = lambda: 'PUT'
+    json_data = None
 
     if data_dictionary:
-        req.add_header('Content-Type', 'application/json; charset=utf-8')
-        req.add_header('Content-Length', len(json_data))
-
-    try:
-        if data_dictionary:
-            data = urlopen(req, json_data)
-        else:
-            data = urlopen(req)
-    except httperror as err:
-        data = err
-
-    json_bytes = data.read()
+        json_data = json.dumps(data_dictionary).encode('utf-8')
 
-    return json.loads(json_bytes.decode('utf-8'))
+    return _request('PUT', url, json_data)
 
 
 def get(url):
@@ -92,16 +119,34 @@ def get(url):
     :rtype: dict
     """
 
-    req = Request(url)
+    return _request('GET', url)
 
-    try:
-        data = urlopen(req)
-    except httperror as err:
-        data = err
 
-    json_bytes = data.read()
+def get_conditional(url, etag=None):
+    """ Queries the NodePing API via GET unless the data is unchanged
+
+    When an ETag from an earlier response is given, it is sent in
+    If-None-Match so the server can answer 304 Not Modified instead of
+    sending the same data again.
+
+    :type url: string
+    :param url: The URL that will be used for GET request
+    :type etag: string
+    :param etag: ETag of the last response for this URL, if any
+    :return: (data, etag). data is None if the server answered that
+    nothing changed
+    :rtype: tuple
+    """
+
+    headers = {"If-None-Match": etag} if etag else None
+    response = current_transport().open('GET', url, headers=headers)
+    json_bytes = response.read()
+    new_etag = response.getheader("ETag")
 
-    return json.loads(json_bytes.decode('utf-8'))
+    if response.status == 304:
+        return None, new_etag or etag
+
+    return json.loads(json_bytes.decode('utf-8')), new_etag
 
 
 def delete(url):
@@ -117,14 +162,23 @@ def delete(url):
     :rtype: dict
     """
 
-    req = Request(url)
-    req.get_method = lambda: 'DELETE'
+    return _request('DELETE', url)
 
-    try:
-        data = urlopen(req)
-    except httperror as err:
-        data = err
 
-    json_bytes = data.read()
+def get_stream(url):
+    """ Queries the NodePing API via GET and decodes the response as it is read
+
+    Used for responses too large to hold in memory at once. The members
+    of the returned object, or the elements of the returned array, are
+    decoded one at a time as the stream is iterated.
+
+    :type url: string
+    :param url: The URL that will be used for GET request
+    :return: Stream over the returned object or array. Close it if it is
+    not read to the end
+    :rtype: JSONStream
+    """
+
+    response = current_transport().open('GET', url)
 
-    return json.loads(json_bytes.decode('utf-8'))
+    return _json_stream.JSONStream(response)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Transport that sends requests to NodePing and decodes the responses
+
+Every request made by the modules in this package goes through a
+Transport. The default one is shared by the whole process, and a
+NodePingClient owns a separate one with its own settings.
+"""
+
+import json
+import time
+
+from . import rate_limit, retry
+from ._connection_pool import ConnectionPool, URLError
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+
+class Transport(object):
+    def __init__(self, pool=None, rate_limiter=None, retry_policy=None, timeout=None):
+        """
+        :type pool: ConnectionPool
+        :param pool: Connection pool used for requests. A new pool with
+        the defaults from config is used if not given
+        :type rate_limiter: RateLimiter
+        :param rate_limiter: Limiter that requests wait on. The limiter
+        from config.RATE_LIMIT is used if not given
+        :type retry_policy: RetryPolicy
+        :param retry_policy: When to retry failed requests. The policy
+        from the RETRY_ values in config is used if not given
+        :type timeout: int/float
+        :param timeout: Seconds a request waits on the network. Defaults
+        to config.REQUEST_TIMEOUT
+        """
+
+        if pool is None:
+            pool = ConnectionPool()
+
+        self.pool = pool
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """ Calls listener(method, url, result) after every decoded response
+
+        Used to keep local state, such as a check_index.CheckIndex, in step
+        with the changes made through this transport. Listeners are
+        called on the thread that made the request.
+        """
+
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def limiter(self):
+        """ The rate limiter in effect for this transport, if any
+        """
+
+        return self.rate_limiter or rate_limit.configured_limiter()
+
+    def policy(self):
+        """ The retry policy in effect for this transport
+        """
+
+        return self.retry_policy or retry.configured_policy()
+
+    def open(self, method, url, body=None, headers=None):
+        """ Sends a request and returns the response without reading it
+
+        Network errors and responses asking to try again later are
+        retried as the retry policy allows. The response to the last
+        attempt is returned, or the error it raised is raised.
+
+        :return: Response whose connection returns to the pool once read
+        :rtype: PooledResponse
+        """
+
+        policy = self.policy()
+        started = monotonic()
+        attempt = 1
+
+        while True:
+            try:
+                response = self._send(method, url, body, headers)
+            except URLError as err:
+                delay = policy.retry_delay(method, headers, attempt, started, error=err)
+
+                if delay is None:
+                    raise
+            else:
+                delay = policy.retry_delay(
+                    method, headers, attempt, started, status=response.status,
+                    retry_after=response.getheader("Retry-After"))
+
+                if delay is None:
+                    return response
+
+                # Read the body so the connection can be reused
+                response.read()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self, method, url, body, headers):
+        """ Sends one attempt of a request after waiting on the rate
+        limiter, and lets it know whether NodePing asked to slow down
+        """
+
+        limiter = self.limiter()
+
+        if limiter is not None:
+            limiter.acquire()
+
+        response = self.pool.request(method, url, body, headers, self.timeout)
+
+        if limiter is not None:
+            limiter.on_response(response.status, response.getheader("Retry-After"))
+
+        return response
+
+    def request(self, method, url, body=None, headers=None):
+        """ Sends a request and decodes the JSON that NodePing returned
+
+        Error responses from NodePing are decoded the same as successful
+        ones, so API errors are returned as a dictionary with an "error"
+        key.
+
+        :rtype: dict
+        """
+
+        response = self.open(method, url, body, headers)
+        json_bytes = response.read()
+        result = json.loads(json_bytes.decode('utf-8'))
+
+        for listener in list(self.listeners):
+            listener(method, url, result)
+
+        return result
+
+    def close(self):
+        """ Closes the idle connections held by this transport
+        """
+
+        self.pool.clear()
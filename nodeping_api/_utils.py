@@ -63,3 +63,24 @@ def generate_querystring(dictionary):
 
 def create_timestamp(duration):
     return int(time() * 1000) + (duration * 1000)
+
+
+def mute_value(duration):
+    """ The mute value NodePing expects for a mute duration
+
+    True and False mute until unmuted and unmute. A number of seconds
+    becomes the timestamp the mute ends at, and anything else, such as
+    a timestamp already worked out, is sent as it is.
+
+    :type duration: int/bool
+    :param duration: Seconds to mute for, or a bool
+    :rtype: int/bool
+    """
+
+    if isinstance(duration, bool):
+        return duration
+
+    if isinstance(duration, (int, float)):
+        return create_timestamp(duration)
+
+    return duration
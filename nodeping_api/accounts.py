@@ -11,7 +11,7 @@ If an invalid token is supplied, you will receive a dictionary with
 a key called "error"
 """
 
-from . import _query_nodeping_api, _utils, config
+from . import _concurrency, _query_nodeping_api, _utils, config
 
 API_URL = "{0}accounts".format(config.API_URL)
 
@@ -153,3 +153,89 @@ def disable_notifications(token,
         API_URL, accountsupressall), customerid)
 
     return _query_nodeping_api.put(url)
+
+
+def iter_for_each_subaccount(token, operation, customerids=None, workers=None):
+    """ Runs an operation against every subaccount, yielding results as
+    they arrive
+
+    The accounts are listed once with get_account, which includes the
+    parent account, unless `customerids` is given. The operation is
+    called as operation(token, customerid=customerid), up to `workers`
+    at a time. The calls go through the current transport, so they share
+    its connection pool, and its rate limiter when there is one: set
+    config.RATE_LIMIT, or pass rate_limiter to a NodePingClient and call
+    its accounts module. Without one, nothing limits the calls besides
+    `workers`.
+
+    Example:
+        for outcome in accounts.iter_for_each_subaccount(
+                token, contacts.get_all, workers=8):
+            print(outcome.key, outcome.ok)
+
+    :param token: The NodePing token for the account
+    :type token: str
+    :param operation: Function taking a token and a customerid, such as
+    contacts.get_all or notifications.get_notifications
+    :type operation: function
+    :param customerids: IDs of the accounts to run the operation for.
+    Defaults to every account from get_account
+    :type customerids: list
+    :param workers: Number of accounts the operation runs for at once
+    :type workers: int
+    :return: BatchResult keyed by customerid for each account as its
+    call finishes. If the accounts could not be listed, a single
+    BatchResult with key None and the error from NodePing
+    :rtype: generator
+    """
+
+    if customerids is None:
+        listed = get_account(token)
+
+        if "error" in listed:
+            yield _concurrency.BatchResult(None, False, listed, None)
+            return
+
+        customerids = list(listed)
+
+    def run_for(customerid):
+        return operation(token, customerid=customerid)
+
+    for outcome in _concurrency.iter_completed(
+            run_for, ((customerid, customerid) for customerid in customerids), workers):
+        yield outcome
+
+
+def for_each_subaccount(token, operation, customerids=None, workers=None):
+    """ Runs an operation against every subaccount and merges the results
+
+    Same as iter_for_each_subaccount, but waits for every account and
+    returns the results keyed by customerid. Errors returned by NodePing
+    are kept as that account's result; an exception raised by the
+    operation is raised once every account has finished.
+
+    Example:
+        checks = accounts.for_each_subaccount(
+            token,
+            lambda token, customerid: get_checks.GetChecks(
+                token, customerid=customerid).all_checks(),
+            workers=8)
+
+    :return: The result of the operation for each customerid, or the
+    error from get_account if the accounts could not be listed
+    :rtype: dict
+    """
+
+    return _merge_outcomes(list(iter_for_each_subaccount(token, operation, customerids, workers)))
+
+
+def _merge_outcomes(outcomes):
+    """ The results of for_each_subaccount keyed by customerid
+    """
+
+    if len(outcomes) == 1 and outcomes[0].key is None:
+        return outcomes[0].result
+
+    _concurrency.raise_first_error(outcomes)
+
+    return dict((outcome.key, outcome.result) for outcome in outcomes)
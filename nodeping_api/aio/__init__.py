@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Coroutine versions of the nodeping_api modules for use with asyncio.
+
+Each module here has the same functions and arguments as the module of
+the same name in nodeping_api, but returns a coroutine:
+
+    from nodeping_api.aio import get_checks, results
+
+    checks = await get_checks.GetChecks(token).all_checks()
+    current = await results.get_current(token)
+
+Requests are sent over a pool of keep-alive connections on the running
+event loop, so many calls can be awaited at once with asyncio.gather.
+Requires Python 3.7 or newer.
+"""
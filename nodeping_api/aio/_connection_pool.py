@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Keep-alive HTTP/1.1 connection pool built on asyncio streams
+
+The asyncio counterpart of nodeping_api._connection_pool. Connections
+are reused for later requests to the same host once a response has been
+read, and many requests can be in flight on one event loop, up to the
+most connections allowed per host.
+"""
+
+import asyncio
+import ssl
+from time import time
+from urllib.error import URLError
+from urllib.parse import urlsplit
+
+from .. import config, retry
+
+# Methods sent with a Content-Length even without a body, as http.client does
+_METHODS_EXPECTING_BODY = ("PATCH", "POST", "PUT")
+
+
+class AsyncConnectionPool(object):
+    def __init__(self, maxsize=None, idle_timeout=None, max_connections=None):
+        """
+        :type maxsize: int
+        :param maxsize: Idle connections kept open per host. Defaults to
+        config.POOL_MAXSIZE
+        :type idle_timeout: int/float
+        :param idle_timeout: Seconds an idle connection is kept before it
+        is discarded. Defaults to config.POOL_IDLE_TIMEOUT
+        :type max_connections: int
+        :param max_connections: Connections open at once per host, idle
+        or in use. Defaults to config.POOL_MAX_CONNECTIONS
+        """
+
+        self._maxsize = maxsize
+        self._idle_timeout = idle_timeout
+        self._max_connections = max_connections
+        self._idle = {}
+        self._slots = {}
+        self._loop = None
+        self._ssl_context = None
+
+    @property
+    def maxsize(self):
+        if self._maxsize is None:
+            return config.POOL_MAXSIZE
+
+        return self._maxsize
+
+    @property
+    def idle_timeout(self):
+        if self._idle_timeout is None:
+            return config.POOL_IDLE_TIMEOUT
+
+        return self._idle_timeout
+
+    @property
+    def max_connections(self):
+        if self._max_connections is None:
+            return config.POOL_MAX_CONNECTIONS
+
+        return self._max_connections
+
+    async def request(self, method, url, body=None, headers=None, timeout=None):
+        """ Sends a request over a pooled connection and reads the response
+
+        If a reused connection was closed by the server, it is replaced
+        with a new one and the request is sent again, but only when
+        repeating it is safe: a GET, PUT, or DELETE, or a POST with an
+        Idempotency-Key. Network errors and timeouts are raised as
+        URLError. When max_connections requests to the host are already
+        in flight, the request waits for one of them to finish.
+
+        :type timeout: int/float
+        :param timeout: Seconds to wait on the network for each attempt.
+        Defaults to config.REQUEST_TIMEOUT
+
+        :return: The status, headers, and body of the response
+        :rtype: AsyncResponse
+        """
+
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+
+        path = parts.path or "/"
+
+        if parts.query:
+            path = "{0}?{1}".format(path, parts.query)
+
+        send_headers = {"Host": parts.netloc, "Connection": "keep-alive"}
+        send_headers.update(headers or {})
+
+        if timeout is None:
+            timeout = config.REQUEST_TIMEOUT
+
+        async with self._slot(key):
+            return await self._request(key, method, path, body, send_headers, timeout)
+
+    async def _request(self, key, method, path, body, send_headers, timeout):
+        conn = None
+
+        try:
+            conn, reused = await asyncio.wait_for(self._acquire(key), timeout)
+
+            try:
+                response = await asyncio.wait_for(
+                    _exchange(conn, method, path, body, send_headers), timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                _close(conn)
+
+                if not reused or not retry.RetryPolicy.retryable(method, send_headers):
+                    raise
+
+                conn = await asyncio.wait_for(self._connect(key), timeout)
+                response = await asyncio.wait_for(
+                    _exchange(conn, method, path, body, send_headers), timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError,
+                ValueError) as err:
+            if conn is not None:
+                _close(conn)
+
+            raise URLError(err)
+
+        if response.keep_alive:
+            self._release(key, conn)
+        else:
+            _close(conn)
+
+        return response
+
+    def clear(self):
+        """ Closes all idle connections
+        """
+
+        idle, self._idle = self._idle, {}
+
+        for connections in idle.values():
+            for conn, _last_used in connections:
+                _close(conn)
+
+    def _slot(self, key):
+        """ The semaphore limiting the requests in flight to a host
+
+        A new connection is only opened while no idle one is left, so
+        holding a slot for each request keeps the open connections to a
+        host, idle or in use, within max_connections.
+        """
+
+        self._use_loop()
+
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.max_connections)
+
+        return self._slots[key]
+
+    def _use_loop(self):
+        loop = asyncio.get_running_loop()
+
+        # Connections and semaphores belong to the loop that made them
+        if loop is not self._loop:
+            self._idle = {}
+            self._slots = {}
+            self._loop = loop
+
+    async def _acquire(self, key):
+        self._use_loop()
+
+        idle = self._idle.get(key, [])
+        cutoff = time() - self.idle_timeout
+
+        while idle:
+            conn, last_used = idle.pop()
+            reader, _writer = conn
+
+            if last_used >= cutoff and not reader.at_eof():
+                return conn, True
+
+            _close(conn)
+
+        return await self._connect(key), False
+
+    def _release(self, key, conn):
+        idle = self._idle.setdefault(key, [])
+
+        if len(idle) < self.maxsize:
+            idle.append((conn, time()))
+        else:
+            _close(conn)
+
+    async def _connect(self, key):
+        scheme, host, port = key
+
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+
+            return await asyncio.open_connection(
+                host, port or 443, ssl=self._ssl_context)
+
+        return await asyncio.open_connection(host, port or 80)
+
+
+class AsyncResponse(object):
+    def __init__(self, status, reason, headers, body, keep_alive):
+        """ A response that has been read completely
+        """
+
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.keep_alive = keep_alive
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+    def read(self):
+        return self.body
+
+
+async def _exchange(conn, method, path, body, headers):
+    """ Writes the request to the connection and reads the response
+    """
+
+    reader, writer = conn
+
+    if body is not None:
+        headers["Content-Length"] = str(len(body))
+    elif method in _METHODS_EXPECTING_BODY:
+        headers["Content-Length"] = "0"
+
+    lines = ["{0} {1} HTTP/1.1".format(method, path)]
+    lines.extend("{0}: {1}".format(k, v) for k, v in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    if body is not None:
+        writer.write(body)
+
+    await writer.drain()
+
+    status_line = await reader.readline()
+
+    if not status_line:
+        raise ConnectionResetError("Connection closed by server")
+
+    version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+
+    response_headers = {}
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        name, _sep, value = line.decode("latin-1").partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+
+    keep_alive = (version == "HTTP/1.1"
+                  and response_headers.get("connection", "").lower() != "close")
+
+    if method == "HEAD" or status in ("204", "304"):
+        response_body = b""
+    elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+        response_body = await _read_chunked(reader)
+    elif "content-length" in response_headers:
+        response_body = await reader.readexactly(int(response_headers["content-length"]))
+    else:
+        response_body = await reader.read()
+        keep_alive = False
+
+    return AsyncResponse(int(status), reason, response_headers, response_body, keep_alive)
+
+
+async def _read_chunked(reader):
+    chunks = []
+
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+
+        if size == 0:
+            # Skip any trailers up to the blank line ending the body
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            return b"".join(chunks)
+
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+def _close(conn):
+    _reader, writer = conn
+    writer.close()
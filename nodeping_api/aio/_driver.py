@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Runs the synchronous API functions on an asyncio event loop
+
+The modules in nodeping_api build their URLs and payloads and then make
+their requests through the current transport. To reuse that logic, a
+function is run with a transport that replays the responses received so
+far. When the function makes a request that has no response yet, the
+run stops, the request is awaited on the async transport, and the
+function is run again from the start with one more response to replay.
+Most functions make a single request, so they run at most twice.
+
+Replaying only works when a function makes its requests in the same
+order every time, so the batch helpers that spread calls over threads
+refuse to run under the replay transport. Their aio versions make one
+coroutine per call instead and run them with run_many or
+iter_completed.
+"""
+
+import asyncio
+import functools
+import inspect
+
+from .. import _concurrency, _query_nodeping_api
+from ._transport import AsyncTransport
+
+DEFAULT_TRANSPORT = AsyncTransport()
+
+
+class _Suspend(BaseException):
+    """ Raised by the replay transport to stop a run at a new request
+
+    Derived from BaseException so that code catching Exception inside
+    the function being run does not swallow it.
+    """
+
+    def __init__(self, request):
+        BaseException.__init__(self)
+        self.request = request
+
+
+class _ReplayTransport(object):
+    # Requests from other threads would take each other's responses
+    threadsafe = False
+
+    def __init__(self, responses):
+        self._responses = responses
+        self._position = 0
+
+    def request(self, method, url, body=None, headers=None):
+        if self._position < len(self._responses):
+            response = self._responses[self._position]
+            self._position += 1
+
+            return response
+
+        raise _Suspend((method, url, body, headers))
+
+
+async def run(func, *args, **kwargs):
+    """ Runs a synchronous API function, awaiting each of its requests
+
+    :param func: Function from one of the nodeping_api modules
+    :return: The return value of func
+    """
+
+    responses = []
+
+    while True:
+        try:
+            with _query_nodeping_api.using(_ReplayTransport(responses)):
+                return func(*args, **kwargs)
+        except _Suspend as suspended:
+            responses.append(await DEFAULT_TRANSPORT.request(*suspended.request))
+
+
+async def run_many(func, items, workers=None):
+    """ Awaits func for every item and returns the outcomes in input order
+
+    The counterpart of nodeping_api._concurrency.run_many for
+    coroutine functions.
+
+    :param func: Coroutine function called with each item
+    :type items: iterable
+    :param items: (key, item) pairs
+    :type workers: int
+    :param workers: Number of calls awaited at once. One at a time if None
+    :return: BatchResult for each item, in the order of items
+    :rtype: list
+    """
+
+    semaphore = asyncio.Semaphore(_limit(workers))
+
+    async def call(key, item):
+        async with semaphore:
+            return await _outcome(func, key, item)
+
+    return list(await asyncio.gather(*[call(key, item) for key, item in items]))
+
+
+async def iter_completed(func, items, workers=None):
+    """ Awaits func for every item, yielding outcomes as calls finish
+
+    The counterpart of nodeping_api._concurrency.iter_completed for
+    coroutine functions. Items are only taken from the iterable as
+    calls finish.
+
+    :return: BatchResult for each item as its call finishes
+    :rtype: async generator
+    """
+
+    limit = _limit(workers)
+    items = iter(items)
+    pending = set()
+
+    try:
+        while True:
+            for key, item in items:
+                pending.add(asyncio.ensure_future(_outcome(func, key, item)))
+
+                if len(pending) >= limit:
+                    break
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _outcome(func, key, item):
+    try:
+        result = await func(item)
+    except Exception as err:
+        return _concurrency.BatchResult(key, False, None, err)
+
+    return _concurrency.outcome_of(key, result)
+
+
+def _limit(workers):
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    return workers or 1
+
+
+def asyncify(func):
+    """ Makes a coroutine function from a synchronous API function
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run(func, *args, **kwargs)
+
+    return wrapper
+
+
+def asyncify_class(cls, exclude=()):
+    """ Makes a class whose methods are coroutines from a synchronous
+    API class such as GetChecks
+
+    :type exclude: iterable
+    :param exclude: Names of methods to leave out
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._sync = cls(*args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._sync, name)
+
+        # Only plain attributes such as token; blocking methods stay hidden
+        if callable(attr):
+            raise AttributeError(name)
+
+        return attr
+
+    namespace = {"__init__": __init__, "__getattr__": __getattr__,
+                 "__doc__": cls.__doc__}
+
+    for name, method in inspect.getmembers(cls, inspect.isfunction):
+        if (name.startswith("__") or name in exclude
+                or inspect.isgeneratorfunction(method)):
+            continue
+
+        namespace[name] = _async_method(name, method)
+
+    return type(cls.__name__, (object,), namespace)
+
+
+def _async_method(name, method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await run(getattr(self._sync, name), *args, **kwargs)
+
+    return wrapper
+
+
+def export(module, namespace, exclude=()):
+    """ Adds async versions of the public functions and classes of a
+    synchronous module to the namespace of an aio module
+
+    Generator functions, such as the streaming ones, are left out.
+
+    :type exclude: iterable
+    :param exclude: Names to leave out, such as "CheckQuery", or methods
+    of a class, such as "GetChecks.query"
+    """
+
+    names = []
+
+    for name, attr in vars(module).items():
+        if (name.startswith("_") or name in exclude
+                or getattr(attr, "__module__", None) != module.__name__):
+            continue
+
+        if inspect.isclass(attr):
+            prefix = name + "."
+            namespace[name] = asyncify_class(
+                attr, [excluded[len(prefix):] for excluded in exclude
+                       if excluded.startswith(prefix)])
+        elif inspect.isgeneratorfunction(attr):
+            # Streaming generators read from a blocking connection
+            continue
+        elif inspect.isfunction(attr):
+            namespace[name] = asyncify(attr)
+        else:
+            continue
+
+        names.append(name)
+
+    if hasattr(module, "API_URL"):
+        namespace["API_URL"] = module.API_URL
+
+    namespace["__all__"] = sorted(names)
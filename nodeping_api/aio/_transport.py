@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Transport that sends requests to NodePing on an asyncio event loop
+"""
+
+import asyncio
+import json
+from time import monotonic
+from urllib.error import URLError
+
+from .. import rate_limit, retry
+from ._connection_pool import AsyncConnectionPool
+
+
+class AsyncTransport(object):
+    def __init__(self, pool=None, rate_limiter=None, retry_policy=None, timeout=None):
+        """
+        :type pool: AsyncConnectionPool
+        :param pool: Connection pool used for requests. A new pool with
+        the defaults from config is used if not given
+        :type rate_limiter: RateLimiter
+        :param rate_limiter: Limiter that requests wait on. The limiter
+        from config.RATE_LIMIT is used if not given
+        :type retry_policy: RetryPolicy
+        :param retry_policy: When to retry failed requests. The policy
+        from the RETRY_ values in config is used if not given
+        :type timeout: int/float
+        :param timeout: Seconds a request waits on the network. Defaults
+        to config.REQUEST_TIMEOUT
+        """
+
+        if pool is None:
+            pool = AsyncConnectionPool()
+
+        self.pool = pool
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+
+    def limiter(self):
+        """ The rate limiter in effect for this transport, if any
+        """
+
+        return self.rate_limiter or rate_limit.configured_limiter()
+
+    def policy(self):
+        """ The retry policy in effect for this transport
+        """
+
+        return self.retry_policy or retry.configured_policy()
+
+    async def open(self, method, url, body=None, headers=None):
+        """ Sends a request and reads the response, retrying as the
+        retry policy allows
+
+        :rtype: AsyncResponse
+        """
+
+        policy = self.policy()
+        started = monotonic()
+        attempt = 1
+
+        while True:
+            try:
+                response = await self._send(method, url, body, headers)
+            except URLError as err:
+                delay = policy.retry_delay(method, headers, attempt, started, error=err)
+
+                if delay is None:
+                    raise
+            else:
+                delay = policy.retry_delay(
+                    method, headers, attempt, started, status=response.status,
+                    retry_after=response.getheader("Retry-After"))
+
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, method, url, body, headers):
+        """ Sends one attempt of a request after waiting on the rate limiter
+        """
+
+        limiter = self.limiter()
+
+        if limiter is not None:
+            delay = limiter.reserve()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        response = await self.pool.request(method, url, body, headers, self.timeout)
+
+        if limiter is not None:
+            limiter.on_response(response.status, response.getheader("Retry-After"))
+
+        return response
+
+    async def request(self, method, url, body=None, headers=None):
+        """ Sends a request and decodes the JSON that NodePing returned
+
+        Error responses from NodePing are decoded the same as successful
+        ones, so API errors are returned as a dictionary with an "error"
+        key.
+
+        :rtype: dict
+        """
+
+        response = await self.open(method, url, body, headers)
+
+        return json.loads(response.read().decode('utf-8'))
+
+    def close(self):
+        """ Closes the idle connections held by this transport
+        """
+
+        self.pool.clear()
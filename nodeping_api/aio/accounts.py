@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.accounts
+"""
+
+from .. import _concurrency
+from .. import accounts as _sync
+from ._driver import export, iter_completed
+
+export(_sync, globals())
+
+__all__.append("iter_for_each_subaccount")
+
+
+async def iter_for_each_subaccount(token, operation, customerids=None, workers=None):
+    """ Runs an operation against every subaccount, yielding results as
+    they arrive
+
+    Same as nodeping_api.accounts.iter_for_each_subaccount, except that
+    the operation is a coroutine function, such as
+    nodeping_api.aio.contacts.get_all, and up to `workers` accounts are
+    awaited at once on the event loop.
+
+    :return: BatchResult keyed by customerid for each account as its
+    call finishes. If the accounts could not be listed, a single
+    BatchResult with key None and the error from NodePing
+    :rtype: async generator
+    """
+
+    if customerids is None:
+        listed = await get_account(token)
+
+        if "error" in listed:
+            yield _concurrency.BatchResult(None, False, listed, None)
+            return
+
+        customerids = list(listed)
+
+    def run_for(customerid):
+        return operation(token, customerid=customerid)
+
+    async for outcome in iter_completed(
+            run_for, [(customerid, customerid) for customerid in customerids], workers):
+        yield outcome
+
+
+async def for_each_subaccount(token, operation, customerids=None, workers=None):
+    """ Runs an operation against every subaccount and merges the results
+
+    Same as nodeping_api.accounts.for_each_subaccount, with a coroutine
+    function as the operation.
+
+    :return: The result of the operation for each customerid, or the
+    error from get_account if the accounts could not be listed
+    :rtype: dict
+    """
+
+    outcomes = [outcome async for outcome in
+                iter_for_each_subaccount(token, operation, customerids, workers)]
+
+    return _sync._merge_outcomes(outcomes)
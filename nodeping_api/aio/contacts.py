@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.contacts
+"""
+
+from .. import _utils
+from .. import contacts as _sync
+from ._driver import export, run, run_many
+
+export(_sync, globals())
+
+
+class ContactDirectory(_sync.ContactDirectory):
+    """ Same as nodeping_api.contacts.ContactDirectory, with the contacts
+    downloaded on the event loop:
+
+        directory = await contacts.ContactDirectory.load(token)
+        directory.get_by_type("sms")
+
+    The lookups do not make requests, so they are not coroutines.
+    """
+
+    def __init__(self, token, customerid=None, contacts=None):
+        if contacts is None:
+            raise TypeError("Use await ContactDirectory.load(token) to download the contacts")
+
+        _sync.ContactDirectory.__init__(self, token, customerid, contacts)
+
+    @classmethod
+    async def load(cls, token, customerid=None):
+        """ Downloads the contacts and builds a directory from them
+
+        :rtype: ContactDirectory
+        """
+
+        return cls(token, customerid, await get_all(token, customerid))
+
+    async def refresh(self):
+        """ Downloads the contacts and rebuilds the indexes
+        """
+
+        self._build(await get_all(self.token, self.customerid))
+
+
+async def mute_contact_method(token, contact_id, duration, customerid=None):
+    """ Mute a contact method for a specified duration in seconds
+
+    Same as nodeping_api.contacts.mute_contact_method.
+    """
+
+    return _sync._single(await mute_contact_methods(token, [contact_id], duration, customerid))
+
+
+async def mute_contact(token, contact, duration, customerid=None):
+    """ Mute a contact for a specified duration in seconds
+
+    Same as nodeping_api.contacts.mute_contact.
+    """
+
+    return _sync._single(await mute_contacts(token, [contact], duration, customerid))
+
+
+async def mute_contact_methods(token, contact_method_ids, duration, customerid=None,
+                               workers=None):
+    """ Mute many contact methods with one GET and one PUT per contact
+
+    Same as nodeping_api.contacts.mute_contact_methods, with up to
+    `workers` contacts updated at once on the event loop.
+
+    :rtype: list
+    """
+
+    directory = await ContactDirectory.load(token, customerid)
+
+    if directory.error is not None:
+        return directory.error
+
+    grouped, missing = _sync._group_methods(directory, contact_method_ids)
+    outcomes = await _put_mutes(token, directory, grouped, duration, customerid, workers)
+
+    return outcomes + _sync._missing(missing, "No contact method found")
+
+
+async def mute_contacts(token, contact_ids, duration, customerid=None, workers=None):
+    """ Mute every contact method of many contacts with one GET
+
+    Same as nodeping_api.contacts.mute_contacts, with up to `workers`
+    contacts updated at once on the event loop.
+
+    :rtype: list
+    """
+
+    directory = await ContactDirectory.load(token, customerid)
+
+    if directory.error is not None:
+        return directory.error
+
+    grouped, missing = _sync._group_contacts(directory, contact_ids)
+    outcomes = await _put_mutes(token, directory, grouped, duration, customerid, workers)
+
+    return outcomes + _sync._missing(missing, "No contact found")
+
+
+async def _put_mutes(token, directory, grouped, duration, customerid, workers):
+    mute = _utils.mute_value(duration)
+
+    def put_one(contact_id):
+        addresses = _sync._muted_addresses(directory, contact_id, grouped[contact_id], mute)
+
+        return run(_sync._put_addresses, token, contact_id, addresses, customerid)
+
+    return await run_many(
+        put_one, [(contact_id, contact_id) for contact_id in grouped], workers)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.create_check
+"""
+
+from .. import create_check as _sync
+from ._driver import export, iter_completed, run
+
+export(_sync, globals())
+
+
+async def bulk_create(token, specs, customerid=None, workers=None):
+    """ Creates many checks, yielding each result as it completes
+
+    Same as nodeping_api.create_check.bulk_create, as an async generator
+    with up to `workers` checks being created at once on the event loop.
+    Closing the generator before the end cancels the checks still being
+    created.
+
+    :return: BatchResult(key, ok, result, error) for each spec as it
+    completes, where key is the position of the spec in specs
+    :rtype: async generator
+    """
+
+    def create_one(spec):
+        builder, kwargs = _sync.validate_spec(spec)
+        kwargs.setdefault('customerid', customerid)
+
+        return run(builder, token, **kwargs)
+
+    async for outcome in iter_completed(create_one, enumerate(specs), workers):
+        yield outcome
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.get_checks
+"""
+
+from .. import get_checks as _sync
+from ._driver import export
+
+# CheckQuery makes its requests when all() or stream() is called, long
+# after query() has returned, so it cannot be replayed. Build a query with
+# nodeping_api.get_checks to pass its predicate to the aio functions.
+export(_sync, globals(), exclude=("CheckQuery", "GetChecks.query"))
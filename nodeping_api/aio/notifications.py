@@ -0,0 +1,10 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.notifications
+"""
+
+from .. import notifications as _sync
+from ._driver import export
+
+export(_sync, globals())
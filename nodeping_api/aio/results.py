@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.results
+"""
+
+from .. import results as _sync
+from ._driver import export, run_many
+
+export(_sync, globals())
+
+
+async def get_uptime_many(token,
+                          check_ids,
+                          interval="months",
+                          start=None,
+                          end="now",
+                          customerid=None,
+                          offset=None,
+                          labels=None,
+                          workers=None):
+    """ Retrieves uptime for many checks and combines it into one table
+
+    Same as nodeping_api.results.get_uptime_many, with up to `workers`
+    checks requested at once on the event loop.
+
+    :return: {"periods", "checks", "account", "labels", "errors"}
+    :rtype: dict
+    """
+
+    def uptime_for(check_id):
+        return get_uptime(token, check_id, customerid=customerid, offset=offset,
+                          interval=interval, start=start, end=end)
+
+    outcomes = await run_many(
+        uptime_for, [(check_id, check_id) for check_id in check_ids], workers)
+
+    return _sync._uptime_table(outcomes, labels)
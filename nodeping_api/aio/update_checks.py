@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Async versions of the functions in nodeping_api.update_checks
+"""
+
+from .. import _concurrency, _utils
+from .. import update_checks as _sync
+from ._driver import export, run, run_many
+from .get_checks import GetChecks
+
+export(_sync, globals())
+
+
+async def mute_matching(token, predicate, duration, customerid=None, workers=None,
+                        checks=None):
+    """ Mutes every check that matches a predicate
+
+    Same as nodeping_api.update_checks.mute_matching, with up to
+    `workers` checks muted at once on the event loop.
+
+    :rtype: list
+    :return: BatchResult for each muted check, or the error returned by
+    NodePing when listing the checks
+    """
+
+    return await _mute_all(token, predicate, _utils.mute_value(duration), customerid,
+                           workers, checks)
+
+
+async def unmute_matching(token, predicate=None, customerid=None, workers=None,
+                          checks=None):
+    """ Unmutes the muted checks that match a predicate
+
+    Same as nodeping_api.update_checks.unmute_matching, with up to
+    `workers` checks unmuted at once on the event loop.
+
+    :rtype: list
+    :return: BatchResult for each unmuted check, or the error returned by
+    NodePing when listing the checks
+    """
+
+    return await _mute_all(token, _sync._muted_matching(predicate), False, customerid,
+                           workers, checks)
+
+
+async def update_many(token, checkids, fields, customerid=None, workers=None,
+                      detailed=False):
+    """ Updates a field(s) in multiple existing NodePing checks
+
+    Same as nodeping_api.update_checks.update_many, with up to `workers`
+    updates awaited at once on the event loop.
+
+    :rtype: list
+    :return: Return information from NodePing query for each check
+    """
+
+    def update_one(item):
+        checkid, checktype = item
+
+        return update(token, checkid, checktype, fields.copy(), customerid)
+
+    outcomes = await run_many(
+        update_one, [(checkid, (checkid, checktype))
+                     for checkid, checktype in checkids.items()], workers)
+
+    if detailed:
+        return outcomes
+
+    _concurrency.raise_first_error(outcomes)
+
+    return [outcome.result for outcome in outcomes]
+
+
+async def update_many_if_changed(token, changes, customerid=None, workers=None,
+                                 current=None, ignore=()):
+    """ Updates many checks, sending only the fields that differ
+
+    Same as nodeping_api.update_checks.update_many_if_changed, with up
+    to `workers` checks updated at once on the event loop.
+
+    :rtype: list
+    :return: BatchResult for each check in the order of changes. The
+    result is None for checks that were already up to date
+    """
+
+    if current is None:
+        current = await GetChecks(token, customerid=customerid).all_checks()
+
+        if "error" in current:
+            return [_concurrency.outcome_of(checkid, current) for checkid in changes]
+
+    async def update_one(item):
+        checkid, fields = item
+        check = current.get(checkid)
+
+        if check is None:
+            return _sync._not_found(checkid)
+
+        return await update_if_changed(token, checkid, fields, customerid, check, ignore)
+
+    return await run_many(
+        update_one, [(checkid, (checkid, fields)) for checkid, fields in changes.items()],
+        workers)
+
+
+async def _mute_all(token, predicate, mute, customerid, workers, checks):
+    if checks is None:
+        checks = await GetChecks(token, customerid=customerid).all_checks()
+
+        if "error" in checks:
+            return checks
+
+    def mute_one(item):
+        checkid, checktype = item
+
+        return run(_sync._set_mute, token, checkid, checktype, mute, customerid)
+
+    return await run_many(mute_one, _sync._mute_targets(checks, predicate), workers)
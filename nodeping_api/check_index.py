@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Look up check IDs by label, target, type, and home location.
+
+CheckIndex is built from one download of the list of checks and keeps a
+hash index for each field, plus a prefix tree of labels, so finding the
+checks with a label or target does not scan every check:
+
+    client = NodePingClient(token)
+    index = check_index.build(token)
+    index.attach(client.transport)
+
+    index.by_label("web-1")
+    index.label_prefix("web-")
+
+Once attached, checks created, updated, or deleted through the client
+are added, changed, or removed in the index as NodePing confirms them.
+"""
+
+import threading
+
+from . import get_checks
+
+try:
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from urlparse import parse_qs, urlparse
+
+FIELDS = ("label", "target", "type", "homeloc")
+
+
+class CheckIndex(object):
+    def __init__(self, checks=None, customerid=None):
+        """
+        :type checks: dict
+        :param checks: Checks keyed by check ID, as from
+        GetChecks.all_checks
+        :type customerid: string
+        :param customerid: Subaccount the checks belong to. Changes to
+        other accounts seen by an attached transport are ignored
+        """
+
+        self.customerid = customerid
+        self._checks = {}
+        self._indexes = dict((field, {}) for field in FIELDS)
+        self._labels = _TrieNode()
+        self._lock = threading.RLock()
+
+        for check_id, check in (checks or {}).items():
+            if isinstance(check, dict):
+                self.add(check_id, check)
+
+    def add(self, check_id, check):
+        """ Adds a check, replacing the check with the same ID
+        """
+
+        with self._lock:
+            self.remove(check_id)
+            self._checks[check_id] = check
+
+            for field, value in _index_values(check).items():
+                self._indexes[field].setdefault(value, set()).add(check_id)
+
+            label = check.get("label")
+
+            if label:
+                self._labels.insert(label, check_id)
+
+    def remove(self, check_id):
+        """ Removes a check if it is in the index
+        """
+
+        with self._lock:
+            check = self._checks.pop(check_id, None)
+
+            if check is None:
+                return
+
+            for field, value in _index_values(check).items():
+                ids = self._indexes[field].get(value)
+
+                if ids is not None:
+                    ids.discard(check_id)
+
+                    if not ids:
+                        del self._indexes[field][value]
+
+            label = check.get("label")
+
+            if label:
+                self._labels.discard(label, check_id)
+
+    def get(self, check_id):
+        """ The indexed contents of a check, or None
+        """
+
+        return self._checks.get(check_id)
+
+    def __len__(self):
+        return len(self._checks)
+
+    def __contains__(self, check_id):
+        return check_id in self._checks
+
+    def by_label(self, label):
+        """ IDs of the checks with exactly this label
+
+        :rtype: set
+        """
+
+        return self._lookup("label", label)
+
+    def by_target(self, target):
+        """ IDs of the checks with exactly this target
+
+        :rtype: set
+        """
+
+        return self._lookup("target", target)
+
+    def by_type(self, check_type):
+        """ IDs of the checks of a type, such as "HTTP"
+
+        :rtype: set
+        """
+
+        return self._lookup("type", check_type.upper())
+
+    def by_homeloc(self, homeloc):
+        """ IDs of the checks that run from a home location
+
+        :rtype: set
+        """
+
+        return self._lookup("homeloc", homeloc)
+
+    def label_prefix(self, prefix):
+        """ IDs of the checks with a label starting with prefix
+
+        :rtype: set
+        """
+
+        with self._lock:
+            return self._labels.collect(prefix)
+
+    def attach(self, transport):
+        """ Keeps the index up to date with the checks created, updated,
+        and deleted through a transport, such as a client's transport
+        """
+
+        transport.add_listener(self._on_response)
+
+    def detach(self, transport):
+        transport.remove_listener(self._on_response)
+
+    def _lookup(self, field, value):
+        with self._lock:
+            return set(self._indexes[field].get(value, ()))
+
+    def _on_response(self, method, url, result):
+        """ Applies a confirmed change to a check to the index
+        """
+
+        if method == "GET" or not url.startswith(get_checks.API_URL):
+            return
+
+        if not isinstance(result, dict) or "error" in result:
+            return
+
+        parsed = urlparse(url)
+        customerid = parse_qs(parsed.query).get("customerid", [None])[0]
+
+        if customerid != self.customerid:
+            return
+
+        path = parsed.path.rstrip("/").split("/")
+        check_id = path[-1] if path[-1] != "checks" else result.get("_id")
+
+        if not check_id:
+            return
+
+        with self._lock:
+            if method == "DELETE":
+                self.remove(check_id)
+            elif "_id" in result:
+                check = dict(self._checks.get(check_id) or {})
+                check.update(result)
+                self.add(check_id, check)
+
+
+class _TrieNode(object):
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        """ One character of a prefix tree of labels
+        """
+
+        self.children = {}
+        self.ids = set()
+
+    def insert(self, text, check_id):
+        node = self
+
+        for char in text:
+            node = node.children.setdefault(char, _TrieNode())
+
+        node.ids.add(check_id)
+
+    def discard(self, text, check_id):
+        path = [self]
+
+        for char in text:
+            node = path[-1].children.get(char)
+
+            if node is None:
+                return
+
+            path.append(node)
+
+        path[-1].ids.discard(check_id)
+
+        # Drop the branches left empty
+        for char, parent in zip(reversed(text), reversed(path[:-1])):
+            child = parent.children[char]
+
+            if child.ids or child.children:
+                break
+
+            del parent.children[char]
+
+    def collect(self, prefix):
+        node = self
+
+        for char in prefix:
+            node = node.children.get(char)
+
+            if node is None:
+                return set()
+
+        found = set()
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+            found.update(node.ids)
+            stack.extend(node.children.values())
+
+        return found
+
+
+def build(token, customerid=None):
+    """ Builds an index from the checks on an account
+
+    :param token: NodePing API token
+    :type token: str
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :return: The index, or the error returned by NodePing
+    :rtype: CheckIndex
+    """
+
+    checks = get_checks.GetChecks(token, customerid=customerid).all_checks()
+
+    if "error" in checks:
+        return checks
+
+    return CheckIndex(checks, customerid)
+
+
+def _index_values(check):
+    """ The value of each indexed field of a check that has one
+    """
+
+    parameters = check.get("parameters") or {}
+    values = {
+        "label": check.get("label"),
+        "target": parameters.get("target") or check.get("target"),
+        "type": (check.get("type") or "").upper(),
+        "homeloc": check.get("homeloc") or parameters.get("homeloc"),
+    }
+
+    return dict((field, value) for field, value in values.items() if value)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" A client that holds your token, subaccount ID, and connections.
+
+The modules of this package are available as attributes of the client
+with the token and customerid already filled in, and every request the
+client makes goes through its own pool of keep-alive connections.
+Functions and classes that do not take a token, such as
+create_check.validate_spec, are available unchanged:
+
+    client = NodePingClient(token, customerid=customerid)
+    checks = client.get_checks.GetChecks().all_checks()
+    client.update_checks.update(checkid, "PING", {"interval": 5})
+"""
+
+import functools
+import inspect
+
+from . import (_query_nodeping_api, accounts, check_token, contacts,
+               create_check, delete_checks, diagnostics, disable_check,
+               get_checks, group_contacts, information, maintenance,
+               notificationprofiles, notifications, results, schedules,
+               update_checks)
+from ._connection_pool import ConnectionPool
+from ._transport import Transport
+
+MODULES = (
+    accounts,
+    check_token,
+    contacts,
+    create_check,
+    delete_checks,
+    diagnostics,
+    disable_check,
+    get_checks,
+    group_contacts,
+    information,
+    maintenance,
+    notificationprofiles,
+    notifications,
+    results,
+    schedules,
+    update_checks,
+)
+
+
+class NodePingClient(object):
+    def __init__(self, token, customerid=None, pool_maxsize=None,
+                 idle_timeout=None, rate_limiter=None, retry_policy=None,
+                 timeout=None):
+        """
+        :type token: string
+        :param token: NodePing API token
+        :type customerid: string
+        :param customerid: Optional subaccount ID used for every call
+        :type pool_maxsize: int
+        :param pool_maxsize: Idle connections kept open per host.
+        Defaults to config.POOL_MAXSIZE
+        :type idle_timeout: int/float
+        :param idle_timeout: Seconds an idle connection is kept.
+        Defaults to config.POOL_IDLE_TIMEOUT
+        :type rate_limiter: RateLimiter
+        :param rate_limiter: Limiter for this client's requests. Pass the
+        same limiter to several clients to share it. Defaults to the
+        limiter set up from config.RATE_LIMIT, if any
+        :type retry_policy: RetryPolicy
+        :param retry_policy: When to retry this client's failed requests.
+        Defaults to the policy from the RETRY_ values in config
+        :type timeout: int/float
+        :param timeout: Seconds a request waits on the network. Defaults
+        to config.REQUEST_TIMEOUT
+        """
+
+        self.token = token
+        self.customerid = customerid
+        self.transport = Transport(ConnectionPool(pool_maxsize, idle_timeout),
+                                   rate_limiter, retry_policy, timeout)
+
+        for module in MODULES:
+            name = module.__name__.rsplit(".", 1)[-1]
+            setattr(self, name, _BoundModule(self, module))
+
+    def call(self, func, *args, **kwargs):
+        """ Runs a function with this client's token and customerid
+
+        The token is passed as the first argument, and the customerid is
+        passed if the function accepts one and it was not given.
+        """
+
+        names = _parameter_names(func)
+
+        if names and names[0] == "self":
+            names = names[1:]
+
+        if "customerid" in names and "customerid" not in kwargs:
+            if names.index("customerid") > len(args):
+                kwargs["customerid"] = self.customerid
+
+        with _query_nodeping_api.using(self.transport):
+            return _in_transport(self.transport, func(self.token, *args, **kwargs))
+
+    def close(self):
+        """ Closes the idle connections held by the client
+        """
+
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _BoundModule(object):
+    def __init__(self, client, module):
+        """ A module whose functions are called through a client
+        """
+
+        self._client = client
+        self._module = module
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+
+        if name.startswith("_") or inspect.ismodule(attr):
+            return attr
+
+        if not _takes_token(attr):
+            # Helpers such as create_check.validate_spec need no token
+            return attr
+
+        if inspect.isclass(attr):
+            bound = _bind_class(self._client, attr)
+        elif inspect.isfunction(attr):
+            bound = functools.partial(self._client.call, attr)
+        else:
+            return attr
+
+        # Cached on the instance so __getattr__ is skipped next time
+        setattr(self, name, bound)
+
+        return bound
+
+    def __dir__(self):
+        return [name for name in dir(self._module) if not name.startswith("_")]
+
+
+class _BoundObject(object):
+    def __init__(self, client, obj):
+        """ An instance whose method calls go through the client's transport
+        """
+
+        self._client = client
+        self._obj = obj
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+
+        if not callable(attr):
+            return attr
+
+        transport = self._client.transport
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs):
+            with _query_nodeping_api.using(transport):
+                return _in_transport(transport, attr(*args, **kwargs))
+
+        return method
+
+
+def _bind_class(client, cls):
+    """ Returns a factory for instances of cls created with the
+    client's token and customerid
+    """
+
+    @functools.wraps(cls)
+    def factory(*args, **kwargs):
+        return _BoundObject(client, client.call(cls, *args, **kwargs))
+
+    return factory
+
+
+def _in_transport(transport, result):
+    """ Makes a generator returned by a call also run in the transport
+
+    Generators run their body as they are iterated, after the call that
+    created them has returned, so each step is run inside the transport.
+    Other results are returned as they are.
+    """
+
+    if not inspect.isgenerator(result):
+        return result
+
+    def steps():
+        while True:
+            with _query_nodeping_api.using(transport):
+                try:
+                    item = next(result)
+                except StopIteration:
+                    return
+
+            yield item
+
+    return steps()
+
+
+def _takes_token(attr):
+    """ Whether a function or class of a module takes the token first
+    """
+
+    if not (inspect.isclass(attr) or inspect.isfunction(attr)):
+        return False
+
+    try:
+        names = _parameter_names(attr)
+    except (TypeError, ValueError):
+        return False
+
+    if names and names[0] == "self":
+        names = names[1:]
+
+    return bool(names) and names[0] == "token"
+
+
+def _parameter_names(func):
+    """ Names of the positional parameters a function or class accepts
+    """
+
+    if inspect.isclass(func):
+        func = func.__init__
+
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except AttributeError:
+        return inspect.getargspec(func).args
+
+    return [p.name for p in parameters
+            if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Compact, column-oriented storage for check results.
+
+A list of result dictionaries from results.get_results takes a few
+hundred bytes per result. ResultColumns keeps the same results as typed
+arrays instead: timestamps and run times as arrays of doubles, the pass
+or fail flag as one bit per result, and the repetitive text fields as
+small integer codes into a table of distinct values.
+
+    columns = columnar.ResultColumns.from_records(
+        results.iter_results(token, check_id, start, end))
+
+    columns.percentiles([50, 95, 99])
+    columns.failure_ratio()
+
+NumPy is used for the calculations when it is installed. Without it the
+same results are computed with the standard library.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Numeric columns and the result keys they are read from
+NUMERIC_COLUMNS = ("ra", "s", "e", "rt")
+
+# Text columns stored as codes into a table of distinct values
+TEXT_COLUMNS = ("sc", "m", "l")
+
+# Number of set bits in each possible byte of the pass/fail bitmap
+_POPCOUNT = bytearray(bin(byte).count("1") for byte in range(256))
+
+
+class ResultColumns(object):
+    def __init__(self):
+        """ An empty set of results. Use append or from_records to fill it
+        """
+
+        self._length = 0
+        self._numeric = dict((name, array("d")) for name in NUMERIC_COLUMNS)
+        self._success = bytearray()
+        self._codes = dict((name, array("I")) for name in TEXT_COLUMNS)
+        self._values = dict((name, []) for name in TEXT_COLUMNS)
+        self._lookup = dict((name, {}) for name in TEXT_COLUMNS)
+
+    @classmethod
+    def from_records(cls, records):
+        """ Builds columns from result records
+
+        :type records: iterable
+        :param records: Result dictionaries, such as the list from
+        results.get_results or the generator from results.iter_results
+        :rtype: ResultColumns
+        """
+
+        columns = cls()
+
+        for record in records:
+            columns.append(record)
+
+        return columns
+
+    def append(self, record):
+        """ Adds one result record
+
+        Missing timestamps and run times are stored as NaN, and the `l`
+        field (locations the check ran in) is stored as the comma
+        separated location codes.
+        """
+
+        for name in NUMERIC_COLUMNS:
+            value = record.get(name)
+            self._numeric[name].append(float(value) if value not in (None, "") else float("nan"))
+
+        if self._length % 8 == 0:
+            self._success.append(0)
+
+        if record.get("su"):
+            self._success[self._length >> 3] |= 1 << (self._length & 7)
+
+        for name in TEXT_COLUMNS:
+            value = record.get(name)
+
+            if isinstance(value, dict):
+                value = ",".join(str(v) for v in value.values())
+
+            self._codes[name].append(self._intern(name, value))
+
+        self._length += 1
+
+    def __len__(self):
+        return self._length
+
+    def column(self, name):
+        """ Returns a column of values
+
+        :type name: string
+        :param name: One of ra, s, e, rt, su, sc, m, l
+        :return: array('d') for numeric columns, a list of bools for su,
+        and a list of strings for text columns
+        """
+
+        if name in self._numeric:
+            return self._numeric[name]
+
+        if name == "su":
+            return [self._succeeded(i) for i in range(self._length)]
+
+        values = self._values[name]
+
+        return [values[code] for code in self._codes[name]]
+
+    def row(self, index):
+        """ Returns one result as a dictionary
+        """
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError("result index out of range")
+
+        record = dict((name, self._numeric[name][index]) for name in NUMERIC_COLUMNS)
+        record["su"] = self._succeeded(index)
+
+        for name in TEXT_COLUMNS:
+            record[name] = self._values[name][self._codes[name][index]]
+
+        return record
+
+    def failures(self):
+        """ Number of results that failed
+        """
+
+        # Counted a byte at a time, so no copy of the bitmap is made
+        # bigger than the bitmap itself
+        if numpy is not None and self._success:
+            table = numpy.frombuffer(_POPCOUNT, dtype="u1")
+            passed = int(table[numpy.frombuffer(self._success, dtype="u1")].sum())
+        else:
+            passed = sum(_POPCOUNT[byte] for byte in self._success)
+
+        return self._length - passed
+
+    def failure_ratio(self):
+        """ Fraction of results that failed, from 0.0 to 1.0
+
+        :return: The ratio, or None if there are no results
+        :rtype: float
+        """
+
+        if not self._length:
+            return None
+
+        return self.failures() / float(self._length)
+
+    def percentiles(self, percents, column="rt"):
+        """ Percentiles of a numeric column, ignoring missing values
+
+        Uses linear interpolation between the closest values, the same
+        as numpy.percentile.
+
+        :type percents: list
+        :param percents: Percentiles to calculate, from 0 to 100
+        :type column: string
+        :param column: Numeric column, run time (rt) by default
+        :return: The value at each percentile, or None for each if the
+        column has no values
+        :rtype: list
+        """
+
+        if numpy is not None:
+            values = self.to_numpy()[column]
+            values = values[~numpy.isnan(values)]
+
+            if not len(values):
+                return [None for _ in percents]
+
+            return [float(v) for v in numpy.percentile(values, percents)]
+
+        values = sorted(v for v in self._numeric[column] if v == v)
+
+        if not values:
+            return [None for _ in percents]
+
+        return [_interpolate(values, percent) for percent in percents]
+
+    def percentile(self, percent, column="rt"):
+        return self.percentiles([percent], column)[0]
+
+    def mean(self, column="rt"):
+        """ Average of a numeric column, ignoring missing values
+        """
+
+        if numpy is not None:
+            values = self.to_numpy()[column]
+
+            if numpy.isnan(values).all():
+                return None
+
+            return float(numpy.nanmean(values))
+
+        values = [v for v in self._numeric[column] if v == v]
+
+        if not values:
+            return None
+
+        return sum(values) / len(values)
+
+    def to_numpy(self):
+        """ Returns the numeric columns and su as NumPy arrays
+
+        The numeric arrays share memory with the columns, so nothing is
+        copied, and results cannot be appended while they are in use.
+        Requires NumPy.
+
+        :rtype: dict
+        """
+
+        if numpy is None:
+            raise ImportError("NumPy is required for to_numpy")
+
+        arrays = dict((name, numpy.frombuffer(self._numeric[name], dtype="d")[:self._length])
+                      for name in NUMERIC_COLUMNS)
+
+        bits = numpy.unpackbits(numpy.frombuffer(bytes(self._success), dtype="u1"), bitorder="little")
+        arrays["su"] = bits[:self._length].astype(bool)
+
+        return arrays
+
+    def _succeeded(self, index):
+        return bool(self._success[index >> 3] & (1 << (index & 7)))
+
+    def _intern(self, name, value):
+        lookup = self._lookup[name]
+
+        try:
+            return lookup[value]
+        except KeyError:
+            code = lookup[value] = len(self._values[name])
+            self._values[name].append(value)
+
+            return code
+
+
+def _interpolate(values, percent):
+    """ Percentile of sorted values with linear interpolation
+    """
+
+    position = (len(values) - 1) * percent / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
@@ -1 +1,33 @@
 API_URL = 'https://api.nodeping.com/api/1/'
+
+# Keep-alive connections held open per host, and the seconds an unused
+# connection is kept before it is discarded
+POOL_MAXSIZE = 10
+POOL_IDLE_TIMEOUT = 60
+
+# Connections nodeping_api.aio has open at once per host. Requests beyond
+# it wait on the event loop for a connection to free up
+POOL_MAX_CONNECTIONS = 10
+
+# Seconds a request waits on the network, to connect or for each read,
+# before failing with a timeout. Waits forever when None
+REQUEST_TIMEOUT = 60
+
+# Requests per second allowed for the whole process, and how many can be
+# sent at once after being idle. No limit is applied when RATE_LIMIT is None
+RATE_LIMIT = None
+RATE_LIMIT_BURST = None
+
+# Retries for requests that fail with a network error or a 429, 502, 503,
+# or 504 response. Attempts include the first one, backoff is the most
+# seconds the first retry waits (doubling for each retry after it), and
+# no retry starts more than RETRY_DEADLINE seconds after the first attempt
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_BACKOFF = 30
+RETRY_DEADLINE = None
+
+# Seconds GetChecks keeps a downloaded list of checks so that all_checks,
+# passing_checks, failing_checks, and disabled_checks can share it.
+# Caching is off when set to 0
+CHECKS_CACHE_TTL = 0
@@ -8,7 +8,7 @@ creating, updating, and deleting contacts for a NodePing account
 or a subaccount.
 """
 
-from . import _query_nodeping_api, _utils, config
+from . import _concurrency, _query_nodeping_api, _utils, config
 
 API_URL = "{0}contacts".format(config.API_URL)
 
@@ -59,6 +59,9 @@ def get_by_type(token, contacttype, customerid=None):
     Returns all the data in a dictionary format from the originl
     JSON that is gathered from NodePing.
 
+    To look up several types, build a ContactDirectory once and use
+    its get_by_type instead.
+
     :param token: NodePing API token
     :type token: str
     :type contacttype: string
@@ -69,21 +72,147 @@ def get_by_type(token, contacttype, customerid=None):
     :rtype: dict
     """
 
-    contact_dict = {}
+    directory = ContactDirectory(token, customerid)
 
-    url = _utils.create_url(token, API_URL, customerid)
+    if directory.error is not None:
+        return directory.error
+
+    return directory.get_by_type(contacttype)
+
+
+class ContactDirectory(object):
+    def __init__(self, token, customerid=None, contacts=None):
+        """ The contacts of an account, indexed for lookups
+
+        The contacts are downloaded once with get_all and indexed by
+        address type, address, name, and custrole, so each lookup reads
+        one index instead of looping over every address of every
+        contact. Lookups return contacts keyed by contact ID, in the
+        format of get_all. Call refresh() to download them again.
+
+        If NodePing returns an error, it is kept in `error` and every
+        lookup finds nothing.
+
+        :type token: string
+        :param token: NodePing API token
+        :type customerid: string
+        :param customerid: subaccount ID
+        :type contacts: dict
+        :param contacts: Contacts as returned by get_all, to index them
+        without downloading them again
+        """
+
+        self.token = token
+        self.customerid = customerid
+
+        if contacts is None:
+            self.refresh()
+        else:
+            self._build(contacts)
+
+    def refresh(self):
+        """ Downloads the contacts and rebuilds the indexes
+        """
+
+        self._build(get_all(self.token, self.customerid))
+
+    def _build(self, contacts):
+        self.error = None
+        self.contacts = {}
+        self._owners = {}
+        self._indexes = dict((field, {}) for field in ("type", "address", "name", "custrole"))
+        self._no_addresses = {}
+
+        if not isinstance(contacts, dict) or "error" in contacts:
+            self.error = contacts
+            return
+
+        for contact_id, contact in contacts.items():
+            if not isinstance(contact, dict):
+                continue
+
+            self.contacts[contact_id] = contact
+            self._index("name", contact.get("name"), contact_id, contact)
+            self._index("custrole", contact.get("custrole"), contact_id, contact)
+
+            addresses = contact.get("addresses") or {}
+
+            if not addresses:
+                self._no_addresses[contact_id] = contact
+
+            for address_id, details in addresses.items():
+                self._owners[address_id] = contact_id
+                self._index("type", details.get("type"), contact_id, contact)
+                self._index("address", _normalize(details.get("address")),
+                            contact_id, contact)
+
+    def get(self, contact_id):
+        """ A contact by its ID, or None
+        """
+
+        return self.contacts.get(contact_id)
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __contains__(self, contact_id):
+        return contact_id in self.contacts
+
+    def get_by_type(self, contacttype):
+        """ Contacts with at least one address of a type, such as email,
+        sms, or webhook
+
+        :rtype: dict
+        """
+
+        return self._lookup("type", contacttype)
+
+    def by_address(self, address):
+        """ Contacts with an address, such as an email address or phone
+        number. Case and surrounding spaces are ignored
 
-    # Gets all contacts for account
-    contacts = _query_nodeping_api.get(url)
+        :rtype: dict
+        """
 
-    # Sorts contacts by type to return
-    for key, value in contacts.items():
-        _id = value['addresses']
+        return self._lookup("address", _normalize(address))
 
-        contact_dict.update({key: value for _contact_id, details in _id.items(
-        ) if details['type'] == contacttype})
+    def by_name(self, name):
+        """ Contacts with exactly this name
 
-    return contact_dict
+        :rtype: dict
+        """
+
+        return self._lookup("name", name)
+
+    def by_custrole(self, custrole):
+        """ Contacts with a role, such as "view", "edit", or "owner"
+
+        :rtype: dict
+        """
+
+        return self._lookup("custrole", custrole)
+
+    def without_addresses(self):
+        """ Contacts that have no addresses
+
+        :rtype: dict
+        """
+
+        return dict(self._no_addresses)
+
+    def owner(self, address_id):
+        """ ID of the contact an address ID from "addresses" belongs to,
+        or None
+        """
+
+        return self._owners.get(address_id)
+
+    def _index(self, field, value, contact_id, contact):
+        if value is not None:
+            self._indexes[field].setdefault(value, {})[contact_id] = contact
+
+    def _lookup(self, field, value):
+        return dict(self._indexes[field].get(value, {}))
 
 
 def create_contact(token,
@@ -202,7 +331,8 @@ def mute_contact_method(token,
     Note that the contact has to be the ID in the "addresses" portion
     of a contact
 
-    NOTE: This makes a GET request to the API before doing a PUT.
+    NOTE: This makes a GET request to the API before doing a PUT. To
+    mute several contact methods, use mute_contact_methods.
 
     :param token: The NodePing token for the account
     :type token: str
@@ -214,26 +344,7 @@ def mute_contact_method(token,
     :type customerid: str
     """
 
-    acc_contacts = get_all(token, customerid)
-
-    if isinstance(duration, int):
-        submit_duration = _utils.create_timestamp(duration)
-    else:
-        submit_duration = duration
-
-    for k, v in acc_contacts.items():
-        for k2, v2 in v["addresses"].items():
-            if k2 == contact_id:
-                parent_contact_id = k
-                v2.update({"mute": submit_duration})
-
-                url = "{0}/{1}".format(API_URL, parent_contact_id)
-                url = _utils.create_url(token, url, customerid)
-
-                addresses = acc_contacts[parent_contact_id]["addresses"]
-                return _query_nodeping_api.put(url, {"addresses": addresses})
-
-    return {"error": "No contact method found"}
+    return _single(mute_contact_methods(token, [contact_id], duration, customerid))
 
 
 def mute_contact(token,
@@ -245,7 +356,8 @@ def mute_contact(token,
     Note that the contact has to be the ID (or _id) in the portion
     of a contact
 
-    NOTE: This makes a GET request to the API before doing a PUT.
+    NOTE: This makes a GET request to the API before doing a PUT. To
+    mute several contacts, use mute_contacts.
 
     :param token: The NodePing token for the account
     :type token: str
@@ -257,39 +369,78 @@ def mute_contact(token,
     :type customerid: str
     """
 
-    acc_contacts = get_all(token, customerid)
+    return _single(mute_contacts(token, [contact], duration, customerid))
 
-    if isinstance(duration, int):
-        submit_duration = _utils.create_timestamp(duration)
-    else:
-        submit_duration = duration
 
-    for k, v in acc_contacts.items():
-        if k == contact:
-            for k2, v2 in v["addresses"].items():
-                v2.update({"mute": submit_duration})
+def mute_contact_methods(token,
+                         contact_method_ids,
+                         duration,
+                         customerid=None,
+                         workers=None):
+    """ Mute many contact methods with one GET and one PUT per contact
 
-            addresses = v["addresses"]
+    The contacts are downloaded once, and the contact methods are
+    grouped by the contact they belong to so each contact is only
+    updated once, however many of its methods are muted.
 
-            url = "{0}/{1}".format(API_URL, k)
-            url = _utils.create_url(token, url, customerid)
+    :param token: The NodePing token for the account
+    :type token: str
+    :param contact_method_ids: IDs from the "addresses" of contacts
+    :type contact_method_ids: list
+    :param duration: How long to mute the contact methods in seconds, or bool
+    :type duration: int/bool
+    :param customerid: (optional) ID for subaccount
+    :type customerid: str
+    :param workers: Number of contacts updated at once (default one at a time)
+    :type workers: int
+    :return: BatchResult keyed by contact ID for each updated contact,
+    followed by one keyed by contact method ID for each method that was
+    not found. If the contacts could not be downloaded, the error
+    :rtype: list
+    """
 
-            return _query_nodeping_api.put(url, {"addresses": addresses})
+    directory = ContactDirectory(token, customerid)
 
-    return {"error": "No contact found"}
+    if directory.error is not None:
+        return directory.error
 
+    grouped, missing = _group_methods(directory, contact_method_ids)
+    outcomes = _put_mutes(token, directory, grouped, duration, customerid, workers)
 
-    # for k, v in contacts.items():
-    #     for k2, v2 in v["addresses"].items():
-    #         if k2 == contact_id:
-    #             parent_contact_id = k
-    #             v2.update({"mute": submit_duration})
+    return outcomes + _missing(missing, "No contact method found")
 
-    #             url = "{0}/{1}".format(API_URL, parent_contact_id)
-    #             url = _utils.create_url(token, url, customerid)
 
-    #             addresses = contacts[parent_contact_id]["addresses"]
-    #             return _query_nodeping_api.put(url, {"addresses": addresses})
+def mute_contacts(token,
+                  contact_ids,
+                  duration,
+                  customerid=None,
+                  workers=None):
+    """ Mute every contact method of many contacts with one GET
+
+    :param token: The NodePing token for the account
+    :type token: str
+    :param contact_ids: IDs of the contacts to mute
+    :type contact_ids: list
+    :param duration: How long to mute the contacts in seconds, or bool
+    :type duration: int/bool
+    :param customerid: (optional) ID for subaccount
+    :type customerid: str
+    :param workers: Number of contacts updated at once (default one at a time)
+    :type workers: int
+    :return: BatchResult keyed by contact ID for each contact. If the
+    contacts could not be downloaded, the error
+    :rtype: list
+    """
+
+    directory = ContactDirectory(token, customerid)
+
+    if directory.error is not None:
+        return directory.error
+
+    grouped, missing = _group_contacts(directory, contact_ids)
+    outcomes = _put_mutes(token, directory, grouped, duration, customerid, workers)
+
+    return outcomes + _missing(missing, "No contact found")
 
 
 def delete_contact(token,
@@ -335,3 +486,103 @@ def reset_password(token, contact_id, customerid=None):
     url = _utils.create_url(token, url, customerid)
 
     return _query_nodeping_api.get(url)
+
+
+def _put_mutes(token, directory, grouped, duration, customerid, workers):
+    """ Sends one PUT per contact with the given addresses muted
+
+    Every method is muted until the same moment.
+    """
+
+    mute = _utils.mute_value(duration)
+
+    def put_one(contact_id):
+        addresses = _muted_addresses(directory, contact_id, grouped[contact_id], mute)
+
+        return _put_addresses(token, contact_id, addresses, customerid)
+
+    return _concurrency.run_many(
+        put_one, [(contact_id, contact_id) for contact_id in grouped], workers)
+
+
+def _group_methods(directory, contact_method_ids):
+    """ The contact method IDs grouped by the contact they belong to,
+    and the IDs that belong to no contact
+    """
+
+    grouped = {}
+    missing = []
+
+    for method_id in contact_method_ids:
+        owner = directory.owner(method_id)
+
+        if owner is not None:
+            grouped.setdefault(owner, []).append(method_id)
+        else:
+            missing.append(method_id)
+
+    return grouped, missing
+
+
+def _group_contacts(directory, contact_ids):
+    """ Every contact method ID of each contact, and the contact IDs
+    that were not found
+    """
+
+    grouped = {}
+    missing = []
+
+    for contact_id in contact_ids:
+        if contact_id in directory:
+            grouped[contact_id] = list(directory.get(contact_id).get("addresses") or {})
+        else:
+            missing.append(contact_id)
+
+    return grouped, missing
+
+
+def _muted_addresses(directory, contact_id, address_ids, mute):
+    """ A copy of the addresses of a contact with address_ids muted
+    """
+
+    addresses = dict((address_id, dict(address)) for address_id, address
+                     in directory.get(contact_id)["addresses"].items())
+
+    for address_id in address_ids:
+        addresses[address_id]["mute"] = mute
+
+    return addresses
+
+
+def _put_addresses(token, contact_id, addresses, customerid):
+    url = "{0}/{1}".format(API_URL, contact_id)
+    url = _utils.create_url(token, url, customerid)
+
+    return _query_nodeping_api.put(url, {"addresses": addresses})
+
+
+def _missing(ids, message):
+    return [_concurrency.outcome_of(missing_id, {"error": message}) for missing_id in ids]
+
+
+def _single(outcomes):
+    """ The response for a batch of one, the way the single functions
+    have always returned it
+    """
+
+    if isinstance(outcomes, dict):
+        return outcomes
+
+    _concurrency.raise_first_error(outcomes)
+
+    return outcomes[0].result
+
+
+def _normalize(address):
+    """ An address as it is indexed, so lookups ignore case and spaces
+    """
+
+    if address is None:
+        return None
+
+    return str(address).strip().lower()
@@ -2,9 +2,18 @@
 # -*- coding: utf-8 -*-
 
 """ Module for creating NodePing checks
+
+Every check function takes an optional idempotency_key. A POST is only
+retried after a transient failure when it has one, and the key is sent
+as the Idempotency-Key header. NodePing does not document ignoring a
+repeated key, so a retry can still create a duplicate check. Use a key
+that is unique to the check being created, such as one stored with it
+in your own records.
 """
 
-from . import _query_nodeping_api, _utils, config
+import inspect
+
+from . import _concurrency, _query_nodeping_api, _utils, config
 
 API_URL = "{0}checks".format(config.API_URL)
 
@@ -93,6 +102,8 @@ def agent_check(
     scheduling for notifications
     :type oldresultfail: bool
     :param oldresultfail: Fail the check if results are too old
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -100,7 +111,7 @@ def agent_check(
     check_variables = _package_variables(locals(), 'AGENT')
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def audio_check(
@@ -162,6 +173,8 @@ def audio_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -169,7 +182,7 @@ def audio_check(
     check_variables = _package_variables(locals(), 'AUDIO')
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def cluster_check(
@@ -234,6 +247,8 @@ def cluster_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -244,7 +259,7 @@ def cluster_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def dns_check(
@@ -318,6 +333,8 @@ def dns_check(
     scheduling for notifications
     :type verify: bool
     :param verify: If True will authenticate using DNSSEC
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -326,7 +343,7 @@ def dns_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def doh_dot_check(
@@ -411,6 +428,8 @@ def doh_dot_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -419,7 +438,7 @@ def doh_dot_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def ftp_check(
@@ -486,6 +505,8 @@ def ftp_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -494,7 +515,7 @@ def ftp_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def http_check(
@@ -552,6 +573,8 @@ def http_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -560,7 +583,7 @@ def http_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def httpadv_check(
@@ -651,6 +674,8 @@ def httpadv_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -659,7 +684,7 @@ def httpadv_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def httpcontent_check(
@@ -725,6 +750,8 @@ def httpcontent_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -733,7 +760,7 @@ def httpcontent_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def httpparse_check(
@@ -815,6 +842,8 @@ def httpparse_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -825,7 +854,7 @@ def httpparse_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def imap4_check(
@@ -898,6 +927,8 @@ def imap4_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -906,7 +937,7 @@ def imap4_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def mongodb_check(
@@ -974,6 +1005,8 @@ def mongodb_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -982,7 +1015,7 @@ def mongodb_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def mtr_check(
@@ -1041,6 +1074,8 @@ def mtr_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1049,7 +1084,7 @@ def mtr_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def mysql_check(
@@ -1125,6 +1160,8 @@ def mysql_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1133,7 +1170,7 @@ def mysql_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def ntp_check(
@@ -1195,6 +1232,8 @@ def ntp_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1203,7 +1242,7 @@ def ntp_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def ping_check(
@@ -1262,6 +1301,8 @@ def ping_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1270,7 +1311,7 @@ def ping_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def pop3_check(
@@ -1347,6 +1388,8 @@ def pop3_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1355,7 +1398,7 @@ def pop3_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def port_check(
@@ -1412,6 +1455,8 @@ def port_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1420,7 +1465,7 @@ def port_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def postgresql_check(
@@ -1478,6 +1523,8 @@ def postgresql_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1486,7 +1533,7 @@ def postgresql_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def redis_check(
@@ -1549,6 +1596,8 @@ def redis_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1557,7 +1606,7 @@ def redis_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def push_check(
@@ -1638,6 +1687,8 @@ def push_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1648,7 +1699,7 @@ def push_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def rbl_check(
@@ -1708,6 +1759,8 @@ def rbl_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1716,7 +1769,7 @@ def rbl_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def rdp_check(
@@ -1768,6 +1821,8 @@ def rdp_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1776,7 +1831,7 @@ def rdp_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def spec10dns_check(
@@ -1841,6 +1896,8 @@ def spec10dns_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1851,7 +1908,7 @@ def spec10dns_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def spec10rdds_check(
@@ -1918,6 +1975,8 @@ def spec10rdds_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1928,7 +1987,7 @@ def spec10rdds_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def sip_check(
@@ -1981,6 +2040,8 @@ def sip_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -1989,7 +2050,7 @@ def sip_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def smtp_check(
@@ -2064,6 +2125,8 @@ def smtp_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2072,7 +2135,7 @@ def smtp_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def snmp_check(
@@ -2156,6 +2219,8 @@ def snmp_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2166,7 +2231,7 @@ def snmp_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def ssh_check(
@@ -2231,6 +2296,8 @@ def ssh_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2239,7 +2306,7 @@ def ssh_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def ssl_check(
@@ -2297,6 +2364,8 @@ def ssl_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2305,7 +2374,7 @@ def ssl_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def websocket_check(
@@ -2366,6 +2435,8 @@ def websocket_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2374,7 +2445,7 @@ def websocket_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
 
 
 def whois_check(
@@ -2441,6 +2512,8 @@ def whois_check(
     :type notifications: list
     :param notifications: list of objects containing contact ID, delay, and
     scheduling for notifications
+    :type idempotency_key: string
+    :param idempotency_key: Optional key that lets the request be retried
     :return: Response from NodePing
     :rtype: dict
     """
@@ -2449,4 +2522,142 @@ def whois_check(
 
     url = _utils.create_url(token, API_URL, customerid)
 
-    return _query_nodeping_api.post(url, check_variables)
+    return _query_nodeping_api.post(url, check_variables, kwargs.get('idempotency_key'))
+
+
+CHECK_BUILDERS = {
+    'AGENT': agent_check,
+    'AUDIO': audio_check,
+    'CLUSTER': cluster_check,
+    'DNS': dns_check,
+    'DOHDOT': doh_dot_check,
+    'FTP': ftp_check,
+    'HTTP': http_check,
+    'HTTPADV': httpadv_check,
+    'HTTPCONTENT': httpcontent_check,
+    'HTTPPARSE': httpparse_check,
+    'IMAP4': imap4_check,
+    'MONGODB': mongodb_check,
+    'MTR': mtr_check,
+    'MYSQL': mysql_check,
+    'NTP': ntp_check,
+    'PGSQL': postgresql_check,
+    'PING': ping_check,
+    'POP3': pop3_check,
+    'PORT': port_check,
+    'PUSH': push_check,
+    'RBL': rbl_check,
+    'RDP': rdp_check,
+    'REDIS': redis_check,
+    'SIP': sip_check,
+    'SMTP': smtp_check,
+    'SNMP': snmp_check,
+    'SPEC10DNS': spec10dns_check,
+    'SPEC10RDDS': spec10rdds_check,
+    'SSH': ssh_check,
+    'SSL': ssl_check,
+    'WEBSOCKET': websocket_check,
+    'WHOIS': whois_check,
+}
+
+
+def validate_spec(spec):
+    """ Checks a check spec for bulk_create without contacting NodePing
+
+    A spec is a dictionary with the check "type" (PING, HTTP, DNS, etc.)
+    and the arguments for the function that creates that type of check,
+    such as {"type": "PING", "target": "example.com", "label": "ping"}
+
+    :type spec: dict
+    :param spec: The check type and its arguments
+    :return: The function that creates the check and its arguments
+    :rtype: tuple
+    :raises ValueError: If the type is unknown, a required argument is
+    missing, or an argument is not accepted for that type
+    """
+
+    if not isinstance(spec, dict):
+        raise ValueError("Check spec must be a dict, got {0}".format(type(spec).__name__))
+
+    kwargs = dict(spec)
+    check_type = str(kwargs.pop('type', '')).upper()
+
+    try:
+        builder = CHECK_BUILDERS[check_type]
+    except KeyError:
+        raise ValueError("Unknown check type: {0!r}".format(spec.get('type')))
+
+    required, optional = _builder_arguments(builder)
+    optional.append('idempotency_key')
+
+    missing = [arg for arg in required if arg not in kwargs]
+    unknown = [arg for arg in kwargs if arg not in required and arg not in optional]
+
+    if missing:
+        raise ValueError("{0} check missing: {1}".format(check_type, ", ".join(missing)))
+    if unknown:
+        raise ValueError("{0} check does not accept: {1}".format(check_type, ", ".join(sorted(unknown))))
+
+    return builder, kwargs
+
+
+def bulk_create(token, specs, customerid=None, workers=None):
+    """ Creates many checks, yielding each result as it completes
+
+    Each spec is validated with validate_spec before it is sent, and
+    a spec that fails validation is reported without contacting NodePing.
+    Specs are read from the iterable as workers free up, so a generator
+    of specs is never loaded into memory all at once. Closing the
+    generator before the end stops creating checks, once the checks
+    already being created are done.
+
+    :type token: string
+    :param token: NodePing account API token
+    :type specs: iterable
+    :param specs: Dictionaries with the check type and its arguments.
+    A spec may set its own "customerid", and an "idempotency_key" so
+    that it is retried after a transient failure
+    :type customerid: string
+    :param customerid: Optional NodePing subaccount ID
+    :type workers: int
+    :param workers: Number of checks created at once (default one at a time)
+    :return: BatchResult(key, ok, result, error) for each spec as it
+    completes, where key is the position of the spec in specs
+    :rtype: generator
+    """
+
+    def create_one(spec):
+        builder, kwargs = validate_spec(spec)
+        kwargs.setdefault('customerid', customerid)
+
+        return builder(token, **kwargs)
+
+    return _concurrency.iter_completed(create_one, enumerate(specs), workers)
+
+
+def _builder_arguments(builder):
+    """ Required and optional argument names of a check builder, not
+    including the token
+    """
+
+    try:
+        parameters = inspect.signature(builder).parameters.values()
+    except AttributeError:
+        spec = inspect.getargspec(builder)
+        defaults = len(spec.defaults or ())
+        names = spec.args[1:]
+
+        return names[:len(names) - defaults], names[len(names) - defaults:]
+
+    required = []
+    optional = []
+
+    for parameter in parameters:
+        if parameter.name == 'token' or parameter.kind == parameter.VAR_KEYWORD:
+            continue
+        elif parameter.default is parameter.empty:
+            required.append(parameter.name)
+        else:
+            optional.append(parameter.name)
+
+    return required, optional
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" An in-memory index of check events for point and range queries.
+
+Answering "which checks were down at 14:32 on Tuesday" from
+results.get_event means scanning the events of every check. EventIndex
+keeps the events of many checks in one interval tree instead, so the
+events covering a moment or overlapping a range are found by walking a
+few branches of the tree:
+
+    index = event_index.build(token, check_ids, start, end, workers=8)
+
+    index.checks_at(timestamp)
+    index.overlapping(incident_start, incident_end)
+"""
+
+from . import _concurrency, results, uptime
+
+INFINITY = float("inf")
+
+
+class EventIndex(object):
+    def __init__(self):
+        """ An empty index. Fill it with add or use build
+        """
+
+        self.errors = {}
+        self._pending = []
+        self._starts = []
+        self._ends = []
+        self._entries = []
+        self._max_ends = []
+
+    def add(self, check_id, events, kind="down"):
+        """ Adds the events of a check
+
+        :type check_id: string
+        :param check_id: The check the events are for
+        :param events: Output of results.get_event, a list or a dictionary
+        of events
+        :type kind: string
+        :param kind: Type of event to add, "down" or "disabled". None adds
+        every event
+        """
+
+        if isinstance(events, dict):
+            events = events.values()
+
+        for event in events:
+            event_type = event.get("type", event.get("t"))
+
+            if kind and event_type and event_type != kind:
+                continue
+
+            start, end = uptime._event_bounds(event)
+
+            if start is not None:
+                self._pending.append((start, end if end is not None else INFINITY,
+                                      check_id, event))
+
+    def __len__(self):
+        return len(self._entries) + len(self._pending)
+
+    def at(self, timestamp):
+        """ Events going on at a moment
+
+        :type timestamp: int
+        :param timestamp: Time in milliseconds
+        :return: (check_id, event) pairs, ordered by start of the event
+        :rtype: list
+        """
+
+        return self.overlapping(timestamp, timestamp + 1)
+
+    def overlapping(self, start, end):
+        """ Events that overlap a range
+
+        :type start: int
+        :param start: Start of the range in milliseconds
+        :type end: int
+        :param end: End of the range in milliseconds
+        :return: (check_id, event) pairs, ordered by start of the event
+        :rtype: list
+        """
+
+        self._build()
+
+        found = []
+        stack = [(0, len(self._entries))]
+
+        while stack:
+            low, high = stack.pop()
+
+            if low >= high:
+                continue
+
+            middle = (low + high) // 2
+
+            if self._max_ends[middle] <= start:
+                continue
+
+            stack.append((low, middle))
+
+            # Entries right of the middle start no earlier than it, so
+            # none of them overlap if the middle starts after the range
+            if self._starts[middle] < end:
+                if self._ends[middle] > start:
+                    found.append(middle)
+
+                stack.append((middle + 1, high))
+
+        return [self._entries[position] for position in sorted(found)]
+
+    def checks_at(self, timestamp):
+        """ IDs of the checks with an event going on at a moment
+
+        :rtype: set
+        """
+
+        return set(check_id for check_id, _ in self.at(timestamp))
+
+    def checks_overlapping(self, start, end):
+        """ IDs of the checks with an event overlapping a range
+
+        :rtype: set
+        """
+
+        return set(check_id for check_id, _ in self.overlapping(start, end))
+
+    def _build(self):
+        """ Sorts the events added since the last query into the tree
+
+        The tree is implicit: the entries are sorted by start, every
+        range of entries has its middle entry as root, and each root
+        keeps the latest end in its range so branches that end before a
+        query can be skipped.
+        """
+
+        if not self._pending:
+            return
+
+        rows = sorted(list(zip(self._starts, self._ends, self._entries)) +
+                      [(start, end, (check_id, event))
+                       for start, end, check_id, event in self._pending],
+                      key=lambda row: row[0])
+        self._pending = []
+
+        self._starts = [row[0] for row in rows]
+        self._ends = [row[1] for row in rows]
+        self._entries = [row[2] for row in rows]
+        self._max_ends = list(self._ends)
+
+        # Ranges are visited parents first, so walking the list backwards
+        # fills in every child before its parent
+        ranges = [(0, len(rows))]
+        position = 0
+
+        while position < len(ranges):
+            low, high = ranges[position]
+            middle = (low + high) // 2
+
+            for child in ((low, middle), (middle + 1, high)):
+                if child[0] < child[1]:
+                    ranges.append(child)
+
+            position += 1
+
+        for low, high in reversed(ranges):
+            middle = (low + high) // 2
+            latest = self._ends[middle]
+
+            if low < middle:
+                latest = max(latest, self._max_ends[(low + middle) // 2])
+
+            if middle + 1 < high:
+                latest = max(latest, self._max_ends[(middle + 1 + high) // 2])
+
+            self._max_ends[middle] = latest
+
+
+def build(token, check_ids, start=None, end=None, customerid=None,
+          kind="down", limit=None, workers=None):
+    """ Builds an index from the events of many checks
+
+    The events of each check are requested with results.get_event, up to
+    `workers` at a time. Checks NodePing returned an error for are kept
+    in the index's `errors`.
+
+    :param token: NodePing API token
+    :type token: str
+    :param check_ids: IDs of the checks to index
+    :type check_ids: list
+    :param start: Start date to retrieve events from a specific range of time.
+    :type start: str
+    :param end: End date to retrieve events from a specific range of time.
+    :type end: str
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param kind: Type of event to index, "down" or "disabled"
+    :type kind: str
+    :param limit: limit for the number of records to retrieve per check
+    :type limit: int
+    :param workers: Number of checks requested at once
+    :type workers: int
+    :rtype: EventIndex
+    """
+
+    def events_for(check_id):
+        return results.get_event(token, check_id, customerid=customerid,
+                                 start=start, end=end, limit=limit)
+
+    index = EventIndex()
+
+    for outcome in _concurrency.iter_completed(
+            events_for, ((check_id, check_id) for check_id in check_ids), workers):
+        if outcome.ok:
+            index.add(outcome.key, outcome.result, kind)
+        else:
+            index.errors[outcome.key] = outcome.result if outcome.error is None else outcome.error
+
+    return index
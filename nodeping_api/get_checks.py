@@ -7,13 +7,17 @@ Allows you go get all checks, get passing, failing, by its ID,
 disabled checks, and last results for a check.
 """
 
-from . import _query_nodeping_api, _utils, config
+from . import _cache, _query_nodeping_api, _utils, config
 
 API_URL = "{0}checks".format(config.API_URL)
 
+# Values of a check's state for the names CheckQuery.state accepts
+STATES = {"passing": 1, "failing": 0}
+
 
 class GetChecks:
-    def __init__(self, token, checkid=None, customerid=None, current=None, uptime=False):
+    def __init__(self, token, checkid=None, customerid=None, current=None, uptime=False,
+                 cache_ttl=None):
         """
         :type token: string
         :param token: NodePing API token
@@ -21,6 +25,10 @@ class GetChecks:
         :param checkid: ID or list of IDs for check to retrieve data for
         :type customerid: string
         :param customerid: subaccount ID
+        :type cache_ttl: int/float
+        :param cache_ttl: Seconds to reuse a downloaded list of checks.
+        Defaults to config.CHECKS_CACHE_TTL. Checks returned from the
+        cache are shared between calls, so copy one before changing it
         """
 
         self.token = token
@@ -28,6 +36,7 @@ class GetChecks:
         self.customerid = customerid
         self.current = current
         self.uptime = uptime
+        self.cache_ttl = cache_ttl
         self.args = {
             "token": token,
             "id": checkid,
@@ -46,12 +55,7 @@ class GetChecks:
         customerid to output subaccount checks
         """
 
-        url = _utils.create_url(self.token, API_URL, self.customerid)
-
-        if self.uptime:
-            return self._get_check_uptime(url)
-
-        return _query_nodeping_api.get(url)
+        return dict(self._all_checks_dictionary())
 
     def get_many_checks(self):
         """ Get many checks for the account or subaccount
@@ -80,12 +84,7 @@ class GetChecks:
 
         passing_checks = {}
 
-        url = _utils.create_url(self.token, API_URL, self.customerid)
-
-        if self.uptime:
-            url = "{0}&uptime=true".format(url)
-
-        all_checks_dictionary = _query_nodeping_api.get(url)
+        all_checks_dictionary = self._all_checks_dictionary()
 
         for check_id, contents in all_checks_dictionary.items():
             try:
@@ -109,12 +108,7 @@ class GetChecks:
 
         failing_checks = {}
 
-        url = _utils.create_url(self.token, API_URL, self.customerid)
-
-        if self.uptime:
-            url = "{0}&uptime=true".format(url)
-
-        all_checks_dictionary = _query_nodeping_api.get(url)
+        all_checks_dictionary = self._all_checks_dictionary()
 
         for check_id, contents in all_checks_dictionary.items():
             try:
@@ -150,14 +144,12 @@ class GetChecks:
         Queries NodePing for current events for the check.
         """
 
-        url = _utils.create_url(self.token, API_URL, self.customerid)
-
-        if self.uptime:
-            url = "{0}&uptime=true".format(url)
+        events_checks = self._all_checks_dictionary()
 
-        events_checks = _query_nodeping_api.get(url)
+        if "error" in events_checks:
+            return events_checks
 
-        return {k: v for k, v in events_checks.items() if v["enable"] == "inactive"}
+        return {k: v for k, v in events_checks.items() if v.get("enable") == "inactive"}
 
     def last_result(self):
         """ Get the last result for the specified check
@@ -171,6 +163,120 @@ class GetChecks:
 
         return _query_nodeping_api.get(url)
 
+    def stream_checks(self):
+        """ Yields (check_id, check) for every check on the account
+
+        Decodes the list of checks as it is downloaded, so memory use
+        stays flat no matter how many checks the account has. If
+        NodePing returns an error, ("error", message) is yielded.
+
+        :return: Check IDs and the contents of each check
+        :rtype: generator
+        """
+
+        url = _utils.create_url(self.token, API_URL, self.customerid)
+
+        if self.uptime:
+            url = "{0}&uptime=true".format(url)
+
+        stream = _query_nodeping_api.get_stream(url)
+
+        try:
+            for check_id, contents in stream:
+                yield check_id, contents
+        finally:
+            stream.close()
+
+    def partition(self):
+        """ Gets passing, failing, and disabled checks with one request
+
+        Downloads all checks once and sorts them in a single pass. The
+        buckets match passing_checks, failing_checks, and disabled_checks,
+        so a disabled check that is failing is in both "failing" and
+        "disabled". Also counts the checks by their type and by their
+        enable value ("active" or "inactive").
+
+        :return: {"passing": {...}, "failing": {...}, "disabled": {...},
+        "counts": {"type": {"HTTP": 3, ...}, "enable": {"active": 5, ...}}}
+        or the error returned by NodePing
+        :rtype: dict
+        """
+
+        all_checks_dictionary = self._all_checks_dictionary()
+
+        if "error" in all_checks_dictionary:
+            return all_checks_dictionary
+
+        passing_checks = {}
+        failing_checks = {}
+        disabled_checks = {}
+        type_counts = {}
+        enable_counts = {}
+
+        for check_id, contents in all_checks_dictionary.items():
+            state = contents.get("state")
+            enable = contents.get("enable")
+            check_type = contents.get("type")
+
+            if state == 1:
+                passing_checks[check_id] = contents
+            elif state == 0:
+                failing_checks[check_id] = contents
+
+            if enable == "inactive":
+                disabled_checks[check_id] = contents
+
+            type_counts[check_type] = type_counts.get(check_type, 0) + 1
+            enable_counts[enable] = enable_counts.get(enable, 0) + 1
+
+        return {
+            "passing": passing_checks,
+            "failing": failing_checks,
+            "disabled": disabled_checks,
+            "counts": {"type": type_counts, "enable": enable_counts}
+        }
+
+    def query(self):
+        """ Starts a query for the checks that match some filters
+
+        Example:
+            query = GetChecks(token).query()
+            failing_http = query.state("failing").type("HTTP").label("web").all()
+
+        :rtype: CheckQuery
+        """
+
+        return CheckQuery(self)
+
+    def _all_checks_dictionary(self):
+        """ Gets all checks, reusing a cached copy if caching is on
+
+        The list is cached per token, customerid, and uptime flag, and
+        is dropped when a check on that account is created, updated,
+        disabled, or deleted through this package.
+        """
+
+        ttl = config.CHECKS_CACHE_TTL if self.cache_ttl is None else self.cache_ttl
+        query = "uptime" if self.uptime else "checks"
+
+        if ttl:
+            cached = _cache.CHECKS.get(self.token, self.customerid, query)
+
+            if cached is not None:
+                return cached
+
+        url = _utils.create_url(self.token, API_URL, self.customerid)
+
+        if self.uptime:
+            all_checks_dictionary = self._get_check_uptime(url)
+        else:
+            all_checks_dictionary = _query_nodeping_api.get(url)
+
+        if ttl and "error" not in all_checks_dictionary:
+            _cache.CHECKS.set(self.token, self.customerid, query, all_checks_dictionary, ttl)
+
+        return all_checks_dictionary
+
     def _get_check_uptime(self, url):
         """ Get check information along with its uptime
 
@@ -179,3 +285,197 @@ class GetChecks:
         """
 
         return _query_nodeping_api.get("%s&uptime=true" % url)
+
+
+class CheckQuery(object):
+    def __init__(self, checks):
+        """ Filters for a list of checks, built up one call at a time
+
+        Checks are only filtered by ID on the NodePing side, since the
+        list of checks cannot be filtered by anything else. The other
+        filters are compiled into one predicate run on each check as it
+        is downloaded.
+
+        The query sends its requests through the transport in use when
+        it was made, so a query made through a NodePingClient keeps
+        using the client's connections.
+
+        :type checks: GetChecks
+        :param checks: Query the token, customerid, and caching come from
+        """
+
+        self._checks = checks
+        self._transport = _query_nodeping_api.current_transport()
+        self._ids = []
+        self._tests = []
+
+    def ids(self, *checkids):
+        """ Only checks with these IDs. Filtered by NodePing
+        """
+
+        self._ids.extend(checkids)
+
+        return self
+
+    def state(self, *states):
+        """ Only checks in these states: "passing" or "failing"
+        """
+
+        unknown = set(states) - set(STATES)
+
+        if unknown:
+            raise ValueError("Unknown state: {0}".format(", ".join(sorted(unknown))))
+
+        wanted = set(STATES[state] for state in states)
+
+        self._tests.append(lambda check: check.get("state") in wanted)
+
+        return self
+
+    def type(self, *types):
+        """ Only checks of these types, such as "HTTP" or "PING"
+        """
+
+        wanted = set(check_type.upper() for check_type in types)
+
+        self._tests.append(lambda check: (check.get("type") or "").upper() in wanted)
+
+        return self
+
+    def label(self, text):
+        """ Only checks with a label containing text, ignoring case
+        """
+
+        text = text.lower()
+
+        self._tests.append(lambda check: text in (check.get("label") or "").lower())
+
+        return self
+
+    def target(self, text):
+        """ Only checks with a target containing text, ignoring case
+        """
+
+        text = text.lower()
+
+        self._tests.append(lambda check: text in _target_of(check).lower())
+
+        return self
+
+    def enabled(self, enabled=True):
+        """ Only checks that are enabled, or disabled if enabled is False
+        """
+
+        wanted = "active" if enabled else "inactive"
+
+        self._tests.append(lambda check: check.get("enable") == wanted)
+
+        return self
+
+    def tag(self, *tags):
+        """ Only checks that have all of these tags
+        """
+
+        wanted = set(tags)
+
+        self._tests.append(lambda check: wanted.issubset(check.get("tags") or ()))
+
+        return self
+
+    def predicate(self):
+        """ The filters as one function of a check
+
+        The ids filter is matched against the "_id" of the check, so a
+        check without one never matches a query with ids.
+
+        :rtype: function
+        """
+
+        tests = tuple(self._tests)
+
+        if self._ids:
+            wanted_ids = set(self._ids)
+            tests = (lambda check: check.get("_id") in wanted_ids,) + tests
+
+        def matches(check):
+            for test in tests:
+                if not test(check):
+                    return False
+
+            return True
+
+        return matches
+
+    def all(self):
+        """ Gets the matching checks
+
+        :return: Matching checks keyed by check ID, or the error returned
+        by NodePing
+        :rtype: dict
+        """
+
+        with _query_nodeping_api.using(self._transport):
+            if self._ids:
+                checks = self._get_by_ids()
+            else:
+                checks = self._checks._all_checks_dictionary()
+
+        if "error" in checks:
+            return checks
+
+        matches = self.predicate()
+
+        return dict((check_id, check) for check_id, check in checks.items()
+                    if isinstance(check, dict) and matches(check))
+
+    def stream(self):
+        """ Yields (check_id, check) for each matching check
+
+        Checks are filtered as the list is decoded, so only matching
+        checks are kept in memory. If NodePing returns an error,
+        ("error", message) is yielded.
+
+        :rtype: generator
+        """
+
+        if self._ids:
+            for item in self.all().items():
+                yield item
+
+            return
+
+        matches = self.predicate()
+        stream = self._checks.stream_checks()
+
+        while True:
+            with _query_nodeping_api.using(self._transport):
+                try:
+                    check_id, check = next(stream)
+                except StopIteration:
+                    return
+
+            if check_id == "error" or matches(check):
+                yield check_id, check
+
+    def _get_by_ids(self):
+        args = {
+            "token": self._checks.token,
+            "id": ",".join(self._ids),
+            "customerid": self._checks.customerid,
+            "uptime": self._checks.uptime,
+        }
+
+        checks = _query_nodeping_api.get(
+            "{0}{1}".format(API_URL, _utils.generate_querystring(args)))
+
+        # A single ID returns the check itself
+        if "_id" in checks:
+            checks = {checks["_id"]: checks}
+
+        return checks
+
+
+def _target_of(check):
+    parameters = check.get("parameters") or {}
+
+    return parameters.get("target") or check.get("target") or ""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Client-side rate limiting for requests to NodePing.
+
+A RateLimiter is a token bucket that requests wait on before they are
+sent. When NodePing answers with 429 Too Many Requests or 503 Service
+Unavailable, the limiter halves its rate and honors any Retry-After
+header, then creeps back up to the configured rate as requests succeed.
+
+Set config.RATE_LIMIT (and optionally config.RATE_LIMIT_BURST) to
+limit every request in the process with one shared limiter, or give a
+NodePingClient its own limiter:
+
+    limiter = rate_limit.RateLimiter(10, burst=20)
+    client = NodePingClient(token, rate_limiter=limiter)
+"""
+
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+from . import config
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+# Statuses that mean NodePing wants requests to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+class RateLimiter(object):
+    def __init__(self, rate, burst=None, min_rate=None, recovery=0.05):
+        """
+        :type rate: int/float
+        :param rate: Requests per second allowed on average
+        :type burst: int
+        :param burst: Requests that can be sent at once after being idle.
+        Defaults to rate (at least 1)
+        :type min_rate: int/float
+        :param min_rate: Lowest rate the limiter slows down to when
+        throttled. Defaults to a tenth of rate
+        :type recovery: float
+        :param recovery: Fraction of rate added back after each successful
+        request while slowed down
+        """
+
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self.min_rate = float(min_rate or rate / 10.0)
+        self.recovery = recovery
+
+        self._tokens = self.burst
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """ Takes a token and returns how long to wait before sending
+
+        The token is taken right away, so callers that wait the returned
+        number of seconds are spaced out even when they wait at once.
+        While paused by a Retry-After, the waits are spaced out from the
+        end of the pause.
+
+        :return: Seconds to wait before sending the request
+        :rtype: float
+        """
+
+        with self._lock:
+            now = monotonic()
+            self._refill(now)
+            self._tokens -= 1
+
+            return (max(0.0, self._paused_until - now) +
+                    max(0.0, -self._tokens / self.rate))
+
+    def acquire(self):
+        """ Blocks until a request may be sent
+        """
+
+        delay = self.reserve()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_response(self, status, retry_after=None):
+        """ Adjusts the rate after a response was received
+
+        :type status: int
+        :param status: HTTP status of the response
+        :type retry_after: string
+        :param retry_after: The Retry-After header of the response, if any
+        """
+
+        with self._lock:
+            now = monotonic()
+
+            if status in THROTTLE_STATUSES:
+                self._refill(now)
+                self.rate = max(self.min_rate, self.rate / 2.0)
+                self._tokens = min(self._tokens, 0.0)
+
+                pause = parse_retry_after(retry_after)
+
+                if pause:
+                    self._paused_until = max(self._paused_until, now + pause)
+            elif status < 400 and self.rate < self.max_rate:
+                self._refill(now)
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def _refill(self, now):
+        # No tokens come back during a Retry-After pause
+        elapsed = max(0.0, now - max(self._updated, self._paused_until))
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+
+def parse_retry_after(value):
+    """ Seconds to wait from a Retry-After header
+
+    :type value: string
+    :param value: Either a number of seconds or an HTTP date
+    :return: Seconds to wait, or None if the value is missing or invalid
+    :rtype: float
+    """
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parsed = parsedate_tz(value)
+
+    if parsed is None:
+        return None
+
+    return max(0.0, mktime_tz(parsed) - time.time())
+
+
+_configured = {"key": None, "limiter": None}
+_configured_lock = threading.Lock()
+
+
+def configured_limiter():
+    """ The limiter shared by every transport without its own limiter
+
+    Built from config.RATE_LIMIT and config.RATE_LIMIT_BURST, and built
+    again if those values change.
+
+    :return: The shared limiter, or None if config.RATE_LIMIT is not set
+    :rtype: RateLimiter
+    """
+
+    key = (config.RATE_LIMIT, config.RATE_LIMIT_BURST)
+
+    if not config.RATE_LIMIT:
+        return None
+
+    with _configured_lock:
+        if _configured["key"] != key:
+            _configured["limiter"] = RateLimiter(config.RATE_LIMIT, config.RATE_LIMIT_BURST)
+            _configured["key"] = key
+
+        return _configured["limiter"]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Make the checks on an account match a list of check specs.
+
+The desired state is a list of the same specs bulk_create takes, for
+example loaded from a JSON or YAML file:
+
+    [{"type": "PING", "label": "router", "target": "192.0.2.1", "enabled": true},
+     {"type": "HTTP", "label": "website", "target": "https://example.com"}]
+
+Specs are matched with the live checks by label, or by "_id" if a spec
+has one. plan() downloads the checks once and works out what to create,
+which fields to update, and what to delete; apply() carries the plan out
+with up to `workers` requests at a time:
+
+    changes = reconcile.plan(token, reconcile.load("checks.yaml"))
+    print(changes)  # Dry run
+    reconcile.apply(token, changes, workers=16)
+
+Only the fields given in a spec are compared and updated, so fields a
+spec leaves out keep whatever value they have on NodePing. Live checks
+that no spec describes are left alone unless prune=True is given.
+"""
+
+import json
+from collections import namedtuple
+
+from . import (_check_fields, _concurrency, create_check, delete_checks,
+               get_checks, update_checks)
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class Plan(namedtuple("Plan", ["create", "update", "delete"])):
+    """ The changes that make an account match its desired checks
+
+    create holds the specs of the checks to create, update the
+    (check_id, check_type, fields) of the checks to change, and delete
+    the (check_id, label) of the checks to delete. str() of a plan lists
+    the changes one per line, for dry runs.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        lines = []
+
+        for spec in self.create:
+            lines.append("+ create {0} {1}".format(spec.get("type"), spec.get("label", "")))
+
+        for check_id, check_type, fields in self.update:
+            lines.append("~ update {0} {1}: {2}".format(
+                check_id, check_type, ", ".join(sorted(fields))))
+
+        for check_id, label in self.delete:
+            lines.append("- delete {0} {1}".format(check_id, label or ""))
+
+        return "\n".join(lines) or "No changes"
+
+
+def load(path):
+    """ Reads the desired checks from a JSON or YAML file
+
+    YAML files (.yaml or .yml) need PyYAML. The file holds a list of
+    specs, or a mapping with the list under "checks".
+
+    :type path: string
+    :param path: Path of the file
+    :rtype: list
+    :raises ValueError: If the file holds anything else, including
+    nothing at all
+    """
+
+    with open(path) as desired_file:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is required to read {0}".format(path))
+
+            desired = yaml.safe_load(desired_file)
+        else:
+            desired = json.load(desired_file)
+
+    if isinstance(desired, dict) and list(desired) == ["checks"]:
+        desired = desired["checks"]
+
+    if not isinstance(desired, list):
+        raise ValueError(
+            '{0} must hold a list of checks, or a mapping with only the key "checks"'.format(path))
+
+    return desired
+
+
+def plan(token, desired, customerid=None, prune=False, ignore=()):
+    """ Works out the changes that make the account match desired
+
+    :param token: NodePing API token
+    :type token: str
+    :param desired: Check specs, as taken by create_check.bulk_create,
+    optionally with the "_id" of the check they describe
+    :type desired: list
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param prune: Delete live checks that no spec describes. With an
+    empty or mistaken desired list this deletes every check, so it has
+    to be asked for
+    :type prune: bool
+    :param ignore: Fields never compared, such as passwords that
+    NodePing does not return
+    :type ignore: iterable
+    :return: The plan, or the error returned by NodePing
+    :rtype: Plan
+    :raises ValueError: If a spec is invalid, has no label, or has the
+    same label as another spec
+    """
+
+    live = get_checks.GetChecks(token, customerid=customerid).all_checks()
+
+    if "error" in live:
+        return live
+
+    by_label = {}
+
+    for check_id, check in live.items():
+        by_label.setdefault(check.get("label"), []).append(check_id)
+
+    creates = []
+    updates = []
+    deletes = []
+    matched = set()
+    labels = set()
+
+    for spec in desired:
+        spec = dict(spec)
+        check_id = spec.pop("_id", None)
+        create_check.validate_spec(spec)
+
+        label = spec.get("label")
+
+        if not label:
+            raise ValueError("Every spec needs a label: {0!r}".format(spec))
+
+        if check_id is None:
+            if label in labels:
+                raise ValueError("More than one spec has the label {0!r}".format(label))
+
+            labels.add(label)
+            unmatched = [i for i in by_label.get(label, []) if i not in matched]
+            check_id = unmatched[0] if unmatched else None
+
+        current = live.get(check_id)
+
+        if current is None:
+            creates.append(spec)
+            continue
+
+        matched.add(check_id)
+        check_type = spec["type"].upper()
+
+        if (current.get("type") or "").upper() != check_type:
+            # The type of a check cannot be changed, so it is replaced
+            deletes.append((check_id, current.get("label")))
+            creates.append(spec)
+            continue
+
+        fields = _check_fields.changed(spec, current, ignore)
+
+        if fields:
+            updates.append((check_id, check_type, fields))
+
+    if prune:
+        for check_id, check in live.items():
+            if check_id not in matched:
+                deletes.append((check_id, check.get("label")))
+
+    return Plan(creates, updates, deletes)
+
+
+def apply(token, changes, customerid=None, workers=None):
+    """ Carries out a plan
+
+    :param token: NodePing API token
+    :type token: str
+    :param changes: The plan from plan()
+    :type changes: Plan
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param workers: Number of requests sent at once
+    :type workers: int
+    :return: BatchResult for each change, keyed by ("create", label),
+    ("update", check_id), or ("delete", check_id)
+    :rtype: list
+    """
+
+    operations = []
+
+    for check_id, _ in changes.delete:
+        operations.append((("delete", check_id),
+                           _bind(delete_checks.remove, token, check_id, customerid=customerid)))
+
+    for check_id, check_type, fields in changes.update:
+        operations.append((("update", check_id),
+                           _bind(update_checks.update, token, check_id, check_type,
+                                 dict(fields), customerid=customerid)))
+
+    for spec in changes.create:
+        operations.append((("create", spec.get("label")),
+                           _bind(_create, token, spec, customerid)))
+
+    return _concurrency.run_many(lambda operation: operation(), operations, workers)
+
+
+def reconcile(token, desired, customerid=None, workers=None, dry_run=False,
+              prune=False, ignore=()):
+    """ Plans and, unless dry_run is set, applies the changes that make
+    the account match desired
+
+    :return: (plan, results). results is empty for a dry run or when
+    there is nothing to change. If NodePing returned an error while
+    listing the checks, (error, [])
+    :rtype: tuple
+    """
+
+    changes = plan(token, desired, customerid, prune, ignore)
+
+    if not isinstance(changes, Plan) or dry_run:
+        return changes, []
+
+    return changes, apply(token, changes, customerid, workers)
+
+
+def _create(token, spec, customerid):
+    builder, kwargs = create_check.validate_spec(spec)
+    kwargs.setdefault("customerid", customerid)
+
+    return builder(token, **kwargs)
+
+
+def _bind(func, *args, **kwargs):
+    return lambda: func(*args, **kwargs)
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from . import _utils, _query_nodeping_api, config
+from . import _concurrency, _utils, _query_nodeping_api, columnar, config
 
 API_URL = "{0}results".format(config.API_URL)
 
+# Milliseconds of results requested at a time by iter_results
+WINDOW = 4 * 60 * 60 * 1000
+
 
 def get_results(token,
                 check_id,
@@ -71,6 +74,195 @@ def get_results(token,
     return _query_nodeping_api.get(url)
 
 
+def stream_results(token,
+                   check_id,
+                   customerid=None,
+                   span=None,
+                   limit=300,
+                   start=None,
+                   end=None,
+                   clean=True):
+    """ Yields the results for a check one record at a time
+
+    Takes the same arguments as get_results, but decodes the records as
+    they are downloaded instead of holding the whole response in memory.
+    If NodePing returns an error, the error dictionary is yielded.
+
+    :return: Result records in the order NodePing returns them
+    :rtype: generator
+    """
+
+    parameters = locals()
+    url = "{0}/{1}?token={2}".format(API_URL, check_id, token)
+
+    for key, value in parameters.items():
+        if key in ("token", "check_id"):
+            continue
+        elif value:
+            url = "{0}&{1}={2}".format(url, key, value)
+
+    stream = _query_nodeping_api.get_stream(url)
+
+    try:
+        if stream.kind == "array":
+            for record in stream:
+                yield record
+        else:
+            yield dict(stream)
+    finally:
+        stream.close()
+
+
+def get_results_columnar(token,
+                         check_id,
+                         customerid=None,
+                         span=None,
+                         limit=300,
+                         start=None,
+                         end=None):
+    """ Get results for a check as compact columns instead of dictionaries
+
+    Takes the same arguments as get_results. The response is decoded as
+    it is downloaded and each result goes straight into the columns, so
+    the result dictionaries are never all held in memory at once. For
+    long time ranges, pass results.iter_results to
+    columnar.ResultColumns.from_records instead.
+
+    :return: The results, or the error returned by NodePing
+    :rtype: columnar.ResultColumns
+    """
+
+    columns = columnar.ResultColumns()
+
+    for record in stream_results(token, check_id, customerid=customerid, span=span,
+                                 limit=limit, start=start, end=end):
+        if "error" in record:
+            return record
+
+        columns.append(record)
+
+    return columns
+
+
+def iter_results(token,
+                 check_id,
+                 start,
+                 end,
+                 customerid=None,
+                 window=WINDOW,
+                 limit=300,
+                 workers=None):
+    """ Yields every result for a check between start and end, oldest first
+
+    Splits the time range into windows and requests each one with
+    get_results. A window that comes back with `limit` records may have
+    been cut short, so it is split in half and requested again until
+    every part fits. Results that appear in two neighboring windows are
+    only yielded once, based on their _id.
+
+    With workers set, that many windows are requested at once ahead of
+    the window being yielded, so memory use stays at a few windows
+    no matter how long the time range is.
+
+    :param token: NodePing API token
+    :type token: str
+    :param check_id: The ID of the check to get results for
+    :type check_id: str
+    :param start: Start of the range. Timestamp in milliseconds
+    :type start: int
+    :param end: End of the range. Timestamp in milliseconds
+    :type end: int
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param window: Milliseconds of results requested at a time
+    :type window: int
+    :param limit: Most records requested for each window
+    :type limit: int
+    :param workers: Number of windows requested at once
+    :type workers: int
+    :return: Result records in time order. If NodePing returns an
+    error, the error dictionary is yielded and iteration stops
+    :rtype: generator
+    """
+
+    def fetch_window(bounds):
+        return _fetch_window(token, check_id, customerid, bounds[0], bounds[1], limit)
+
+    windows = ((bounds, bounds) for bounds in _windows(start, end, window))
+    previous_ids = set()
+
+    for outcome in _concurrency.iter_ordered(fetch_window, windows, workers):
+        if outcome.error is not None:
+            raise outcome.error
+
+        if isinstance(outcome.result, dict):
+            yield outcome.result
+            return
+
+        window_ids = set()
+
+        for record in outcome.result:
+            record_id = record.get("_id")
+
+            if record_id is not None:
+                if record_id in previous_ids or record_id in window_ids:
+                    continue
+
+                window_ids.add(record_id)
+
+            yield record
+
+        previous_ids = window_ids
+
+
+def _windows(start, end, window):
+    """ Splits the range from start to end into (start, end) windows
+    """
+
+    window_start = start
+
+    while window_start < end:
+        window_end = min(end, window_start + window)
+        yield window_start, window_end
+        window_start = window_end
+
+
+def _fetch_window(token, check_id, customerid, start, end, limit):
+    """ Gets the results in one window sorted by time, splitting the
+    window while it has more results than the limit
+    """
+
+    returned = get_results(token, check_id, customerid=customerid,
+                           limit=limit, start=start, end=end)
+
+    if isinstance(returned, dict):
+        return returned
+
+    if len(returned) >= limit and end - start > 1:
+        middle = start + (end - start) // 2
+        first = _fetch_window(token, check_id, customerid, start, middle, limit)
+
+        if isinstance(first, dict):
+            return first
+
+        second = _fetch_window(token, check_id, customerid, middle, end, limit)
+
+        if isinstance(second, dict):
+            return second
+
+        return first + second
+
+    return sorted(returned, key=_result_time)
+
+
+def _result_time(record):
+    """ The time a result ran, for sorting. `s` is when it ran and `ra`
+    when it was scheduled
+    """
+
+    return int(record.get("s") or record.get("ra") or 0)
+
+
 def get_uptime(token,
                check_id,
                customerid=None,
@@ -110,6 +302,126 @@ def get_uptime(token,
     return _query_nodeping_api.get(url)
 
 
+def get_uptime_many(token,
+                    check_ids,
+                    interval="months",
+                    start=None,
+                    end="now",
+                    customerid=None,
+                    offset=None,
+                    labels=None,
+                    workers=None):
+    """ Retrieves uptime for many checks and combines it into one table
+
+    The uptime of each check is requested with get_uptime, up to
+    `workers` at a time. The uptime of the whole account, and of each
+    label if `labels` is given, is added up from the checks' enabled and
+    down times.
+
+    The returned table has the sorted list of `periods` with "total"
+    last. `checks`, `account`, and each entry of `labels` have a list
+    with the {"enabled", "down", "uptime"} of each period, or None for
+    periods a check has no uptime for. Checks NodePing returned an error
+    for are left out of the table and kept in `errors`.
+
+    :param token: NodePing API token
+    :type token: str
+    :param check_ids: IDs of the checks to get uptime for
+    :type check_ids: list
+    :param interval: "days" or "months" for uptimes result for check
+    :type interval: str
+    :param start: optional start date for the range of days or months
+    :type start: str
+    :param end: optional end date for the range of days or months
+    :type end: str
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param offset: offset to have the system perform uptime calculations for a different time zone from UTC
+    :type offset: int
+    :param labels: Optional check ID to label mapping to add up uptime by
+    :type labels: dict
+    :param workers: Number of checks requested at once
+    :type workers: int
+    :return: {"periods", "checks", "account", "labels", "errors"}
+    :rtype: dict
+    """
+
+    def uptime_for(check_id):
+        return get_uptime(token, check_id, customerid=customerid, offset=offset,
+                          interval=interval, start=start, end=end)
+
+    return _uptime_table(_concurrency.iter_completed(
+        uptime_for, ((check_id, check_id) for check_id in check_ids), workers), labels)
+
+
+def _uptime_table(outcomes, labels):
+    """ Combines the get_uptime outcomes of many checks into the table
+    returned by get_uptime_many
+    """
+
+    uptimes = {}
+    errors = {}
+
+    for outcome in outcomes:
+        if outcome.ok:
+            uptimes[outcome.key] = outcome.result
+        else:
+            errors[outcome.key] = outcome.result if outcome.error is None else outcome.error
+
+    periods = sorted(set(period for uptime in uptimes.values()
+                         for period in uptime if period != "total"))
+    periods.append("total")
+
+    checks = dict((check_id, [uptime.get(period) for period in periods])
+                  for check_id, uptime in uptimes.items())
+
+    by_label = {}
+
+    for check_id, row in checks.items():
+        label = (labels or {}).get(check_id)
+
+        if label is not None:
+            by_label.setdefault(label, []).append(row)
+
+    return {
+        "periods": periods,
+        "checks": checks,
+        "account": _add_uptime(list(checks.values()), len(periods)),
+        "labels": dict((label, _add_uptime(rows, len(periods)))
+                       for label, rows in by_label.items()),
+        "errors": errors,
+    }
+
+
+def _add_uptime(rows, width):
+    """ Adds up the enabled and down times of rows of uptime, period by
+    period, and works out the uptime percentage of each sum
+    """
+
+    totals = []
+
+    for index in range(width):
+        enabled = down = 0
+        found = False
+
+        for row in rows:
+            period = row[index]
+
+            if period:
+                enabled += period.get("enabled", 0)
+                down += period.get("down", 0)
+                found = True
+
+        if not found:
+            totals.append(None)
+            continue
+
+        uptime = round(100 - down * 100.0 / enabled, 3) if enabled else None
+        totals.append({"enabled": enabled, "down": down, "uptime": uptime})
+
+    return totals
+
+
 def get_event(token, check_id, customerid=None, start=None, end=None, limit=None):
     """ Retrieves information about "events" for checks.
 
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Keep check results in a local SQLite database and sync only new ones.
+
+The store remembers how far each check has been synced, so the first
+sync downloads the history and every sync after that only downloads
+results newer than the last one:
+
+    store = results_store.ResultsStore("results.db")
+    store.incremental_sync(token, check_ids, workers=4)
+
+    for result in store.get_results(check_id, start, end):
+        ...
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from . import _concurrency, results
+
+# Milliseconds of history downloaded the first time a check is synced
+INITIAL_SPAN = 30 * 24 * 60 * 60 * 1000
+
+# Milliseconds before the end of a sync that the next sync starts from,
+# so results that are saved by NodePing a little late are not missed
+SYNC_LAG = 5 * 60 * 1000
+
+# Results written to the database at a time
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    check_id TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_check_time ON results (check_id, time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    check_id TEXT PRIMARY KEY,
+    synced_to INTEGER NOT NULL
+);
+"""
+
+
+class ResultsStore(object):
+    def __init__(self, path):
+        """
+        :type path: string
+        :param path: Path of the SQLite database file. Created if it does
+        not exist. ":memory:" keeps the store in memory
+        """
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._db.executescript(SCHEMA)
+
+    def synced_to(self, check_id):
+        """ Timestamp in milliseconds the check has been synced up to
+
+        :return: The timestamp, or None if the check was never synced
+        :rtype: int
+        """
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_to FROM sync_state WHERE check_id = ?", (check_id,)).fetchone()
+
+        return row[0] if row else None
+
+    def incremental_sync(self, token, check_ids, customerid=None, start=None,
+                         window=results.WINDOW, workers=None):
+        """ Downloads the results each check has had since its last sync
+
+        Checks that were never synced start from `start`, or INITIAL_SPAN
+        before now. Results already in the store are skipped.
+
+        :param token: NodePing API token
+        :type token: str
+        :param check_ids: IDs of the checks to sync
+        :type check_ids: list
+        :param customerid: (Optional) subaccount ID
+        :type customerid: str
+        :param start: Timestamp in milliseconds to start checks that were
+        never synced from
+        :type start: int
+        :param window: Milliseconds of results requested at a time
+        :type window: int
+        :param workers: Number of checks synced at once
+        :type workers: int
+        :return: BatchResult for each check, where result is the number
+        of new results stored, or the error returned by NodePing
+        :rtype: list
+        """
+
+        now = int(time.time() * 1000)
+
+        if start is None:
+            start = now - INITIAL_SPAN
+
+        def sync_one(check_id):
+            return self._sync_check(token, check_id, customerid, start, now, window)
+
+        return _concurrency.run_many(
+            sync_one, [(check_id, check_id) for check_id in check_ids], workers)
+
+    def get_results(self, check_id, start=None, end=None):
+        """ Yields the stored results for a check, oldest first
+
+        The results are read BATCH_SIZE at a time, continuing after the
+        last result read, so a long history is never held in memory and
+        the database is free for syncs between batches.
+
+        :param check_id: The ID of the check
+        :type check_id: str
+        :param start: Optional start of the range. Timestamp in milliseconds
+        :type start: int
+        :param end: Optional end of the range. Timestamp in milliseconds
+        :type end: int
+        :rtype: generator
+        """
+
+        query = ("SELECT id, time, record FROM results"
+                 " WHERE check_id = ? AND time <= ? AND (time > ? OR (time = ? AND id > ?))"
+                 " ORDER BY time, id LIMIT ?")
+        end = end if end is not None else 2 ** 63 - 1
+
+        # Every id is greater than "", so the first batch includes start
+        last_time = start if start is not None else -2 ** 63
+        last_id = ""
+
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    query, (check_id, end, last_time, last_time, last_id, BATCH_SIZE)).fetchall()
+
+            for last_id, last_time, record in rows:
+                yield json.loads(record)
+
+            if len(rows) < BATCH_SIZE:
+                return
+
+    def count(self, check_id=None):
+        """ Number of stored results, for one check or all of them
+        """
+
+        with self._lock:
+            if check_id is None:
+                row = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT COUNT(*) FROM results WHERE check_id = ?", (check_id,)).fetchone()
+
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _sync_check(self, token, check_id, customerid, start, now, window):
+        synced_to = self.synced_to(check_id)
+        sync_from = start if synced_to is None else synced_to
+
+        added = 0
+        batch = []
+
+        for record in results.iter_results(token, check_id, sync_from, now,
+                                           customerid=customerid, window=window):
+            if "error" in record:
+                self._store(batch)
+                return record
+
+            record_time = results._result_time(record)
+            batch.append((record.get("_id") or "{0}-{1}".format(check_id, record_time),
+                          check_id, record_time, json.dumps(record)))
+
+            if len(batch) >= BATCH_SIZE:
+                added += self._store(batch)
+                batch = []
+
+        added += self._store(batch)
+
+        new_synced_to = max(sync_from, now - SYNC_LAG)
+
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_state (check_id, synced_to) VALUES (?, ?)",
+                    (check_id, new_synced_to))
+
+        return added
+
+    def _store(self, batch):
+        """ Writes results, skipping ones already stored
+
+        :return: Number of results that were new
+        :rtype: int
+        """
+
+        if not batch:
+            return 0
+
+        with self._lock:
+            with self._db:
+                before = self._db.total_changes
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO results (id, check_id, time, record) VALUES (?, ?, ?, ?)",
+                    batch)
+
+                return self._db.total_changes - before
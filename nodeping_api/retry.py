@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Retries for requests that fail for transient reasons.
+
+Network errors and 429, 502, 503, and 504 responses are retried with
+exponential backoff and full jitter. GET, PUT, and DELETE requests are
+retried because repeating them has the same effect as sending them once.
+POST requests, which create things, are only retried when the caller
+gave an idempotency key, for example:
+
+    create_check.ping_check(token, target, idempotency_key="router-1")
+
+The key is sent in an Idempotency-Key header. NodePing does not document
+ignoring a key it has already seen, so a retried POST can still create a
+duplicate when the first attempt reached NodePing.
+
+A shared RetryBudget stops retries when most requests are failing, so
+an outage does not multiply the number of requests sent to NodePing.
+
+The retries for every request in the process are set with
+config.RETRY_MAX_ATTEMPTS, config.RETRY_BACKOFF, config.RETRY_MAX_BACKOFF,
+and config.RETRY_DEADLINE, or a NodePingClient can be given its own
+RetryPolicy.
+"""
+
+import random
+import threading
+
+from . import config
+from .rate_limit import parse_retry_after
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class RetryBudget(object):
+    def __init__(self, tokens=10, ratio=0.1):
+        """ Limits retries to a fraction of successful requests
+
+        Each retry spends a token and each request that succeeds adds
+        `ratio` of a token, up to `tokens`.
+
+        :type tokens: int
+        :param tokens: Retries allowed in a row before requests succeed
+        :type ratio: float
+        :param ratio: Retries earned for each successful request
+        """
+
+        self.max_tokens = float(tokens)
+        self.ratio = ratio
+        self._tokens = float(tokens)
+        self._lock = threading.Lock()
+
+    def withdraw(self):
+        """ Spends a token for a retry
+
+        :return: False if there are no tokens left for a retry
+        :rtype: bool
+        """
+
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+
+            return True
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+
+class RetryPolicy(object):
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30,
+                 deadline=None, budget=None):
+        """
+        :type max_attempts: int
+        :param max_attempts: Attempts made for a request, including the
+        first. 1 disables retries
+        :type backoff: float
+        :param backoff: Seconds the first retry waits at most. Doubles
+        for each retry after that
+        :type max_backoff: float
+        :param max_backoff: Most seconds to wait before any retry
+        :type deadline: float
+        :param deadline: Seconds after which a request is not retried
+        again, counted from its first attempt. No deadline if None
+        :type budget: RetryBudget
+        :param budget: Budget shared by the requests using this policy.
+        A new budget is made if not given
+        """
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.budget = RetryBudget() if budget is None else budget
+
+    def retry_delay(self, method, headers, attempt, started,
+                    status=None, retry_after=None, error=None):
+        """ Seconds to wait before retrying a request, or None to stop
+
+        :type method: string
+        :param method: HTTP method of the request
+        :type headers: dict
+        :param headers: Headers sent with the request
+        :type attempt: int
+        :param attempt: The attempt that just finished, starting at 1
+        :type started: float
+        :param started: monotonic() time of the first attempt
+        :type status: int
+        :param status: HTTP status of the response, if one was received
+        :type retry_after: string
+        :param retry_after: Retry-After header of the response
+        :param error: Exception raised by the attempt, if any
+        :rtype: float
+        """
+
+        if error is None and status not in RETRY_STATUSES:
+            self.budget.deposit()
+            return None
+
+        if attempt >= self.max_attempts or not self.retryable(method, headers):
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        delay = max(delay, parse_retry_after(retry_after) or 0)
+
+        if self.deadline is not None and monotonic() + delay - started > self.deadline:
+            return None
+
+        if not self.budget.withdraw():
+            return None
+
+        return delay
+
+    @staticmethod
+    def retryable(method, headers):
+        """ Whether a request can be sent again without side effects
+        """
+
+        if method in IDEMPOTENT_METHODS:
+            return True
+
+        return method == "POST" and bool((headers or {}).get(IDEMPOTENCY_HEADER))
+
+
+_configured = {"key": None, "policy": None}
+_configured_lock = threading.Lock()
+
+
+def configured_policy():
+    """ The policy used by every transport without its own policy
+
+    Built from the RETRY_ values in config, and built again if those
+    values change.
+
+    :rtype: RetryPolicy
+    """
+
+    key = (config.RETRY_MAX_ATTEMPTS, config.RETRY_BACKOFF,
+           config.RETRY_MAX_BACKOFF, config.RETRY_DEADLINE)
+
+    with _configured_lock:
+        if _configured["key"] != key:
+            _configured["policy"] = RetryPolicy(*key)
+            _configured["key"] = key
+
+        return _configured["policy"]
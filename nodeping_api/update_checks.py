@@ -5,7 +5,7 @@
 Update one or many checks on a NodePing account or subaccount
 """
 
-from . import _query_nodeping_api, _utils, config
+from . import _check_fields, _concurrency, _query_nodeping_api, _utils, config, get_checks
 
 API_URL = "{0}checks".format(config.API_URL)
 
@@ -39,31 +39,148 @@ def update(token, checkid, checktype, fields, customerid=None):
     return _query_nodeping_api.put(url, fields)
 
 
+def update_if_changed(token, checkid, fields, customerid=None, current=None,
+                      ignore=()):
+    """ Updates only the fields that differ from the check on NodePing
+
+    The fields are compared with the current check, which is downloaded
+    if not given. Nothing is sent if every field already has its value,
+    and otherwise only the fields that differ are sent. The check type
+    is taken from the current check, or from fields if the current check
+    has none.
+
+    :type token: string
+    :param token: Your NodePing API token
+    :type checkid: string
+    :param checkid: CheckID to update
+    :type fields: dict
+    :param fields: Fields the check should have
+    :type customerid: string
+    :param customerid: subaccount ID
+    :type current: dict
+    :param current: The check as last downloaded, for example from
+    GetChecks.all_checks. Downloaded with GetChecks.get_by_id if None
+    :type ignore: iterable
+    :param ignore: Fields never compared, such as passwords that
+    NodePing does not return
+    :rtype: dict
+    :return: Return information from NodePing query, or None if nothing
+    changed
+    :raises ValueError: If the check has to be updated but neither the
+    current check nor fields give its type
+    """
+
+    if current is None:
+        current = get_checks.GetChecks(token, checkid=checkid,
+                                       customerid=customerid).get_by_id()
+
+        if "error" in current:
+            return current
+
+    changed = _check_fields.changed(fields, current, ignore)
+
+    if not changed:
+        return None
+
+    checktype = current.get("type") or fields.get("type")
+
+    if not checktype:
+        raise ValueError("No type for check {0}: pass it in fields".format(checkid))
+
+    return update(token, checkid, checktype, changed, customerid)
+
+
 def mute_check(token, checkid, checktype, duration, customerid=None):
+    """ Mutes a check for a number of seconds, or until it is unmuted
+
+    :type token: string
+    :param token: Your NodePing API token
+    :type checkid: string
+    :param checkid: CheckID to mute
+    :type checktype: string
+    :param checktype: The type of the check
+    :type duration: int/bool
+    :param duration: Seconds to mute the check for, True to mute it
+    until it is unmuted, or False to unmute it
+    :type customerid: string
+    :param customerid: subaccount ID
+    :return: Return information from NodePing query
+    :rtype: dict
     """
 
+    return _set_mute(token, checkid, checktype, _utils.mute_value(duration), customerid)
+
+
+def mute_matching(token, predicate, duration, customerid=None, workers=None,
+                  checks=None):
+    """ Mutes every check that matches a predicate
+
+    The check types are taken from one download of all checks, and the
+    checks are muted up to `workers` at a time. A duration in seconds
+    mutes every check until the same moment, after which NodePing unmutes
+    them on its own.
+
+    Example:
+        # Silence every check in Europe for an hour
+        update_checks.mute_matching(
+            token, lambda check: check.get("homeloc") == "eur", 3600,
+            workers=16)
+
+    :type token: string
+    :param token: Your NodePing API token
+    :param predicate: Function taking a check and returning True for the
+    checks to mute, or a GetChecks.query()
+    :type duration: int/bool
+    :param duration: Seconds to mute the checks for, or True to mute them
+    until they are unmuted
+    :type customerid: string
+    :param customerid: subaccount ID
+    :type workers: int
+    :param workers: Number of checks muted at once (default one at a time)
+    :type checks: dict
+    :param checks: All checks as last downloaded, from
+    GetChecks.all_checks. Downloaded once if None
+    :rtype: list
+    :return: BatchResult for each muted check, or the error returned by
+    NodePing when listing the checks
     """
 
-    if isinstance(duration, int):
-        submit_duration = _utils.create_timestamp(duration)
-    else:
-        submit_duration = duration
+    return _mute_all(token, predicate, _utils.mute_value(duration), customerid, workers, checks)
 
-    url = "{0}/{1}".format(API_URL, checkid)
-    url = _utils.create_url(token, url, customerid)
 
-    fields = {"mute": submit_duration, "type": checktype.upper()}
+def unmute_matching(token, predicate=None, customerid=None, workers=None,
+                    checks=None):
+    """ Unmutes the muted checks that match a predicate
 
-    return _query_nodeping_api.put(url, fields)
+    :type token: string
+    :param token: Your NodePing API token
+    :param predicate: Function taking a check and returning True for the
+    checks to unmute, or a GetChecks.query(). Every muted check if None
+    :type customerid: string
+    :param customerid: subaccount ID
+    :type workers: int
+    :param workers: Number of checks unmuted at once (default one at a time)
+    :type checks: dict
+    :param checks: All checks as last downloaded. Downloaded once if None
+    :rtype: list
+    :return: BatchResult for each unmuted check, or the error returned by
+    NodePing when listing the checks
+    """
+
+    return _mute_all(token, _muted_matching(predicate), False, customerid, workers, checks)
 
 
-def update_many(token, checkids, fields, customerid=None):
+def update_many(token, checkids, fields, customerid=None, workers=None,
+                detailed=False):
     """ Updates a field(s) in multiple existing NodePing checks
 
     Accepts a token, a list of checkids, and fields to be updated in a
     NodePing check. Updates the specified fields for the one check.
     To update many checks with the same value, use update_many
 
+    Set workers to send that many updates at once. The returned list is
+    in the same order as checkids either way.
+
     :type token: string
     :param token: Your NodePing API token
     :type checkids: dict
@@ -72,19 +189,141 @@ def update_many(token, checkids, fields, customerid=None):
     :param fields: Fields in check that will be updated
     :type customerid: string
     :param customerid: subaccount ID
-    :rtype: dict
-    :return: Return information from NodePing query
+    :type workers: int
+    :param workers: Number of checks updated at once (default one at a time)
+    :type detailed: bool
+    :param detailed: Return a BatchResult(key, ok, result, error) for each
+    check instead of the response, and keep exceptions in `error` instead
+    of raising them
+    :rtype: list
+    :return: Return information from NodePing query for each check
     """
 
-    updated_checks = []
+    def update_one(item):
+        checkid, checktype = item
 
-    for checkid, checktype in checkids.items():
         url = "{0}/{1}".format(API_URL, checkid)
         url = _utils.create_url(token, url, customerid)
 
         send_fields = fields.copy()
         send_fields.update({"type": checktype.upper()})
 
-        updated_checks.append(_query_nodeping_api.put(url, send_fields))
+        return _query_nodeping_api.put(url, send_fields)
+
+    items = [(checkid, (checkid, checktype))
+             for checkid, checktype in checkids.items()]
+    outcomes = _concurrency.run_many(update_one, items, workers)
+
+    if detailed:
+        return outcomes
+
+    _concurrency.raise_first_error(outcomes)
+
+    return [outcome.result for outcome in outcomes]
+
+
+def update_many_if_changed(token, changes, customerid=None, workers=None,
+                           current=None, ignore=()):
+    """ Updates many checks, sending only the fields that differ
+
+    The checks are compared with one download of all checks, or with
+    `current` if given, and only the checks with differing fields are
+    updated, up to `workers` at a time.
+
+    :type token: string
+    :param token: Your NodePing API token
+    :type changes: dict
+    :param changes: CheckIDs with the fields each check should have
+    :type customerid: string
+    :param customerid: subaccount ID
+    :type workers: int
+    :param workers: Number of checks updated at once (default one at a time)
+    :type current: dict
+    :param current: All checks as last downloaded, from
+    GetChecks.all_checks. Downloaded once if None
+    :type ignore: iterable
+    :param ignore: Fields never compared
+    :rtype: list
+    :return: BatchResult for each check in the order of changes. The
+    result is None for checks that were already up to date
+    """
+
+    if current is None:
+        current = get_checks.GetChecks(token, customerid=customerid).all_checks()
+
+        if "error" in current:
+            return [_concurrency.outcome_of(checkid, current) for checkid in changes]
+
+    def update_one(item):
+        checkid, fields = item
+        check = current.get(checkid)
+
+        if check is None:
+            return _not_found(checkid)
+
+        return update_if_changed(token, checkid, fields, customerid, check, ignore)
+
+    return _concurrency.run_many(
+        update_one, [(checkid, (checkid, fields)) for checkid, fields in changes.items()],
+        workers)
+
+
+def _mute_all(token, predicate, mute, customerid, workers, checks):
+    """ Sets the mute value of every matching check
+    """
+
+    if checks is None:
+        checks = get_checks.GetChecks(token, customerid=customerid).all_checks()
+
+        if "error" in checks:
+            return checks
+
+    def mute_one(item):
+        checkid, checktype = item
+
+        return _set_mute(token, checkid, checktype, mute, customerid)
+
+    return _concurrency.run_many(mute_one, _mute_targets(checks, predicate), workers)
+
+
+def _mute_targets(checks, predicate):
+    """ (checkid, (checkid, checktype)) for each check matching predicate
+    """
+
+    matches = _as_predicate(predicate)
+
+    return [(checkid, (checkid, check.get("type", "")))
+            for checkid, check in checks.items()
+            if isinstance(check, dict) and matches(check)]
+
+
+def _muted_matching(predicate):
+    """ Matches the muted checks that also match predicate, if any
+    """
+
+    matches = _as_predicate(predicate) if predicate is not None else None
+
+    def muted(check):
+        return bool(check.get("mute")) and (matches is None or matches(check))
+
+    return muted
+
+
+def _not_found(checkid):
+    return {"error": "Check not found: {0}".format(checkid)}
+
+
+def _set_mute(token, checkid, checktype, mute, customerid):
+    url = "{0}/{1}".format(API_URL, checkid)
+    url = _utils.create_url(token, url, customerid)
+
+    fields = {"mute": mute, "type": checktype.upper()}
+
+    return _query_nodeping_api.put(url, fields)
+
+
+def _as_predicate(predicate):
+    """ Accepts a GetChecks.query() wherever a predicate is taken
+    """
 
-    return updated_checks
+    return predicate.predicate() if hasattr(predicate, "predicate") else predicate
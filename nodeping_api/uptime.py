@@ -0,0 +1,494 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Uptime calculated locally from down events or results.
+
+results.get_uptime counts every minute of every day. The functions here
+work on lists of (start, end) intervals in milliseconds instead, so the
+time that counts can be limited to a calendar, such as business hours,
+and windows such as scheduled maintenance can be left out:
+
+    hours = uptime.business_hours(start, end, hours=(9, 17), offset=-5)
+    windows = uptime.maintenance_windows(
+        maintenance.get_maintenance(token), check_id, start, end)
+
+    uptime.get_uptime(token, check_id, start, end, interval="months",
+                      calendar=hours, exclude=windows)
+
+Intervals are merged, intersected, and subtracted in a single pass over
+sorted lists, and uptime per period is looked up from running totals,
+so years of events for a check are handled quickly.
+"""
+
+import bisect
+import time
+from calendar import timegm
+from datetime import datetime, timedelta
+
+from . import results
+
+HOUR = 60 * 60 * 1000
+DAY = 24 * HOUR
+EPOCH = datetime(1970, 1, 1)
+
+
+def merge(intervals):
+    """ Sorts intervals and joins the ones that overlap or touch
+
+    :type intervals: iterable
+    :param intervals: (start, end) pairs. Empty intervals are dropped
+    :rtype: list
+    """
+
+    merged = []
+
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def intersect(first, second):
+    """ Time covered by both lists of merged intervals
+    """
+
+    intersection = []
+    i = j = 0
+
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+
+        if start < end:
+            intersection.append((start, end))
+
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+
+    return intersection
+
+
+def subtract(first, second):
+    """ Time covered by the first list of merged intervals but not the
+    second
+    """
+
+    difference = []
+    j = 0
+
+    for start, end in first:
+        while j < len(second) and second[j][1] <= start:
+            j += 1
+
+        position = start
+        k = j
+
+        while k < len(second) and second[k][0] < end:
+            if second[k][0] > position:
+                difference.append((position, second[k][0]))
+
+            position = max(position, second[k][1])
+            k += 1
+
+        if position < end:
+            difference.append((position, end))
+
+    return difference
+
+
+def total(intervals):
+    """ Milliseconds covered by a list of merged intervals
+    """
+
+    return sum(end - start for start, end in intervals)
+
+
+def down_intervals(records, end=None):
+    """ Down time worked out from check results
+
+    A check is counted as down from a failed result until the next
+    result that passed. This is close to, but not the same as, the down
+    events NodePing records, which wait for failures to be confirmed.
+
+    :type records: iterable
+    :param records: Results from results.get_results or iter_results
+    :type end: int
+    :param end: Time a check that is still down is counted down until.
+    Defaults to the last result
+    :rtype: list
+    """
+
+    intervals = []
+    down_since = None
+    last = None
+
+    for record in sorted(records, key=results._result_time):
+        last = results._result_time(record)
+
+        if not record.get("su"):
+            if down_since is None:
+                down_since = last
+        elif down_since is not None:
+            intervals.append((down_since, last))
+            down_since = None
+
+    if down_since is not None:
+        intervals.append((down_since, end if end is not None else last))
+
+    return merge(intervals)
+
+
+def event_intervals(events, kind="down", now=None):
+    """ Intervals covered by events from results.get_event
+
+    :param events: The events, as a list or a dictionary of events
+    :type kind: string
+    :param kind: Type of event to use, "down" or "disabled". Events
+    without a type are always used
+    :type now: int
+    :param now: End of events that have not ended. Defaults to now
+    :rtype: list
+    """
+
+    if isinstance(events, dict):
+        events = events.values()
+
+    if now is None:
+        now = int(time.time() * 1000)
+
+    intervals = []
+
+    for event in events:
+        event_type = event.get("type", event.get("t"))
+
+        if kind and event_type and event_type != kind:
+            continue
+
+        start, end = _event_bounds(event)
+
+        if start is not None:
+            intervals.append((start, end if end is not None else now))
+
+    return merge(intervals)
+
+
+def business_hours(start, end, days=(0, 1, 2, 3, 4), hours=(9, 17), offset=0):
+    """ A calendar of the same hours on certain days of the week
+
+    :type days: tuple
+    :param days: Days of the week, Monday is 0. Monday to Friday by default
+    :type hours: tuple
+    :param hours: (first hour, hour it ends) of each day. 9 to 5 by default
+    :type offset: int/float
+    :param offset: Hours the time zone is ahead of UTC
+    :rtype: list
+    """
+
+    first, last = hours
+    intervals = []
+
+    for day_start, weekday in _local_days(start, end, offset):
+        if weekday in days:
+            intervals.append((day_start + int(first * HOUR), day_start + int(last * HOUR)))
+
+    return intersect(merge(intervals), [(start, end)])
+
+
+def cron_windows(cron, duration, start, end, offset=0):
+    """ Windows when a cron schedule is running
+
+    :type cron: string
+    :param cron: Five field cron schedule, such as "1 12 * * *"
+    :type duration: int
+    :param duration: Minutes each window lasts
+    :type offset: int/float
+    :param offset: Hours the time zone of the schedule is ahead of UTC
+    :rtype: list
+    """
+
+    fields = cron.split()
+
+    if len(fields) != 5:
+        raise ValueError("cron must have 5 fields: {0}".format(cron))
+
+    minutes = sorted(_cron_field(fields[0], 0, 59))
+    hours = sorted(_cron_field(fields[1], 0, 23))
+    month_days = _cron_field(fields[2], 1, 31)
+    months = _cron_field(fields[3], 1, 12)
+    week_days = set(day % 7 for day in _cron_field(fields[4], 0, 7))
+    any_month_day = fields[2].startswith("*")
+    any_week_day = fields[4].startswith("*")
+
+    length = int(duration) * 60 * 1000
+    windows = []
+
+    for day_start, weekday in _local_days(start - length, end, offset):
+        day = _datetime(day_start + int(offset * HOUR))
+
+        if day.month not in months:
+            continue
+
+        month_day_matches = day.day in month_days
+        week_day_matches = (weekday + 1) % 7 in week_days
+
+        if any_month_day or any_week_day:
+            matches = month_day_matches and week_day_matches
+        else:
+            matches = month_day_matches or week_day_matches
+
+        if not matches:
+            continue
+
+        for hour in hours:
+            for minute in minutes:
+                window_start = day_start + hour * HOUR + minute * 60 * 1000
+                windows.append((window_start, window_start + length))
+
+    return intersect(merge(windows), [(start, end)])
+
+
+def maintenance_windows(schedules, check_id, start, end, offset=0):
+    """ Windows when scheduled maintenance covers a check
+
+    Ad-hoc maintenance disables checks and shows up as "disabled"
+    events, so only enabled schedules with a cron are used.
+
+    :param schedules: Output of maintenance.get_maintenance
+    :type check_id: string
+    :param check_id: The check to find maintenance for
+    :type offset: int/float
+    :param offset: Hours the time zone of the schedules is ahead of UTC
+    :rtype: list
+    """
+
+    if "_id" in schedules:
+        schedules = {schedules["_id"]: schedules}
+
+    windows = []
+
+    for schedule in schedules.values():
+        if not isinstance(schedule, dict) or not schedule.get("cron"):
+            continue
+
+        if not schedule.get("enabled", True) or check_id not in schedule.get("checklist", []):
+            continue
+
+        windows.extend(cron_windows(schedule["cron"], schedule.get("duration", 0),
+                                    start, end, offset))
+
+    return merge(windows)
+
+
+def compute_uptime(down, start, end, interval=None, offset=0,
+                   calendar=None, exclude=None, disabled=None):
+    """ Uptime over a time range, optionally split by days or months
+
+    :type down: list
+    :param down: Intervals the check was down
+    :type interval: string
+    :param interval: "days" or "months" to include each period as well as
+    the total
+    :type offset: int/float
+    :param offset: Hours the time zone of the periods is ahead of UTC
+    :type calendar: list
+    :param calendar: Intervals that count. All of the range if None
+    :type exclude: list
+    :param exclude: Intervals that do not count, such as maintenance
+    :type disabled: list
+    :param disabled: Intervals the check was disabled, which do not count
+    :return: {"enabled", "down", "uptime"} of each period and "total", in
+    the same form as results.get_uptime
+    :rtype: dict
+    """
+
+    counted = [(start, end)]
+
+    if calendar is not None:
+        counted = intersect(counted, merge(calendar))
+
+    for intervals in (exclude, disabled):
+        if intervals:
+            counted = subtract(counted, merge(intervals))
+
+    enabled = _Timeline(counted)
+    down = _Timeline(intersect(merge(down), counted))
+
+    uptimes = {}
+
+    if interval:
+        for label, period_start, period_end in periods(start, end, interval, offset):
+            uptimes[label] = _uptime(enabled.total(period_start, period_end),
+                                     down.total(period_start, period_end))
+
+    uptimes["total"] = _uptime(enabled.total(start, end), down.total(start, end))
+
+    return uptimes
+
+
+def get_uptime(token, check_id, start, end, customerid=None, interval=None,
+               offset=0, calendar=None, exclude=None):
+    """ Uptime of a check calculated from its events
+
+    :param token: NodePing API token
+    :type token: str
+    :param check_id: The ID of the check
+    :type check_id: str
+    :param start: Start of the range. Timestamp in milliseconds
+    :type start: int
+    :param end: End of the range. Timestamp in milliseconds
+    :type end: int
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :return: The uptime from compute_uptime, or the error from NodePing
+    :rtype: dict
+    """
+
+    events = results.get_event(token, check_id, customerid=customerid,
+                               start=start, end=end)
+
+    if isinstance(events, dict) and "error" in events:
+        return events
+
+    return compute_uptime(event_intervals(events, "down", now=end), start, end,
+                          interval=interval, offset=offset, calendar=calendar,
+                          exclude=exclude,
+                          disabled=event_intervals(events, "disabled", now=end))
+
+
+def periods(start, end, interval="months", offset=0):
+    """ Splits a range into calendar days or months
+
+    :return: (label, start, end) of each period, labelled like the
+    periods of results.get_uptime
+    :rtype: list
+    """
+
+    if interval not in ("days", "months"):
+        raise ValueError("interval must be days or months")
+
+    shift = int(offset * HOUR)
+    local = _datetime(start + shift)
+
+    if interval == "days":
+        boundary = datetime(local.year, local.month, local.day)
+    else:
+        boundary = datetime(local.year, local.month, 1)
+
+    split = []
+
+    while _milliseconds(boundary) - shift < end:
+        if interval == "days":
+            label = boundary.strftime("%Y-%m-%d")
+            following = boundary + timedelta(days=1)
+        else:
+            label = boundary.strftime("%Y-%m")
+            following = (boundary + timedelta(days=32)).replace(day=1)
+
+        split.append((label, max(start, _milliseconds(boundary) - shift),
+                      min(end, _milliseconds(following) - shift)))
+        boundary = following
+
+    return split
+
+
+class _Timeline(object):
+    def __init__(self, intervals):
+        """ Merged intervals with running totals, to measure the time
+        they cover in any range with two binary searches
+        """
+
+        self._starts = [start for start, _ in intervals]
+        self._ends = [end for _, end in intervals]
+        self._covered = [0]
+
+        for start, end in intervals:
+            self._covered.append(self._covered[-1] + end - start)
+
+    def total(self, start, end):
+        first = bisect.bisect_right(self._ends, start)
+        last = bisect.bisect_left(self._starts, end)
+
+        if first >= last:
+            return 0
+
+        covered = self._covered[last] - self._covered[first]
+        covered -= max(0, start - self._starts[first])
+        covered -= max(0, self._ends[last - 1] - end)
+
+        return covered
+
+
+def _uptime(enabled, down):
+    uptime = round(100 - down * 100.0 / enabled, 3) if enabled else None
+
+    return {"enabled": enabled, "down": down, "uptime": uptime}
+
+
+def _event_bounds(event):
+    """ Start and end of an event in milliseconds. End is None for an
+    event that has not ended
+    """
+
+    start = event.get("start", event.get("s"))
+    end = event.get("end", event.get("e"))
+
+    return (int(start) if start is not None else None,
+            int(end) if end else None)
+
+
+def _local_days(start, end, offset):
+    """ Yields the UTC start and weekday of each local day from the day
+    containing start until end
+    """
+
+    shift = int(offset * HOUR)
+    day = (start + shift) // DAY * DAY
+
+    while day - shift < end:
+        yield day - shift, _datetime(day).weekday()
+        day += DAY
+
+
+def _cron_field(field, low, high):
+    """ The values a cron field matches
+    """
+
+    values = set()
+
+    for part in field.split(","):
+        step = 1
+
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+
+        if part == "*":
+            first, last = low, high
+        elif "-" in part:
+            first, last = (int(value) for value in part.split("-"))
+        else:
+            first = last = int(part)
+
+            if step != 1:
+                last = high
+
+        values.update(range(first, last + 1, step))
+
+    return values
+
+
+def _datetime(milliseconds):
+    return EPOCH + timedelta(milliseconds=milliseconds)
+
+
+def _milliseconds(moment):
+    return timegm(moment.timetuple()) * 1000
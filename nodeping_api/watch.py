@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Poll NodePing and yield only what changed between polls.
+
+Each poll is reduced to a hash per check and compared with the hashes of
+the previous poll, so consumers get events for the checks that went
+down, recovered, were modified, added, or deleted instead of the whole
+list every time:
+
+    for event in watch.watch(token, interval=30):
+        if event.kind == "down":
+            page_someone(event.check_id, event.new)
+
+When the server returns an ETag, later polls send it back with
+If-None-Match and an unchanged list is not downloaded again.
+"""
+
+import hashlib
+import json
+import time
+from collections import namedtuple
+
+from . import _query_nodeping_api, _utils, get_checks, results
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+SOURCES = ("checks", "current")
+
+# Keys of a check that change with its state, so they are left out of
+# the hash used to notice other modifications
+STATE_KEYS = ("state", "firstdown")
+
+# `kind` is "added", "deleted", "down", "recovered", "modified", or
+# "error". `old` and `new` are the check (or, for results.get_current,
+# its list of current events) before and after the change. An "error"
+# event has the error returned by NodePing in `new`.
+ChangeEvent = namedtuple("ChangeEvent", ["kind", "check_id", "old", "new"])
+
+
+def watch(token, customerid=None, interval=60, source="checks",
+          conditional=True, initial=False, polls=None):
+    """ Polls NodePing and yields a ChangeEvent for each change
+
+    :param token: NodePing API token
+    :type token: str
+    :param customerid: (Optional) subaccount ID
+    :type customerid: str
+    :param interval: Seconds from the start of one poll to the next
+    :type interval: int/float
+    :param source: "checks" to watch the list of checks from
+    GetChecks.all_checks, or "current" to watch the current events from
+    results.get_current
+    :type source: str
+    :param conditional: Send the ETag of the last response so the server
+    can skip sending an unchanged list
+    :type conditional: bool
+    :param initial: Yield an event for every check found by the first
+    poll. Otherwise the first poll is only compared against later
+    :type initial: bool
+    :param polls: Number of polls to make. Polls forever if None
+    :type polls: int
+    :rtype: generator
+    """
+
+    if source not in SOURCES:
+        raise ValueError("source must be one of {0}".format(", ".join(SOURCES)))
+
+    url = _source_url(token, customerid, source)
+    etag = None
+    previous = None if not initial else {}
+    count = 0
+
+    while polls is None or count < polls:
+        started = monotonic()
+
+        if conditional:
+            data, etag = _query_nodeping_api.get_conditional(url, etag)
+        else:
+            data = _query_nodeping_api.get(url)
+
+        count += 1
+
+        if isinstance(data, dict) and "error" in data:
+            yield ChangeEvent("error", None, None, data)
+        elif data is not None:
+            current = snapshot(data, source)
+
+            if previous is not None:
+                for event in changes(previous, current, source):
+                    yield event
+
+            previous = current
+
+        if polls is not None and count >= polls:
+            return
+
+        time.sleep(max(0, interval - (monotonic() - started)))
+
+
+def snapshot(data, source="checks"):
+    """ Reduces a response to the hashes compared between polls
+
+    :param data: Output of GetChecks.all_checks or results.get_current
+    :param source: "checks" or "current"
+    :return: check ID mapped to (hash, state, check or events)
+    :rtype: dict
+    """
+
+    reduced = {}
+
+    if source == "checks":
+        for check_id, check in data.items():
+            if not isinstance(check, dict):
+                continue
+
+            rest = dict((key, value) for key, value in check.items() if key not in STATE_KEYS)
+            reduced[check_id] = (_digest(rest), check.get("state"), check)
+
+        return reduced
+
+    events = data.values() if isinstance(data, dict) else data
+    by_check = {}
+
+    for event in events:
+        if isinstance(event, dict):
+            by_check.setdefault(event.get("check", event.get("_id")), []).append(event)
+
+    for check_id, check_events in by_check.items():
+        reduced[check_id] = (_digest(check_events), 0, check_events)
+
+    return reduced
+
+
+def changes(old, new, source="checks"):
+    """ Compares two snapshots
+
+    For results.get_current, a check that gains current events went down
+    and a check that loses them recovered.
+
+    :rtype: generator
+    """
+
+    appeared, vanished = ("down", "recovered") if source == "current" else ("added", "deleted")
+
+    for check_id, (digest, state, item) in new.items():
+        if check_id not in old:
+            yield ChangeEvent(appeared, check_id, None, item)
+            continue
+
+        old_digest, old_state, old_item = old[check_id]
+
+        if old_state == 1 and state == 0:
+            yield ChangeEvent("down", check_id, old_item, item)
+        elif old_state == 0 and state == 1:
+            yield ChangeEvent("recovered", check_id, old_item, item)
+
+        if digest != old_digest:
+            yield ChangeEvent("modified", check_id, old_item, item)
+
+    for check_id, (_, _, old_item) in old.items():
+        if check_id not in new:
+            yield ChangeEvent(vanished, check_id, old_item, None)
+
+
+def _source_url(token, customerid, source):
+    if source == "checks":
+        url = get_checks.API_URL
+    else:
+        url = "{0}/current".format(results.API_URL)
+
+    return _utils.create_url(token, url, customerid)
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+    return hashlib.sha1(encoded).hexdigest()
@@ -6,12 +6,13 @@
 """
 
 import pytest
-from nodeping_api import get_checks
+from nodeping_api import _query_nodeping_api, get_checks, update_checks
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 CUSTOMERID = parameters.CUSTOMERID
@@ -64,6 +65,36 @@ def test_get_by_id():
     assert result['_id'] == single
 
 
+def test_stream_checks():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    streamed = dict(query.stream_checks())
+
+    assert "error" not in streamed
+    assert sorted(streamed) == sorted(query.all_checks())
+
+
+def test_partition_checks():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    result = query.partition()
+
+    for i in result['passing']:
+        assert result['passing'][i]['state'] == 1
+
+    for i in result['failing']:
+        assert result['failing'][i]['state'] == 0
+
+    for i in result['disabled']:
+        assert result['disabled'][i]['enable'] == 'inactive'
+
+    assert sum(result['counts']['type'].values()) == sum(result['counts']['enable'].values())
+
+
 def test_get_disabled_checks():
     """
     """
@@ -73,3 +104,73 @@ def test_get_disabled_checks():
 
     for i in result:
         assert result[i]['type'] == 'disabled'
+
+
+def test_cached_views_share_one_download():
+    """
+    """
+
+    transport = fakes.RecordingTransport({"PASSING": {"state": 1, "enable": "active"},
+                                          "FAILING": {"state": 0, "enable": "inactive"}})
+
+    with _query_nodeping_api.using(transport):
+        query = get_checks.GetChecks("CACHE_TOKEN", cache_ttl=60)
+
+        assert list(query.passing_checks()) == ["PASSING"]
+        assert list(query.failing_checks()) == ["FAILING"]
+        assert list(query.disabled_checks()) == ["FAILING"]
+        assert len(query.all_checks()) == 2
+        assert transport.gets == 1
+
+        # Updating a check on the account drops the cached list
+        update_checks.update("CACHE_TOKEN", "PASSING", "PING", {})
+        query.all_checks()
+
+        assert transport.gets == 2
+
+
+def test_cached_checks_are_copies():
+    """ The downloaded checks and the dictionaries returned by cache hits
+    can be changed without changing later hits
+    """
+
+    transport = fakes.RecordingTransport({"PASSING": {"state": 1, "enable": "active",
+                                                      "parameters": {"target": "a"}}})
+
+    with _query_nodeping_api.using(transport):
+        query = get_checks.GetChecks("COPY_TOKEN", cache_ttl=60)
+
+        downloaded = query.all_checks()
+        downloaded["PASSING"]["parameters"]["target"] = "changed"
+        downloaded["ADDED"] = {}
+        del query.all_checks()["PASSING"]
+
+        first, second = query.all_checks(), query.all_checks()
+
+        assert first == {"PASSING": {"state": 1, "enable": "active",
+                                     "parameters": {"target": "a"}}}
+        assert first is not second and first["PASSING"] is second["PASSING"]
+        assert list(query.passing_checks()) == ["PASSING"]
+        assert transport.gets == 1
+
+
+def test_query_checks():
+    """
+    """
+
+    checks = {
+        "WEB": {"type": "HTTP", "label": "Web front", "state": 0, "enable": "active",
+                "parameters": {"target": "https://example.com"}},
+        "DNS": {"type": "DNS", "label": "Resolver", "state": 1, "enable": "active",
+                "parameters": {"target": "192.0.2.53"}},
+        "OLD": {"type": "HTTP", "label": "Old web", "state": 0},
+    }
+
+    with _query_nodeping_api.using(fakes.RecordingTransport(checks)):
+        query = get_checks.GetChecks("QUERY_TOKEN")
+
+        assert list(query.disabled_checks()) == []
+        assert set(query.query().type("http").label("WEB").all()) == set(["WEB", "OLD"])
+        assert list(query.query().state("failing").enabled().all()) == ["WEB"]
+        assert list(query.query().target("example.com").all()) == ["WEB"]
+        assert query.query().tag("prod").all() == {}
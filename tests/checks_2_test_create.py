@@ -6,12 +6,13 @@ Tests for the create_checks.py file
 """
 
 import pytest
-from nodeping_api import create_check
+from nodeping_api import _query_nodeping_api, create_check
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 CUSTOMERID = parameters.CUSTOMERID
@@ -104,3 +105,49 @@ def test_create_push_check():
         TOKEN, label=label, fields=parameters.FIELDS, customerid=CUSTOMERID)
 
     assert label in result['label'] and "_id" in result.keys()
+
+
+def test_validate_spec():
+    """ Validates check specs without contacting NodePing
+    """
+
+    builder, kwargs = create_check.validate_spec(
+        {"type": "ping", "target": TARGET, "label": "PYTEST_ping_check"})
+
+    assert builder is create_check.ping_check
+    assert kwargs == {"target": TARGET, "label": "PYTEST_ping_check"}
+
+    for spec in ({"type": "NOTACHECK"},
+                 {"type": "HTTP"},
+                 {"type": "PING", "target": TARGET, "notanarg": True}):
+        with pytest.raises(ValueError):
+            create_check.validate_spec(spec)
+
+
+def test_bulk_create_invalid_specs():
+    """ Invalid specs are reported without creating a check
+    """
+
+    specs = [{"type": "NOTACHECK"}, {"type": "HTTP", "label": "PYTEST"}]
+
+    result = list(create_check.bulk_create(TOKEN, specs, workers=2))
+
+    assert sorted(outcome.key for outcome in result) == [0, 1]
+
+    for outcome in result:
+        assert not outcome.ok and isinstance(outcome.error, ValueError)
+
+
+def test_bulk_create_stops_when_closed():
+    """ No more checks are created once the caller stops reading results
+    """
+
+    transport = fakes.RecordingTransport(reply={"_id": "NEW"})
+    specs = ({"type": "PING", "target": "192.0.2.{0}".format(number)} for number in range(20))
+
+    with _query_nodeping_api.using(transport):
+        created = create_check.bulk_create("CREATE_TOKEN", specs, workers=2)
+        next(created)
+        created.close()
+
+    assert len(transport.sent) <= 2
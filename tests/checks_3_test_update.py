@@ -6,12 +6,13 @@
 """
 
 import pytest
-from nodeping_api import get_checks, update_checks
+from nodeping_api import _query_nodeping_api, get_checks, update_checks
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 CUSTOMERID = parameters.CUSTOMERID
@@ -67,3 +68,160 @@ def test_update_many_checks():
         TOKEN, checks_to_update, fields, customerid=CUSTOMERID)
 
     assert "error" not in result
+
+
+def test_update_many_checks_concurrently():
+    """
+    """
+
+    checks_to_update = {}
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    my_checks = query.all_checks()
+
+    for check in parameters.CHECK_TYPES:
+        label = "PYTEST_{0}_check".format(check)
+
+        for _, value in my_checks.items():
+            if value['label'] == label:
+                checks_to_update.update({value['_id']: value['type']})
+
+    fields = {"public": False, "interval": 15}
+
+    result = update_checks.update_many(
+        TOKEN, checks_to_update, fields, customerid=CUSTOMERID, workers=4,
+        detailed=True)
+
+    assert [outcome.key for outcome in result] == list(checks_to_update)
+
+    for outcome in result:
+        assert outcome.ok
+
+
+def test_update_many_if_changed():
+    """ Only checks with differing fields are sent, with only those fields
+    """
+
+    checks = {
+        "A": {"_id": "A", "type": "PING", "label": "a", "interval": 15,
+              "enable": "active", "parameters": {"target": "192.0.2.1"}},
+        "B": {"_id": "B", "type": "HTTP", "label": "b", "interval": "5",
+              "enable": "active", "parameters": {"target": "https://example.com"}},
+    }
+    transport = fakes.RecordingTransport(checks)
+
+    with _query_nodeping_api.using(transport):
+        outcomes = update_checks.update_many_if_changed("UPDATE_TOKEN", {
+            "A": {"label": "a", "interval": 15, "target": "192.0.2.2", "enabled": True},
+            "B": {"label": "b", "interval": 5, "enabled": True},
+            "C": {"label": "c"},
+        }, workers=2)
+
+    assert [outcome.key for outcome in outcomes] == ["A", "B", "C"]
+    assert outcomes[1].ok and outcomes[1].result is None
+    assert not outcomes[2].ok
+    assert transport.bodies() == [{"target": "192.0.2.2", "type": "PING"}]
+
+    assert update_checks.update_if_changed(
+        "UPDATE_TOKEN", "B", {"interval": "5"}, current=checks["B"]) is None
+
+
+def test_mute_durations_agree():
+    """ True mutes until unmuted, and seconds mute until a timestamp,
+    for single checks and batches alike
+    """
+
+    transport = fakes.RecordingTransport({"A": {"_id": "A", "type": "PING"}})
+
+    with _query_nodeping_api.using(transport):
+        update_checks.mute_check("UPDATE_TOKEN", "A", "PING", True)
+        update_checks.mute_matching("UPDATE_TOKEN", lambda check: True, True)
+        update_checks.mute_check("UPDATE_TOKEN", "A", "PING", 60)
+
+    mutes = [body["mute"] for body in transport.bodies()]
+
+    assert mutes[:2] == [True, True]
+    assert mutes[2] > 1000000000000
+
+
+def test_update_if_changed_case_only():
+    """ A label or target that only differs in case is still sent
+    """
+
+    current = {"_id": "A", "type": "HTTP", "label": "web", "enable": "active",
+               "interval": "5", "parameters": {"target": "https://example.com/path"}}
+    transport = fakes.RecordingTransport()
+
+    with _query_nodeping_api.using(transport):
+        update_checks.update_if_changed(
+            "UPDATE_TOKEN", "A",
+            {"label": "Web", "target": "https://example.com/Path", "enabled": True,
+             "interval": 5},
+            current=current)
+
+    assert transport.bodies() == [
+        {"label": "Web", "target": "https://example.com/Path", "type": "HTTP"}]
+
+
+def test_update_if_changed_without_type():
+    """ A check without a type is only updated when fields give one
+    """
+
+    transport = fakes.RecordingTransport()
+
+    with _query_nodeping_api.using(transport):
+        with pytest.raises(ValueError):
+            update_checks.update_if_changed("UPDATE_TOKEN", "A", {"interval": 5},
+                                            current={"_id": "A", "interval": 15})
+
+        update_checks.update_if_changed("UPDATE_TOKEN", "A", {"interval": 5, "type": "ping"},
+                                        current={"_id": "A", "interval": 15})
+
+    assert transport.bodies() == [{"interval": 5, "type": "PING"}]
+
+
+def test_mute_matching():
+    """ Checks are muted until one moment and only muted checks are unmuted
+    """
+
+    checks = {
+        "EU1": {"_id": "EU1", "type": "PING", "homeloc": "eur"},
+        "EU2": {"_id": "EU2", "type": "HTTP", "homeloc": "eur", "mute": True},
+        "US1": {"_id": "US1", "type": "PING", "homeloc": "nam", "mute": True},
+    }
+    transport = fakes.RecordingTransport(checks)
+
+    with _query_nodeping_api.using(transport):
+        outcomes = update_checks.mute_matching(
+            "MUTE_TOKEN", lambda check: check.get("homeloc") == "eur", 3600, workers=2)
+
+    assert [outcome.key for outcome in outcomes] == ["EU1", "EU2"]
+    assert sorted(put["type"] for put in transport.bodies()) == ["HTTP", "PING"]
+    assert len(set(put["mute"] for put in transport.bodies())) == 1
+
+    transport.sent = []
+
+    with _query_nodeping_api.using(transport):
+        query = get_checks.GetChecks("MUTE_TOKEN").query().type("HTTP", "PING")
+        outcomes = update_checks.unmute_matching("MUTE_TOKEN", query)
+
+    assert [outcome.key for outcome in outcomes] == ["EU2", "US1"]
+    assert transport.bodies() == [{"mute": False, "type": "HTTP"}, {"mute": False, "type": "PING"}]
+
+
+def test_mute_matching_ids():
+    """ A query limited to some IDs only mutes those checks
+    """
+
+    transport = fakes.RecordingTransport({
+        "A": {"_id": "A", "type": "PING"},
+        "B": {"_id": "B", "type": "PING"},
+        "C": {"_id": "C", "type": "HTTP"},
+    })
+
+    with _query_nodeping_api.using(transport):
+        query = get_checks.GetChecks("MUTE_TOKEN").query().ids("A")
+        outcomes = update_checks.mute_matching("MUTE_TOKEN", query, 3600)
+
+    assert [outcome.key for outcome in outcomes] == ["A"]
+    assert [checkid for _, checkid, _ in transport.sent] == ["A"]
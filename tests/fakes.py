@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Transports for tests that run without NodePing
+"""
+
+import asyncio
+import io
+import json
+
+
+class RecordingTransport(object):
+    """ Answers requests locally and records the ones that change something
+
+    GET requests are answered with a copy of `listing`, so code that
+    changes what it was given cannot change later answers. If `listing`
+    is callable, it is called with the URL and its return value is
+    answered instead. GET URLs are recorded in `urls`. Other requests
+    are answered with a copy of `reply` and recorded in `sent` as
+    (method, last part of the URL path, decoded body).
+    """
+
+    def __init__(self, listing=None, reply=None):
+        self.listing = {} if listing is None else listing
+        self.reply = {"ok": True} if reply is None else reply
+        self.gets = 0
+        self.urls = []
+        self.sent = []
+
+    def request(self, method, url, body=None, headers=None):
+        if method == "GET":
+            self.gets += 1
+            self.urls.append(url)
+
+            if callable(self.listing):
+                return _copy(self.listing(url))
+
+            return _copy(self.listing)
+
+        self.sent.append((method, url.split("?")[0].rsplit("/", 1)[-1],
+                          json.loads(body) if body else None))
+
+        return _copy(self.reply)
+
+    def open(self, method, url, body=None, headers=None):
+        """ The answer to a request as an unread response body, the way
+        streaming requests read it
+        """
+
+        return io.BytesIO(json.dumps(self.request(method, url, body, headers)).encode("utf-8"))
+
+    def bodies(self, method="PUT"):
+        """ The decoded bodies of the recorded requests made with method
+        """
+
+        return [body for sent_method, _, body in self.sent if sent_method == method]
+
+
+class AsyncRecordingTransport(object):
+    """ The aio counterpart of RecordingTransport, sharing its records
+
+    Requests yield to the event loop once before they are answered, so
+    requests awaited together are in flight at the same time. The most
+    requests that were in flight at once is kept in `most_in_flight`.
+    """
+
+    def __init__(self, listing=None, reply=None):
+        self.recorder = RecordingTransport(listing, reply)
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    async def request(self, method, url, body=None, headers=None):
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(0)
+        finally:
+            self.in_flight -= 1
+
+        return self.recorder.request(method, url, body, headers)
+
+
+def _copy(value):
+    return json.loads(json.dumps(value))
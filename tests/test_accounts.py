@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import pytest
-from nodeping_api import accounts
+from nodeping_api import _query_nodeping_api, accounts, contacts
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 NAME = "PYTEST_CREATED_SUBACCOUNT"
@@ -51,6 +52,52 @@ def test_get_subaccount_fail():
         'error': 'You do not have the correct permissions for that account.'}
 
 
+def test_for_each_subaccount():
+    """ Runs contacts.get_all for every account the token can reach
+    """
+
+    customer_accounts = accounts.get_account(TOKEN)
+
+    result = accounts.for_each_subaccount(TOKEN, contacts.get_all, workers=4)
+
+    assert set(result) == set(customer_accounts)
+
+
+def test_for_each_subaccount_offline():
+    """ The operation gets each listed customerid, and errors returned by
+    NodePing are kept per account
+    """
+
+    def answer(url):
+        if "/accounts" in url:
+            return {"SUB1": {}, "SUB2": {}, "SUB3": {}}
+
+        if "customerid=SUB2" in url:
+            return {"error": "No access to SUB2"}
+
+        return {"CONTACT": {"customer_id": url.rsplit("customerid=", 1)[-1]}}
+
+    transport = fakes.RecordingTransport(answer)
+
+    with _query_nodeping_api.using(transport):
+        merged = accounts.for_each_subaccount("ACCOUNTS_TOKEN", contacts.get_all, workers=2)
+        outcomes = dict((outcome.key, outcome) for outcome in
+                        accounts.iter_for_each_subaccount("ACCOUNTS_TOKEN", contacts.get_all,
+                                                          customerids=["SUB1", "SUB2"]))
+
+    assert merged == {
+        "SUB1": {"CONTACT": {"customer_id": "SUB1"}},
+        "SUB2": {"error": "No access to SUB2"},
+        "SUB3": {"CONTACT": {"customer_id": "SUB3"}},
+    }
+    assert outcomes["SUB1"].ok and not outcomes["SUB2"].ok
+    assert transport.gets == 6
+
+    with _query_nodeping_api.using(fakes.RecordingTransport({"error": "Invalid token"})):
+        assert accounts.for_each_subaccount("ACCOUNTS_TOKEN", contacts.get_all) == {
+            "error": "Invalid token"}
+
+
 def test_create_subaccount():
     """ Creates a subaccount
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the asyncio versions of the modules
+"""
+
+import asyncio
+
+import pytest
+from nodeping_api import _query_nodeping_api
+from nodeping_api import results as sync_results
+from nodeping_api.aio import _driver, accounts, contacts, get_checks, results, update_checks
+
+try:
+    import fakes
+    import parameters
+except ModuleNotFoundError:
+    from . import fakes, parameters
+
+TOKEN = parameters.TOKEN
+CUSTOMERID = parameters.CUSTOMERID
+
+
+def test_aio_all_checks():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    result = asyncio.run(query.all_checks())
+
+    assert "error" not in result.keys()
+
+
+def test_aio_concurrent_get_current():
+    """
+    """
+
+    async def gather_current():
+        return await asyncio.gather(
+            *[results.get_current(TOKEN, customerid=CUSTOMERID) for _ in range(5)])
+
+    for returned in asyncio.run(gather_current()):
+        assert "error" not in returned
+
+
+def test_aio_contact_directory(monkeypatch):
+    """ The directory is downloaded with an awaited request
+    """
+
+    transport = fakes.AsyncRecordingTransport({
+        "C1": {"_id": "C1", "addresses": {"A1": {"address": "a@example.com", "type": "email"}}},
+    })
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+
+    directory = asyncio.run(contacts.ContactDirectory.load("AIO_TOKEN"))
+
+    assert list(directory.get_by_type("email")) == ["C1"]
+    assert directory.owner("A1") == "C1"
+    assert transport.recorder.gets == 1
+
+    with pytest.raises(TypeError):
+        contacts.ContactDirectory("AIO_TOKEN")
+
+
+def test_aio_run_replays_earlier_responses(monkeypatch):
+    """ Each request of a function is sent once, in order
+    """
+
+    transport = fakes.AsyncRecordingTransport(lambda url: {"url": url})
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+
+    def three_gets():
+        return [_query_nodeping_api.get("https://example.com/{0}".format(number))["url"]
+                for number in range(3)]
+
+    assert asyncio.run(_driver.run(three_gets)) == [
+        "https://example.com/0", "https://example.com/1", "https://example.com/2"]
+    assert transport.recorder.gets == 3
+
+
+def test_aio_get_uptime_many(monkeypatch):
+    """ Uptime is requested for several checks at once and each check
+    gets its own response
+    """
+
+    def uptime(url):
+        check_id = url.split("?")[0].rsplit("/", 1)[-1]
+        return {"total": {"enabled": 100, "down": int(check_id[-1]), "uptime": 0}}
+
+    transport = fakes.AsyncRecordingTransport(uptime)
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+    check_ids = ["CHECK{0}".format(number) for number in range(8)]
+
+    table = asyncio.run(results.get_uptime_many("AIO_TOKEN", check_ids, workers=4))
+
+    assert table["periods"] == ["total"]
+    downs = dict((check_id, row[0]["down"]) for check_id, row in table["checks"].items())
+
+    assert downs == dict((check_id, number) for number, check_id in enumerate(check_ids))
+    assert transport.recorder.gets == 8
+    assert transport.most_in_flight == 4
+
+
+def test_aio_refuses_threaded_batches(monkeypatch):
+    """ A sync batch helper cannot spread calls over threads under the
+    replay transport
+    """
+
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", fakes.AsyncRecordingTransport())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_driver.run(sync_results.get_uptime_many, "AIO_TOKEN", ["A", "B"],
+                                workers=2))
+
+
+def test_aio_for_each_subaccount(monkeypatch):
+    """ The operation is awaited for every listed subaccount
+    """
+
+    transport = fakes.AsyncRecordingTransport({"SUB1": {}, "SUB2": {}})
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+
+    async def operation(token, customerid=None):
+        return {"customerid": customerid}
+
+    merged = asyncio.run(accounts.for_each_subaccount("AIO_TOKEN", operation, workers=2))
+
+    assert merged == {"SUB1": {"customerid": "SUB1"}, "SUB2": {"customerid": "SUB2"}}
+
+
+def test_aio_mute_matching(monkeypatch):
+    """ One download of the checks, then one PUT per matching check
+    """
+
+    transport = fakes.AsyncRecordingTransport({
+        "C1": {"_id": "C1", "type": "HTTP", "homeloc": "eur"},
+        "C2": {"_id": "C2", "type": "PING", "homeloc": "nam"},
+        "C3": {"_id": "C3", "type": "DNS", "homeloc": "eur"},
+    })
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+
+    outcomes = asyncio.run(update_checks.mute_matching(
+        "AIO_TOKEN", lambda check: check.get("homeloc") == "eur", True, workers=2))
+
+    assert [outcome.key for outcome in outcomes] == ["C1", "C3"]
+    assert all(outcome.ok for outcome in outcomes)
+    assert transport.recorder.gets == 1
+    assert sorted(url for _, url, _ in transport.recorder.sent) == ["C1", "C3"]
+    assert transport.recorder.bodies() == [{"type": "HTTP", "mute": True},
+                                           {"type": "DNS", "mute": True}]
+
+
+def test_aio_mute_contacts(monkeypatch):
+    """ One PUT per contact, with every address muted
+    """
+
+    transport = fakes.AsyncRecordingTransport({
+        "C1": {"_id": "C1", "addresses": {"A1": {"address": "a@example.com"},
+                                          "A2": {"address": "b@example.com"}}},
+        "C2": {"_id": "C2", "addresses": {"A3": {"address": "c@example.com"}}},
+    })
+    monkeypatch.setattr(_driver, "DEFAULT_TRANSPORT", transport)
+
+    outcomes = asyncio.run(contacts.mute_contacts("AIO_TOKEN", ["C1", "C2", "C9"], True,
+                                                  workers=2))
+
+    assert [(outcome.key, outcome.ok) for outcome in outcomes] == [
+        ("C1", True), ("C2", True), ("C9", False)]
+    assert transport.recorder.gets == 1
+    assert [sorted(body["addresses"]) for body in transport.recorder.bodies()] == [
+        ["A1", "A2"], ["A3"]]
+    assert all(address["mute"] is True for body in transport.recorder.bodies()
+               for address in body["addresses"].values())
+
+
+def test_aio_leaves_out_check_query():
+    """ Queries make their requests after query() returns, so they are
+    only in the sync module
+    """
+
+    assert not hasattr(get_checks, "CheckQuery")
+    assert "CheckQuery" not in get_checks.__all__
+    assert not hasattr(get_checks.GetChecks("AIO_TOKEN"), "query")
+    assert hasattr(get_checks.GetChecks, "all_checks")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the index of checks
+"""
+
+import pytest
+from nodeping_api import check_index, get_checks
+
+CHECKS = {
+    "A": {"_id": "A", "type": "PING", "label": "web-1", "homeloc": "nam",
+          "parameters": {"target": "192.0.2.1"}},
+    "B": {"_id": "B", "type": "HTTP", "label": "web-2",
+          "parameters": {"target": "https://example.com"}},
+    "C": {"_id": "C", "type": "http", "label": "db-1",
+          "parameters": {"target": "https://example.com"}},
+}
+
+
+class ListeningTransport:
+    """ Holds listeners the way a Transport does
+    """
+
+    def __init__(self):
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def respond(self, method, url, result):
+        for listener in self.listeners:
+            listener(method, url, result)
+
+
+def test_lookups():
+    """
+    """
+
+    index = check_index.CheckIndex(CHECKS)
+
+    assert len(index) == 3
+    assert index.by_label("web-1") == set(["A"])
+    assert index.by_target("https://example.com") == set(["B", "C"])
+    assert index.by_type("HTTP") == set(["B", "C"])
+    assert index.by_homeloc("nam") == set(["A"])
+    assert index.label_prefix("web-") == set(["A", "B"])
+    assert index.label_prefix("x") == set()
+
+    index.remove("A")
+
+    assert index.label_prefix("web") == set(["B"])
+    assert index.by_homeloc("nam") == set()
+
+
+def test_follows_changes():
+    """ Changes seen by an attached transport update the index
+    """
+
+    index = check_index.CheckIndex(CHECKS)
+    transport = ListeningTransport()
+    index.attach(transport)
+
+    url = get_checks.API_URL
+    transport.respond("POST", url + "?token=T", {"_id": "D", "type": "DNS", "label": "web-3"})
+    transport.respond("PUT", url + "/A?token=T", {"_id": "A", "label": "db-2"})
+    transport.respond("DELETE", url + "/B?token=T", {"ok": True})
+    transport.respond("PUT", url + "/C?token=T&customerid=OTHER", {"_id": "C", "label": "x"})
+    transport.respond("PUT", url + "/C?token=T", {"error": "Check not found"})
+
+    assert index.label_prefix("web") == set(["D"])
+    assert index.label_prefix("db-") == set(["A", "C"])
+    assert index.by_target("192.0.2.1") == set(["A"])
+    assert "B" not in index
+
+    index.detach(transport)
+    transport.respond("DELETE", url + "/D?token=T", {"ok": True})
+
+    assert "D" in index
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for calling the API through a NodePingClient
+"""
+
+import pytest
+from nodeping_api import client, get_checks
+
+try:
+    import fakes
+    import parameters
+except ModuleNotFoundError:
+    from . import fakes, parameters
+
+TOKEN = parameters.TOKEN
+CUSTOMERID = parameters.CUSTOMERID
+
+
+def test_client_all_checks():
+    """
+    """
+
+    np_client = client.NodePingClient(TOKEN, customerid=CUSTOMERID)
+    result = np_client.get_checks.GetChecks().all_checks()
+
+    assert "error" not in result.keys()
+
+
+def test_client_get_all_contacts():
+    """
+    """
+
+    with client.NodePingClient(TOKEN) as np_client:
+        result = np_client.contacts.get_all()
+
+    assert "error" not in result.keys()
+
+
+def test_client_binds_only_token_functions():
+    """ Functions taking a token get the client's; helpers are left alone
+    """
+
+    np_client = client.NodePingClient("CLIENT_TOKEN", customerid="SUBACCOUNT")
+    np_client.transport = fakes.RecordingTransport()
+
+    np_client.update_checks.update("CHECK", "PING", {"interval": 5})
+
+    assert np_client.transport.sent == [("PUT", "CHECK", {"interval": 5, "type": "PING"})]
+
+    builder, kwargs = np_client.create_check.validate_spec(
+        {"type": "PING", "target": "192.0.2.1"})
+
+    assert kwargs == {"target": "192.0.2.1"}
+    assert np_client.get_checks.CheckQuery is get_checks.CheckQuery
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for column-oriented result sets
+"""
+
+import pytest
+from nodeping_api import columnar
+
+RECORDS = [
+    {"_id": "1", "ra": "1000", "s": 1010, "e": 1110, "rt": 100, "su": True,
+     "sc": "200", "m": "", "l": {"1010": "ca"}},
+    {"_id": "2", "ra": "2000", "s": 2010, "e": 2210, "rt": 200, "su": False,
+     "sc": "500", "m": "Server Error", "l": {"2010": "tx"}},
+    {"_id": "3", "ra": "3000", "s": 3010, "e": 3310, "rt": 300, "su": True,
+     "sc": "200", "m": "", "l": {"3010": "ca"}},
+    {"_id": "4", "ra": "4000", "s": 4010, "e": 4410, "rt": 400, "su": True,
+     "sc": "200", "m": "", "l": {"4010": "ca"}},
+]
+
+
+def test_columns_round_trip():
+    """
+    """
+
+    columns = columnar.ResultColumns.from_records(RECORDS)
+
+    assert len(columns) == 4
+    assert list(columns.column("rt")) == [100, 200, 300, 400]
+    assert columns.column("su") == [True, False, True, True]
+    assert columns.column("sc") == ["200", "500", "200", "200"]
+    assert columns.row(1)["m"] == "Server Error"
+    assert columns.row(-1)["l"] == "ca"
+
+
+def test_aggregates():
+    """
+    """
+
+    columns = columnar.ResultColumns.from_records(RECORDS)
+
+    assert columns.failures() == 1
+    assert columns.failure_ratio() == 0.25
+    assert columns.percentiles([0, 50, 100]) == [100, 250, 400]
+    assert columns.mean() == 250
+
+
+def test_failures_across_bytes(monkeypatch):
+    """ Failures are counted from every byte of the bitmap, with and
+    without NumPy
+    """
+
+    records = [dict(RECORDS[0], su=index % 3 != 0) for index in range(1001)]
+
+    if columnar.numpy is not None:
+        assert columnar.ResultColumns.from_records(records).failures() == 334
+
+    monkeypatch.setattr(columnar, "numpy", None)
+
+    assert columnar.ResultColumns.from_records(records).failures() == 334
+
+
+def test_empty_columns():
+    """
+    """
+
+    columns = columnar.ResultColumns()
+
+    assert columns.failure_ratio() is None
+    assert columns.percentile(50) is None
+    assert columns.mean() is None
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the keep-alive connection pool, against a local server
+"""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+from nodeping_api._connection_pool import ConnectionPool, URLError
+from nodeping_api.aio._connection_pool import AsyncConnectionPool
+
+RESPONSE = (b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: 2\r\nConnection: keep-alive\r\n\r\n{}")
+
+
+class DroppingServer(object):
+    """ Answers the first request on each connection, then reads the next
+    request and closes the connection without answering it
+    """
+
+    def __init__(self, answer=True):
+        self.answer = answer
+        self.requests = []
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(5)
+        self.url = "http://127.0.0.1:{0}/".format(self._listener.getsockname()[1])
+
+        thread = threading.Thread(target=self._serve)
+        thread.daemon = True
+        thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+
+            thread = threading.Thread(target=self._handle, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _handle(self, conn):
+        with conn:
+            reader = conn.makefile("rb")
+
+            for position in range(2):
+                method = _read_request(reader)
+
+                if method is None:
+                    return
+
+                self.requests.append(method)
+
+                if not self.answer:
+                    # Keep the socket open until the client gives up
+                    reader.read(1)
+                    return
+
+                if position == 1:
+                    return
+
+                conn.sendall(RESPONSE)
+
+    def close(self):
+        self._listener.close()
+
+
+def _read_request(reader):
+    """ Reads one request and returns its method, or None at the end
+    """
+
+    line = reader.readline()
+
+    if not line:
+        return None
+
+    length = 0
+
+    header = reader.readline()
+
+    while header.strip():
+        name, _, value = header.partition(b":")
+
+        if name.lower() == b"content-length":
+            length = int(value)
+
+        header = reader.readline()
+
+    reader.read(length)
+
+    return line.split(b" ", 1)[0].decode()
+
+
+def test_stale_connection_only_resends_safe_requests():
+    """ GETs and keyed POSTs are sent again on a new connection, other
+    POSTs are not
+    """
+
+    server = DroppingServer()
+    pool = ConnectionPool()
+
+    for method, headers, resent in (("GET", None, True),
+                                    ("POST", {"Idempotency-Key": "a"}, True),
+                                    ("POST", None, False)):
+        pool.clear()
+        pool.request("GET", server.url).read()
+        server.requests[:] = []
+
+        if resent:
+            assert pool.request(method, server.url, b"{}", headers).read() == b"{}"
+            assert server.requests == [method, method]
+        else:
+            with pytest.raises(URLError):
+                pool.request(method, server.url, b"{}", headers)
+
+            assert server.requests == [method]
+
+    server.close()
+
+
+def test_timeout():
+    """ A server that never answers fails the request after the timeout
+    """
+
+    server = DroppingServer(answer=False)
+
+    with pytest.raises(URLError):
+        ConnectionPool().request("GET", server.url, timeout=0.2)
+
+    server.close()
+
+
+class CountingServer(object):
+    """ An asyncio server that answers every request after yielding to
+    the event loop, keeping the headers of each request and the most
+    connections that were open at once
+    """
+
+    def __init__(self):
+        self.headers = []
+        self.open = 0
+        self.most_open = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = "http://127.0.0.1:{0}/".format(self._server.sockets[0].getsockname()[1])
+
+    async def _handle(self, reader, writer):
+        self.open += 1
+        self.most_open = max(self.most_open, self.open)
+
+        try:
+            while True:
+                if not await reader.readline():
+                    return
+
+                headers = {}
+                line = await reader.readline()
+
+                while line.strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                    line = await reader.readline()
+
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                self.headers.append(headers)
+
+                await asyncio.sleep(0.01)
+                writer.write(RESPONSE)
+                await writer.drain()
+        finally:
+            self.open -= 1
+            writer.close()
+
+    def close(self):
+        self._server.close()
+
+
+def test_aio_content_length():
+    """ PUT and POST without a body still send Content-Length, as
+    http.client does, and GET does not
+    """
+
+    async def send():
+        server = CountingServer()
+        await server.start()
+        pool = AsyncConnectionPool()
+
+        for method in ("PUT", "POST", "GET"):
+            await pool.request(method, server.url)
+
+        pool.clear()
+        server.close()
+
+        return server.headers
+
+    put, post, get = asyncio.run(send())
+
+    assert put["content-length"] == "0"
+    assert post["content-length"] == "0"
+    assert "content-length" not in get
+
+
+def test_aio_max_connections():
+    """ Requests beyond max_connections wait for a connection instead of
+    opening more
+    """
+
+    async def send():
+        server = CountingServer()
+        await server.start()
+        pool = AsyncConnectionPool(max_connections=3)
+
+        responses = await asyncio.gather(*[pool.request("GET", server.url) for _ in range(20)])
+
+        pool.clear()
+        server.close()
+
+        return server, responses
+
+    server, responses = asyncio.run(send())
+
+    assert [response.body for response in responses] == [b"{}"] * 20
+    assert server.most_open == 3
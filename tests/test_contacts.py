@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import pytest
-from nodeping_api import contacts
+from nodeping_api import _query_nodeping_api, contacts
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 NAME = "PYTEST_CREATED_SUBACCOUNT"
@@ -130,3 +131,68 @@ def test_delete_contact():
     result = contacts.delete_contact(TOKEN, temp_contact)
 
     assert "error" not in result.keys()
+
+
+def test_mute_contact_methods():
+    """ Contacts are downloaded once and each is updated with one PUT
+    """
+
+    transport = fakes.RecordingTransport({
+        "C1": {"_id": "C1", "addresses": {"A1": {"address": "a@example.com"},
+                                          "A2": {"address": "b@example.com"}}},
+        "C2": {"_id": "C2", "addresses": {"A3": {"address": "c@example.com"}}},
+    })
+
+    with _query_nodeping_api.using(transport):
+        outcomes = contacts.mute_contact_methods(
+            "MUTE_TOKEN", ["A1", "A2", "A9", "A3"], 600, workers=2)
+
+    assert transport.gets == 1
+    assert [(outcome.key, outcome.ok) for outcome in outcomes] == [
+        ("C1", True), ("C2", True), ("A9", False)]
+    assert sorted(contact_id for _, contact_id, _ in transport.sent) == ["C1", "C2"]
+
+    mutes = set(address["mute"] for put in transport.bodies()
+                for address in put["addresses"].values())
+    assert len(mutes) == 1
+
+    transport.sent = []
+
+    with _query_nodeping_api.using(transport):
+        result = contacts.mute_contact("MUTE_TOKEN", "C1", True)
+
+    assert result == {"ok": True}
+    assert transport.sent == [("PUT", "C1", {"addresses": {
+        "A1": {"address": "a@example.com", "mute": True},
+        "A2": {"address": "b@example.com", "mute": True}}})]
+
+
+def test_contact_directory():
+    """ One download answers lookups by type, address, name, and role
+    """
+
+    transport = fakes.RecordingTransport({
+        "C1": {"_id": "C1", "name": "Ops", "custrole": "edit",
+               "addresses": {"A1": {"address": "Ops@Example.com", "type": "email"},
+                             "A2": {"address": "5551238888", "type": "sms"}}},
+        "C2": {"_id": "C2", "name": "Web", "custrole": "view",
+               "addresses": {"A3": {"address": "https://example.com/hook",
+                                    "type": "webhook"}}},
+        "C3": {"_id": "C3", "name": "Ops", "custrole": "view", "addresses": {}},
+    })
+
+    with _query_nodeping_api.using(transport):
+        directory = contacts.ContactDirectory("DIRECTORY_TOKEN")
+
+    assert transport.gets == 1
+    assert list(directory.get_by_type("sms")) == ["C1"]
+    assert directory.get_by_type("pushover") == {}
+    assert list(directory.by_address(" ops@example.com ")) == ["C1"]
+    assert sorted(directory.by_name("Ops")) == ["C1", "C3"]
+    assert sorted(directory.by_custrole("view")) == ["C2", "C3"]
+    assert list(directory.without_addresses()) == ["C3"]
+    assert directory.owner("A3") == "C2"
+    assert directory.owner("A9") is None
+
+    with _query_nodeping_api.using(transport):
+        assert list(contacts.get_by_type("DIRECTORY_TOKEN", "webhook")) == ["C2"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the index of check events
+"""
+
+import random
+
+import pytest
+from nodeping_api import event_index, results
+
+
+def test_point_and_range_queries():
+    """ The index finds the same events as scanning all of them
+    """
+
+    rand = random.Random(1)
+    index = event_index.EventIndex()
+    events = {}
+
+    for number in range(200):
+        check_id = "check{0}".format(number)
+        events[check_id] = []
+
+        for _ in range(rand.randint(0, 5)):
+            start = rand.randint(0, 100000)
+            events[check_id].append({"type": "down", "start": start,
+                                     "end": start + rand.randint(1, 5000)})
+
+        index.add(check_id, events[check_id])
+
+    index.add("open", [{"type": "down", "start": 50000},
+                       {"type": "disabled", "start": 0, "end": 10}])
+
+    for _ in range(100):
+        start = rand.randint(0, 110000)
+        end = start + rand.randint(1, 2000)
+        expected = set(check_id for check_id, check_events in events.items()
+                       for event in check_events
+                       if event["start"] < end and event["end"] > start)
+
+        if end > 50000:
+            expected.add("open")
+
+        assert index.checks_overlapping(start, end) == expected
+
+    assert "open" in index.checks_at(10 ** 12)
+    assert "open" not in index.checks_at(5)
+
+
+def test_build_from_events(monkeypatch):
+    """
+    """
+
+    def get_event(token, check_id, customerid=None, start=None, end=None, limit=None):
+        if check_id == "missing":
+            return {"error": "Check not found"}
+
+        return {"1": {"type": "down", "start": 100, "end": 200}}
+
+    monkeypatch.setattr(results, "get_event", get_event)
+
+    index = event_index.build("token", ["a", "b", "missing"], workers=2)
+
+    assert index.checks_at(150) == set(["a", "b"])
+    assert index.checks_at(200) == set()
+    assert list(index.errors) == ["missing"]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for decoding JSON responses incrementally
+"""
+
+import io
+import json
+
+import pytest
+from nodeping_api import _json_stream
+
+DOCUMENT = {
+    "CHECK1": {"label": "café ✓", "parameters": {"target": "https://example.com/\"a\\b\""},
+               "interval": 15, "threshold": -2.5e-3, "tags": ["a", "b"], "mute": False},
+    "CHECK2": {"label": "escapes \\u00e9 \n\t\u0000", "nested": {"deeper": [[], {}, [1, [2, {}]]]},
+               "queue": None, "big": 12345678901234567890},
+    "CHECK3": {},
+}
+
+
+def stream(data, chunk_size):
+    return _json_stream.JSONStream(io.BytesIO(data), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 65536])
+def test_object_in_any_chunks(chunk_size):
+    """ Chunks split inside strings, escapes, multibyte characters,
+    numbers, and nested values decode the same as the whole body
+    """
+
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+    decoded = stream(data, chunk_size)
+
+    assert decoded.kind == "object"
+    assert list(decoded) == list(DOCUMENT.items())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_array_and_scalars(chunk_size):
+    """ Arrays yield their values, and a scalar is yielded once
+    """
+
+    array = stream(b' [ 1 , 23 , 456.5e1 , "x" , true , null , [ ] ] ', chunk_size)
+
+    assert array.kind == "array"
+    assert list(array) == [1, 23, 4565.0, "x", True, None, []]
+
+    for data, value in [(b"12345", 12345), (b'"text"', "text"), (b"[]", None)]:
+        decoded = stream(data, chunk_size)
+
+        if value is None:
+            assert list(decoded) == []
+        else:
+            assert decoded.kind == "scalar"
+            assert list(decoded) == [value]
+
+
+def test_numbers_split_anywhere():
+    """ A number split before its fraction or exponent is not decoded
+    early
+    """
+
+    data = b"[1.5,2e3,4E-1,-0.25,7]"
+
+    for split in range(1, len(data)):
+        chunks = io.BytesIO(data)
+        decoded = _json_stream.JSONStream(chunks, split)
+
+        assert list(decoded) == [1.5, 2000.0, 0.4, -0.25, 7]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 65536])
+@pytest.mark.parametrize("data", [
+    b"",
+    b'{"a": 1',
+    b'{"a": 1,',
+    b'{"a": "unterminated',
+    b'{"a": "escape \\',
+    b'{"a": {"b": [1, 2}',
+    b'[1 2]',
+    b'{"a" 1}',
+    b'{"a": tru}',
+    b'{"a": 1,}',
+])
+def test_truncated_or_invalid(data, chunk_size):
+    """ Broken bodies raise ValueError instead of yielding partial values
+    """
+
+    with pytest.raises(ValueError):
+        list(stream(data, chunk_size))
+
+
+def test_values_are_released():
+    """ Decoded members are dropped from the buffer as they are yielded
+    """
+
+    data = json.dumps(dict(("CHECK{0}".format(index), {"label": "x" * 100})
+                           for index in range(100))).encode("utf-8")
+    decoded = stream(data, 256)
+
+    for _ in decoded:
+        assert len(decoded._buffer) < 512
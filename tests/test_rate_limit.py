@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the client-side rate limiter
+"""
+
+import pytest
+from nodeping_api import rate_limit
+
+
+def test_burst_then_wait():
+    """
+    """
+
+    limiter = rate_limit.RateLimiter(10, burst=3)
+
+    delays = [limiter.reserve() for _ in range(5)]
+
+    assert delays[:3] == [0, 0, 0]
+    assert 0 < delays[3] < delays[4] <= 0.2
+
+
+def test_throttled_response_slows_down():
+    """
+    """
+
+    limiter = rate_limit.RateLimiter(10)
+
+    limiter.on_response(429, "2")
+
+    assert limiter.rate == 5
+    assert limiter.reserve() > 1.5
+
+    limiter.on_response(200)
+
+    assert limiter.rate == 5.5
+
+
+def test_requests_after_pause_are_spaced_out(monkeypatch):
+    """ Requests waiting out a Retry-After do not all go when it ends
+    """
+
+    now = [100.0]
+    monkeypatch.setattr(rate_limit, "monotonic", lambda: now[0])
+
+    limiter = rate_limit.RateLimiter(10)
+    limiter.on_response(429, "2")
+
+    delays = [round(limiter.reserve(), 3) for _ in range(8)]
+
+    assert delays == [2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6]
+
+    # Time passing during the pause does not refill the bucket
+    now[0] += 2.1
+
+    assert round(limiter.reserve(), 3) == 1.7
+
+
+def test_parse_retry_after():
+    """
+    """
+
+    assert rate_limit.parse_retry_after("120") == 120
+    assert rate_limit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert rate_limit.parse_retry_after("soon") is None
+    assert rate_limit.parse_retry_after(None) is None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for reconciling checks with a desired state
+"""
+
+import pytest
+from nodeping_api import _query_nodeping_api, reconcile
+
+try:
+    import fakes
+except ModuleNotFoundError:
+    from . import fakes
+
+LIVE = {
+    "SAME": {"_id": "SAME", "type": "PING", "label": "router", "enable": "active",
+             "interval": 15, "parameters": {"target": "192.0.2.1", "threshold": 5}},
+    "CHANGED": {"_id": "CHANGED", "type": "HTTP", "label": "website", "enable": "inactive",
+                "interval": "15", "parameters": {"target": "https://example.com"}},
+    "RETYPED": {"_id": "RETYPED", "type": "PING", "label": "dns", "enable": "active",
+                "parameters": {"target": "192.0.2.53"}},
+    "EXTRA": {"_id": "EXTRA", "type": "PING", "label": "old", "enable": "active",
+              "parameters": {"target": "192.0.2.9"}},
+}
+
+DESIRED = [
+    {"type": "PING", "label": "router", "target": "192.0.2.1", "threshold": "5",
+     "enabled": True},
+    {"type": "HTTP", "label": "website", "target": "https://example.com",
+     "interval": 15, "enabled": True},
+    {"type": "DNS", "label": "dns", "target": "192.0.2.53"},
+    {"type": "PING", "label": "new", "target": "192.0.2.10"},
+]
+
+
+def recording_transport():
+    return fakes.RecordingTransport(LIVE, {"_id": "NEW"})
+
+
+def test_plan():
+    """
+    """
+
+    with _query_nodeping_api.using(recording_transport()):
+        changes = reconcile.plan("RECONCILE_TOKEN", DESIRED, prune=True)
+
+    assert [spec["label"] for spec in changes.create] == ["dns", "new"]
+    assert changes.update == [("CHANGED", "HTTP", {"enabled": True})]
+    assert sorted(changes.delete) == [("EXTRA", "old"), ("RETYPED", "dns")]
+    assert "~ update CHANGED HTTP: enabled" in str(changes)
+
+    with _query_nodeping_api.using(recording_transport()):
+        kept = reconcile.plan("RECONCILE_TOKEN", DESIRED)
+
+    assert kept.delete == [("RETYPED", "dns")]
+
+
+def test_apply():
+    """
+    """
+
+    transport = recording_transport()
+
+    with _query_nodeping_api.using(transport):
+        changes, dry = reconcile.reconcile("RECONCILE_TOKEN", DESIRED, dry_run=True)
+
+        assert dry == []
+        assert transport.sent == []
+
+        changes, results = reconcile.reconcile("RECONCILE_TOKEN", DESIRED, workers=4,
+                                              prune=True)
+
+    assert all(result.ok for result in results)
+    assert sorted((method, last) for method, last, _ in transport.sent) == [
+        ("DELETE", "EXTRA"), ("DELETE", "RETYPED"), ("POST", "checks"),
+        ("POST", "checks"), ("PUT", "CHANGED")]
+    assert ("PUT", "CHANGED", {"enabled": True, "type": "HTTP"}) in transport.sent
+
+
+def test_duplicate_labels():
+    """
+    """
+
+    with _query_nodeping_api.using(recording_transport()):
+        with pytest.raises(ValueError):
+            reconcile.plan("RECONCILE_TOKEN", [DESIRED[0], DESIRED[0]])
+
+
+def test_plan_case_only_change():
+    """ A target or label that only changes case is still updated
+    """
+
+    desired = [
+        {"type": "HTTP", "label": "website", "target": "https://Example.com",
+         "interval": 15, "enabled": False},
+        {"_id": "SAME", "type": "PING", "label": "Router", "target": "192.0.2.1",
+         "threshold": 5, "enabled": True},
+    ]
+
+    with _query_nodeping_api.using(recording_transport()):
+        changes = reconcile.plan("RECONCILE_TOKEN", desired)
+
+    assert sorted(changes.update) == [
+        ("CHANGED", "HTTP", {"target": "https://Example.com"}),
+        ("SAME", "PING", {"label": "Router"}),
+    ]
+
+
+def test_spec_without_label():
+    """ A spec without a label is rejected instead of matching any check
+    """
+
+    with _query_nodeping_api.using(recording_transport()):
+        with pytest.raises(ValueError):
+            reconcile.plan("RECONCILE_TOKEN", [{"type": "PING", "target": "192.0.2.1"}])
+
+
+def test_load_rejects_other_shapes(tmp_path):
+    """ Only a list of specs, or one under "checks", is loaded
+    """
+
+    path = tmp_path / "checks.json"
+
+    path.write_text('{"checks": [{"type": "PING", "label": "router"}]}')
+    assert reconcile.load(str(path)) == [{"type": "PING", "label": "router"}]
+
+    for text in ('{"chekcs": []}', '{"checks": {}}', 'null', '"checks"'):
+        path.write_text(text)
+
+        with pytest.raises(ValueError):
+            reconcile.load(str(path))
@@ -5,13 +5,21 @@
 """ Tests to disable checks
 """
 
+import time
+
 import pytest
-from nodeping_api import get_checks, results
+from nodeping_api import _query_nodeping_api, get_checks, results
+
+try:
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from urlparse import parse_qs, urlparse
 
 try:
+    import fakes
     import parameters
 except ModuleNotFoundError:
-    from . import parameters
+    from . import fakes, parameters
 
 TOKEN = parameters.TOKEN
 CUSTOMERID = parameters.CUSTOMERID
@@ -31,6 +39,112 @@ def test_get_results():
     assert "error" not in returned
 
 
+def test_stream_results():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    acc_checks = query.all_checks()
+    check_id = next(iter(acc_checks))
+
+    returned = list(results.stream_results(
+        TOKEN, check_id, limit=2, customerid=CUSTOMERID))
+
+    assert len(returned) <= 2
+
+    for record in returned:
+        assert "error" not in record
+
+
+def test_iter_results():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    acc_checks = query.all_checks()
+    check_id = next(iter(acc_checks))
+
+    end = int(time.time() * 1000)
+    start = end - 6 * 60 * 60 * 1000
+
+    returned = list(results.iter_results(
+        TOKEN, check_id, start, end, customerid=CUSTOMERID,
+        window=60 * 60 * 1000, workers=3))
+
+    ids = [record['_id'] for record in returned]
+    times = [record['s'] for record in returned]
+
+    assert len(ids) == len(set(ids))
+    assert times == sorted(times)
+
+
+def canned_results(url):
+    """ Results every 10ms from 1000 to 1990, newest first the way NodePing
+    returns them. Both ends of the range are included, so a result on a
+    window edge is returned for both windows
+    """
+
+    query = dict((key, int(values[0])) for key, values in parse_qs(urlparse(url).query).items()
+                 if key in ("start", "end", "limit"))
+    times = [time for time in range(1990, 999, -10) if query["start"] <= time <= query["end"]]
+
+    return [{"_id": "R{0}".format(time), "s": time, "su": True}
+            for time in times[:query["limit"]]]
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_iter_results_windows(workers):
+    """ Full windows are split, results on window edges are yielded
+    once, and everything comes out in time order
+    """
+
+    transport = fakes.RecordingTransport(canned_results)
+
+    with _query_nodeping_api.using(transport):
+        returned = list(results.iter_results(
+            "RESULTS_TOKEN", "CHECK", 1000, 2000, window=250, limit=20, workers=workers))
+
+    assert [record["s"] for record in returned] == list(range(1000, 2000, 10))
+
+    # 26 results fall in each 250ms window, so each one is split in half
+    windows = [(int(parse_qs(urlparse(url).query)["start"][0]),
+                int(parse_qs(urlparse(url).query)["end"][0])) for url in transport.urls]
+
+    assert (1000, 1250) in windows
+    assert (1000, 1125) in windows and (1125, 1250) in windows
+    assert (1250, 1500) in windows
+
+
+def test_iter_results_error():
+    """ An error from NodePing is yielded and ends the iteration
+    """
+
+    transport = fakes.RecordingTransport({"error": "Invalid check"})
+
+    with _query_nodeping_api.using(transport):
+        returned = list(results.iter_results("RESULTS_TOKEN", "CHECK", 1000, 2000, window=250))
+
+    assert returned == [{"error": "Invalid check"}]
+    assert transport.gets == 1
+
+
+def test_stream_results_offline():
+    """ Records are yielded one at a time from the streamed response
+    """
+
+    transport = fakes.RecordingTransport(canned_results)
+
+    with _query_nodeping_api.using(transport):
+        returned = list(results.stream_results("RESULTS_TOKEN", "CHECK", limit=3,
+                                               start=1100, end=1200))
+
+    assert [record["_id"] for record in returned] == ["R1200", "R1190", "R1180"]
+
+    with _query_nodeping_api.using(fakes.RecordingTransport({"error": "Invalid check"})):
+        assert list(results.stream_results("RESULTS_TOKEN", "CHECK")) == [
+            {"error": "Invalid check"}]
+
+
 def test_get_uptime():
     """
     """
@@ -44,6 +158,24 @@ def test_get_uptime():
     assert "error" not in returned
 
 
+def test_get_uptime_many():
+    """
+    """
+
+    query = get_checks.GetChecks(TOKEN, customerid=CUSTOMERID)
+    acc_checks = query.all_checks()
+    check_ids = list(acc_checks)[:3]
+    labels = dict((check_id, acc_checks[check_id].get("label")) for check_id in check_ids)
+
+    returned = results.get_uptime_many(
+        TOKEN, check_ids, customerid=CUSTOMERID, labels=labels, workers=3)
+
+    assert not returned["errors"]
+    assert returned["periods"][-1] == "total"
+    assert set(returned["checks"]) == set(check_ids)
+    assert len(returned["account"]) == len(returned["periods"])
+
+
 def test_get_current():
     """
     """
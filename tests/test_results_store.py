@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for the local results store
+"""
+
+import pytest
+from nodeping_api import results, results_store
+
+
+def fake_results(records, calls):
+    """ Replaces results.iter_results, returning the records in the
+    requested range
+    """
+
+    def iter_results(token, check_id, start, end, customerid=None, window=None):
+        calls.append((check_id, start, end))
+
+        for record in records.get(check_id, []):
+            if start <= record["s"] <= end:
+                yield record
+
+    return iter_results
+
+
+def test_incremental_sync(monkeypatch):
+    """ The second sync only asks for results after the first one
+    """
+
+    now = 10 ** 12
+    records = {
+        "check1": [{"_id": "a", "s": now - 3000}, {"_id": "b", "s": now - 2000}],
+        "check2": [{"_id": "c", "s": now - 1000}],
+    }
+    calls = []
+
+    monkeypatch.setattr(results, "iter_results", fake_results(records, calls))
+    monkeypatch.setattr(results_store.time, "time", lambda: now / 1000.0)
+    monkeypatch.setattr(results_store, "SYNC_LAG", 1500)
+
+    store = results_store.ResultsStore(":memory:")
+    synced = store.incremental_sync("token", ["check1", "check2"], start=now - 5000, workers=2)
+
+    assert [(r.key, r.ok, r.result) for r in synced] == [("check1", True, 2), ("check2", True, 1)]
+    assert store.count() == 3
+    assert [r["_id"] for r in store.get_results("check1")] == ["a", "b"]
+    assert store.synced_to("check1") == now - 1500
+
+    # "e" is saved by NodePing after the first sync, but within the lag
+    records["check1"].append({"_id": "e", "s": now - 1000})
+    records["check1"].append({"_id": "d", "s": now + 1000})
+    monkeypatch.setattr(results_store.time, "time", lambda: (now + 2000) / 1000.0)
+    calls[:] = []
+
+    synced = store.incremental_sync("token", ["check1"])
+
+    assert calls == [("check1", now - 1500, now + 2000)]
+    assert synced[0].result == 2
+    assert [r["_id"] for r in store.get_results("check1")] == ["a", "b", "e", "d"]
+
+    store.close()
+
+
+def test_sync_error_keeps_position(monkeypatch):
+    """ A check NodePing returns an error for is not marked as synced
+    """
+
+    def failing(token, check_id, start, end, customerid=None, window=None):
+        yield {"error": "Check not found"}
+
+    monkeypatch.setattr(results, "iter_results", failing)
+
+    store = results_store.ResultsStore(":memory:")
+    synced = store.incremental_sync("token", ["missing"])
+
+    assert not synced[0].ok
+    assert store.synced_to("missing") is None
+
+
+def test_get_results_in_batches(monkeypatch):
+    """ Results are read a batch at a time, including results that share
+    a time across the end of a batch
+    """
+
+    records = {"check1": [{"_id": "r{0:02d}".format(index), "s": 1000 + index // 3 * 10}
+                          for index in range(20)]}
+
+    monkeypatch.setattr(results, "iter_results", fake_results(records, []))
+    monkeypatch.setattr(results_store, "BATCH_SIZE", 4)
+
+    store = results_store.ResultsStore(":memory:")
+    store.incremental_sync("token", ["check1"], start=0)
+
+    assert [r["_id"] for r in store.get_results("check1")] == [
+        record["_id"] for record in records["check1"]]
+    assert [r["_id"] for r in store.get_results("check1", 1010, 1030)] == [
+        "r03", "r04", "r05", "r06", "r07", "r08", "r09", "r10", "r11"]
+
+    store.close()
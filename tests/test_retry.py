@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for retrying failed requests
+"""
+
+import time
+
+import pytest
+from nodeping_api import retry
+
+
+def test_retry_idempotent_methods():
+    """
+    """
+
+    policy = retry.RetryPolicy(max_attempts=3, backoff=0.1)
+    started = time.time()
+
+    for method in ("GET", "PUT", "DELETE"):
+        delay = policy.retry_delay(method, {}, 1, started, status=503)
+        assert 0 <= delay <= 0.1
+
+    assert policy.retry_delay("POST", {}, 1, started, status=503) is None
+    assert policy.retry_delay(
+        "POST", {retry.IDEMPOTENCY_HEADER: "abc"}, 1, started, status=503) is not None
+
+
+def test_no_retry_for_success_or_last_attempt():
+    """
+    """
+
+    policy = retry.RetryPolicy(max_attempts=2)
+    started = time.time()
+
+    assert policy.retry_delay("GET", {}, 1, started, status=200) is None
+    assert policy.retry_delay("GET", {}, 1, started, status=400) is None
+    assert policy.retry_delay("GET", {}, 2, started, status=502) is None
+
+
+def test_retry_after_and_deadline():
+    """
+    """
+
+    policy = retry.RetryPolicy(backoff=0.1, deadline=5)
+    started = retry.monotonic()
+
+    assert policy.retry_delay("GET", {}, 1, started, status=429, retry_after="2") == 2
+    assert policy.retry_delay("GET", {}, 1, started, status=429, retry_after="10") is None
+
+
+def test_budget_stops_retries():
+    """
+    """
+
+    policy = retry.RetryPolicy(max_attempts=5, budget=retry.RetryBudget(tokens=2))
+    started = time.time()
+
+    assert policy.retry_delay("GET", {}, 1, started, error=IOError()) is not None
+    assert policy.retry_delay("GET", {}, 1, started, error=IOError()) is not None
+    assert policy.retry_delay("GET", {}, 1, started, error=IOError()) is None
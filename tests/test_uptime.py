@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for calculating uptime locally
+"""
+
+from calendar import timegm
+
+import pytest
+from nodeping_api import uptime
+
+HOUR = uptime.HOUR
+DAY = uptime.DAY
+
+
+def ms(*date):
+    return timegm(date + (0,) * (6 - len(date))) * 1000
+
+
+def test_interval_arithmetic():
+    """
+    """
+
+    merged = uptime.merge([(5, 10), (0, 3), (3, 4), (8, 12), (20, 20)])
+
+    assert merged == [(0, 4), (5, 12)]
+    assert uptime.intersect(merged, [(2, 6), (11, 30)]) == [(2, 4), (5, 6), (11, 12)]
+    assert uptime.subtract(merged, [(1, 2), (6, 20)]) == [(0, 1), (2, 4), (5, 6)]
+    assert uptime.total(merged) == 11
+
+
+def test_down_intervals_from_results():
+    """
+    """
+
+    records = [{"s": 300, "su": True}, {"s": 100, "su": False},
+               {"s": 0, "su": True}, {"s": 200, "su": False},
+               {"s": 400, "su": False}]
+
+    assert uptime.down_intervals(records, end=500) == [(100, 300), (400, 500)]
+
+
+def test_compute_uptime_by_month():
+    """ Down time in maintenance and outside business hours is ignored
+    """
+
+    start = ms(2024, 1, 1)
+    end = ms(2024, 3, 1)
+    events = [
+        {"type": "down", "start": ms(2024, 1, 2, 10), "end": ms(2024, 1, 2, 11)},
+        {"type": "down", "start": ms(2024, 1, 2, 20), "end": ms(2024, 1, 2, 21)},
+        {"type": "down", "start": ms(2024, 2, 6, 12), "end": ms(2024, 2, 6, 14)},
+        {"type": "disabled", "start": ms(2024, 2, 1), "end": ms(2024, 2, 2)},
+    ]
+
+    hours = uptime.business_hours(start, end)
+    windows = uptime.cron_windows("0 13 * * 2", 60, start, end)
+
+    computed = uptime.compute_uptime(
+        uptime.event_intervals(events, "down"), start, end, interval="months",
+        calendar=hours, exclude=windows,
+        disabled=uptime.event_intervals(events, "disabled"))
+
+    # 23 week days in January, 21 in February less the disabled Thursday,
+    # and one hour of maintenance every Tuesday
+    assert computed["2024-01"]["enabled"] == (23 * 8 - 5) * HOUR
+    assert computed["2024-01"]["down"] == HOUR
+    assert computed["2024-02"]["enabled"] == (20 * 8 - 4) * HOUR
+    assert computed["2024-02"]["down"] == HOUR
+    assert computed["total"]["down"] == 2 * HOUR
+    assert computed["total"]["uptime"] == round(100 - 200.0 / (23 * 8 - 5 + 20 * 8 - 4), 3)
+
+
+def test_periods_with_offset():
+    """
+    """
+
+    split = uptime.periods(ms(2024, 1, 1), ms(2024, 1, 3), "days", offset=-5)
+
+    assert [label for label, _, _ in split] == ["2023-12-31", "2024-01-01", "2024-01-02"]
+    assert split[1][1:] == (ms(2024, 1, 1, 5), ms(2024, 1, 2, 5))
+
+
+def test_maintenance_windows():
+    """
+    """
+
+    schedules = {
+        "A": {"_id": "A", "cron": "30 2 1 * *", "duration": 30, "enabled": True,
+              "checklist": ["check1"]},
+        "B": {"_id": "B", "cron": "0 0 * * *", "duration": 10, "enabled": False,
+              "checklist": ["check1"]},
+    }
+
+    windows = uptime.maintenance_windows(schedules, "check1", ms(2024, 1, 1), ms(2024, 3, 1))
+
+    assert windows == [(ms(2024, 1, 1, 2, 30), ms(2024, 1, 1, 3)),
+                       (ms(2024, 2, 1, 2, 30), ms(2024, 2, 1, 3))]
+    assert uptime.maintenance_windows(schedules, "check2", ms(2024, 1, 1), ms(2024, 3, 1)) == []
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+""" Tests for watching checks for changes
+"""
+
+import pytest
+from nodeping_api import watch
+
+
+def test_check_changes():
+    """
+    """
+
+    before = watch.snapshot({
+        "a": {"label": "A", "state": 1},
+        "b": {"label": "B", "state": 0, "firstdown": 10},
+        "c": {"label": "C", "state": 1},
+    })
+    after = watch.snapshot({
+        "a": {"label": "A", "state": 0, "firstdown": 20},
+        "b": {"label": "B2", "state": 1},
+        "d": {"label": "D", "state": 1},
+    })
+
+    found = sorted((event.kind, event.check_id) for event in watch.changes(before, after))
+
+    assert found == [("added", "d"), ("deleted", "c"), ("down", "a"),
+                     ("modified", "b"), ("recovered", "b")]
+    assert list(watch.changes(after, after)) == []
+
+
+def test_current_event_changes():
+    """
+    """
+
+    before = watch.snapshot({"1": {"check": "a", "type": "down"}}, "current")
+    after = watch.snapshot({"2": {"check": "b", "type": "down"}}, "current")
+
+    found = sorted((event.kind, event.check_id)
+                   for event in watch.changes(before, after, "current"))
+
+    assert found == [("down", "b"), ("recovered", "a")]